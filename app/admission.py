@@ -0,0 +1,158 @@
+# app/admission.py
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+# ====== METRIQUES DE L'ADMISSION ======
+# Mode multiprocess : jauges sommées sur les workers vivants (mark_process_dead retire un worker arrêté)
+in_flight_gauge = Gauge("inference_in_flight", "Requêtes de prédiction admises et non terminées", multiprocess_mode="livesum")
+queue_depth_gauge = Gauge("inference_queue_depth", "Tâches d'inférence en attente d'un worker libre", multiprocess_mode="livesum")
+rejected_counter = Counter("inference_rejected", "Requêtes refusées sans inférence (429)", ["reason"])
+deadline_counter = Counter("inference_deadline_exceeded", "Requêtes arrivées à échéance (503)", ["stage"])
+task_seconds = Histogram(
+    "inference_task_seconds",
+    "Durée d'une tâche d'inférence, attente du worker comprise",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+class Overloaded(Exception):
+    """Limite de requêtes en vol atteinte : réponse 429 immédiate."""
+
+class DeadlineExceeded(Exception):
+    """Échéance de la requête dépassée : réponse 503."""
+
+# ====== TACHES EXECUTEES PAR LE POOL ======
+_worker_serving = None
+
+def init_process_worker(serving):
+    # Processus du pool : un exemplaire du modèle servi, reçu une fois à la création du pool
+    global _worker_serving
+    _worker_serving = serving
+
+def predict_in_worker(items, chunk_size):
+    return _worker_serving.predict_items(items, chunk_size)
+
+def guarded_call(function, args, deadline):
+    # Tâche sortie de la file après son échéance : abandonnée sans calcul (CLOCK_MONOTONIC, commun aux processus)
+    if deadline is not None and time.monotonic() > deadline:
+        raise DeadlineExceeded()
+    return function(*args)
+
+# ====== EXECUTEUR BORNE ======
+class InferenceExecutor:
+    """
+    Isole l'inférence de la boucle d'événements dans un pool borné, avec contrôle d'admission.
+
+    Au-delà de max_in_flight requêtes admises, admit() refuse aussitôt (Overloaded). Une requête
+    qui dépasse son échéance est abandonnée (DeadlineExceeded) : sa tâche est retirée de la file si
+    elle n'a pas démarré, ou ignorée par le worker qui la reçoit trop tard.
+
+    :param kind: "thread" (modèle partagé, NumPy et scikit-learn relâchent le GIL) ou "process"
+        (un exemplaire du modèle par processus, recréé à chaque bind).
+    :param workers: Taille du pool ; 0 ou None = nombre de cœurs.
+    """
+
+    def __init__(self, kind="thread", workers=None, max_in_flight=64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Exécuteur d'inférence inconnu : {kind}")
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.pending = 0
+        self.pool = None
+
+    def bind(self, serving):
+        # Mode processus : nouveau pool sur le nouveau modèle ; l'ancien termine ses tâches puis s'arrête
+        if self.kind != "process":
+            return
+        previous = self.pool
+        self.pool = ProcessPoolExecutor(
+            self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_process_worker,
+            initargs=(serving,),
+        )
+        if previous is not None:
+            previous.shutdown(wait=False)
+        logger.info(f"🧵 Pool d'inférence : {self.workers} processus sur le modèle {serving.version}")
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def _set_pending(self, delta):
+        self.pending += delta
+        queue_depth_gauge.set(max(0, self.pending - self.workers))
+
+    def _release(self, loop):
+        # Rappel du thread (ou du gestionnaire de processus) qui termine la tâche
+        try:
+            loop.call_soon_threadsafe(self._set_pending, -1)
+        except RuntimeError:
+            self._set_pending(-1)
+
+    async def execute(self, function, *args, deadline=None):
+        """
+        Exécute function(*args) dans le pool (sans contrôle d'admission).
+
+        :param deadline: Instant time.monotonic() au-delà duquel la tâche n'est plus lancée.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        if self.pool is None:
+            if self.kind == "process":
+                raise RuntimeError("Pool d'inférence sans modèle : bind() non appelé")
+            self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="inference")
+        future = self.pool.submit(guarded_call, function, args, deadline)
+        self._set_pending(1)
+        future.add_done_callback(lambda _: self._release(loop))
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            task_seconds.observe(time.perf_counter() - started)
+
+    async def predict(self, serving, items: list, chunk_size: int = 1000, deadline=None) -> list:
+        # Mode processus : le modèle lié par bind() est utilisé, serving n'est pas transmis
+        if self.kind == "process":
+            return await self.execute(predict_in_worker, items, chunk_size, deadline=deadline)
+        return await self.execute(serving.predict_items, items, chunk_size, deadline=deadline)
+
+    async def admit(self, awaitable, timeout_ms: float = 0):
+        """
+        Attend awaitable si la requête est admise, au plus timeout_ms (0 = sans échéance).
+
+        :raises Overloaded: max_in_flight requêtes admises, ou max_in_flight tâches encore dans le pool.
+        :raises DeadlineExceeded: échéance atteinte avant la réponse.
+        """
+        # Une requête arrivée à échéance libère sa place, mais sa tâche peut encore occuper le pool :
+        # les tâches non terminées (pending) bornent aussi l'admission
+        reason = "overload" if self.in_flight >= self.max_in_flight else "backlog" if self.pending >= self.max_in_flight else None
+        if reason is not None:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            rejected_counter.labels(reason).inc()
+            raise Overloaded()
+        self.in_flight += 1
+        in_flight_gauge.set(self.in_flight)
+        try:
+            return await asyncio.wait_for(awaitable, timeout_ms / 1000.0 if timeout_ms else None)
+        except asyncio.TimeoutError:
+            deadline_counter.labels("waiting").inc()
+            raise DeadlineExceeded()
+        except DeadlineExceeded:
+            deadline_counter.labels("queued").inc()
+            raise
+        finally:
+            self.in_flight -= 1
+            in_flight_gauge.set(self.in_flight)
+
+def deadline_after(timeout_ms: float):
+    return time.monotonic() + timeout_ms / 1000.0 if timeout_ms else None
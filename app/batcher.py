@@ -0,0 +1,121 @@
+# app/batcher.py
+import time
+import asyncio
+import logging
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+# ====== METRIQUES DU MICRO-BATCHING ======
+batch_size_histogram = Histogram(
+    "predict_micro_batch_size",
+    "Nombre de requêtes regroupées par appel à model.predict",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+queue_wait_histogram = Histogram(
+    "predict_micro_batch_queue_wait_seconds",
+    "Temps passé dans la file avant le lancement de l'inférence",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+inference_histogram = Histogram(
+    "predict_micro_batch_inference_seconds",
+    "Durée de l'inférence vectorisée d'un micro-lot",
+)
+
+class MicroBatcher:
+    """
+    Regroupe les appels concurrents à /v1/predict en un seul model.predict.
+
+    Un lot part dès qu'il atteint max_batch_size enregistrements ou que le plus ancien
+    a attendu max_wait_ms. L'inférence tourne dans un thread pour ne pas bloquer la boucle.
+
+    :param predict_batch: Fonction liste de dicts -> liste de (classe, message), dans l'ordre ;
+        si c'est une coroutine, elle est attendue telle quelle (exécuteur borné de l'appelant).
+    """
+
+    def __init__(self, predict_batch, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size doit être strictement positif")
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._worker = None
+        # Lot en cours de constitution ou d'inférence, échoué à l'arrêt avec les entrées encore en file
+        self._batch = []
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"🧺 Micro-batching actif (max {self.max_batch_size} requêtes / {self.max_wait * 1000:.1f} ms)")
+
+    async def stop(self):
+        if self._worker is not None:
+            # wait_for (Python < 3.12) peut absorber une annulation reçue pendant qu'un élément arrive :
+            # l'annulation est renouvelée jusqu'à l'arrêt effectif de la tâche
+            while not self._worker.done():
+                self._worker.cancel()
+                await asyncio.wait([self._worker], timeout=0.1)
+            if not self._worker.cancelled() and self._worker.exception() is not None:
+                logger.warning(f"⚠️ Micro-batching arrêté sur une erreur : {self._worker.exception()}")
+            self._worker = None
+            # Entrées jamais traitées : l'appelant reçoit une erreur au lieu d'attendre indéfiniment
+            pending = self._batch
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("MicroBatcher arrêté avant le traitement de la requête"))
+            self._batch = []
+
+    async def submit(self, record: dict) -> tuple:
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher non démarré")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        self._batch = batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Requêtes abandonnées (échéance dépassée) retirées avant l'inférence
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                continue
+            started = time.perf_counter()
+            batch_size_histogram.observe(len(batch))
+            for _, _, enqueued in batch:
+                queue_wait_histogram.observe(started - enqueued)
+
+            try:
+                records = [record for record, _, _ in batch]
+                if asyncio.iscoroutinefunction(self.predict_batch):
+                    results = await self.predict_batch(records)
+                else:
+                    results = await asyncio.to_thread(self.predict_batch, records)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                inference_histogram.observe(time.perf_counter() - started)
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._batch = []
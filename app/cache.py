@@ -0,0 +1,68 @@
+# app/cache.py
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from prometheus_client import Counter, Gauge
+
+from app.schema import LogistikData
+
+# ====== METRIQUES DU CACHE ======
+cache_hits = Counter("prediction_cache_hits", "Prédictions servies depuis le cache")
+cache_misses = Counter("prediction_cache_misses", "Prédictions absentes du cache")
+cache_evictions = Counter("prediction_cache_evictions", "Entrées évincées (LRU ou TTL expiré)")
+cache_size = Gauge("prediction_cache_entries", "Nombre d'entrées dans le cache de prédictions", multiprocess_mode="livesum")
+
+def make_cache_key(item: LogistikData, model_version: str) -> str:
+    # Hash canonique des champs validés + version du modèle chargé
+    canonical = json.dumps(item.model_dump(mode="json", by_alias=True), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(f"{model_version}|{canonical}".encode("utf-8")).hexdigest()
+
+class PredictionCache:
+    """
+    Cache borné en mémoire avec éviction LRU et durée de vie optionnelle.
+
+    :param max_entries: Nombre maximal d'entrées conservées.
+    :param ttl_seconds: Durée de vie d'une entrée (None ou 0 : pas d'expiration).
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = None):
+        if max_entries < 1:
+            raise ValueError("max_entries doit être strictement positif")
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds or None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                cache_evictions.inc()
+                cache_size.set(len(self._entries))
+                entry = None
+            if entry is None:
+                cache_misses.inc()
+                return None
+            self._entries.move_to_end(key)
+            cache_hits.inc()
+            return entry[0]
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                cache_evictions.inc()
+            cache_size.set(len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            cache_size.set(0)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,167 @@
+# app/compiled.py
+import logging
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.compose import ColumnTransformer
+
+from app.schema import LogistikData, categorical_fields, sample_records
+from app.model_loader import unwrap_model
+
+logger = logging.getLogger(__name__)
+
+def _is_tree_model(estimator) -> bool:
+    # Les arbres scikit-learn travaillent en float32 : inutile de garder du float64
+    return hasattr(estimator, "estimators_") or hasattr(estimator, "tree_")
+
+class CompiledPipeline:
+    """
+    Chemin d'inférence sans pandas pour un pipeline (ColumnTransformer -> classifieur).
+
+    Les paramètres du RobustScaler et les encodages CatBoostEncoder appris sont extraits une seule
+    fois en tableaux NumPy indexés par l'ordinal de l'Enum, puis chaque LogistikData est encodé
+    directement en une ligne float32 (float64 pour les modèles non arborescents).
+    """
+
+    def __init__(self, estimator, segments, dtype):
+        # segments : liste ordonnée de ("num", [(champ, centre, échelle)]) ou ("cat", [(champ, index, table)])
+        self.estimator = estimator
+        self.segments = segments
+        self.dtype = dtype
+        self.n_features = sum(len(columns) for _, columns in segments)
+
+    # ====== CONSTRUCTION A PARTIR D'UN PIPELINE ENTRAINE ======
+    @classmethod
+    def from_model(cls, model):
+        """
+        Compile le modèle chargé, ou retourne None si sa structure n'est pas reconnue.
+        """
+        pipeline = unwrap_model(model)
+        if not isinstance(pipeline, Pipeline) or len(pipeline.steps) != 2:
+            return None
+        preprocessor, estimator = pipeline.steps[0][1], pipeline.steps[1][1]
+        if not isinstance(preprocessor, ColumnTransformer):
+            return None
+
+        aliases = {field.alias: name for name, field in LogistikData.model_fields.items()}
+        enums = categorical_fields()
+        segments = []
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            if transformer == "passthrough" or any(col not in aliases for col in columns):
+                return None
+            if all(col in enums for col in columns):
+                segments.append(("cat", cls._compile_categorical(transformer, columns, aliases, enums)))
+            elif not any(col in enums for col in columns):
+                numeric = cls._compile_numeric(transformer, columns, aliases)
+                if numeric is None:
+                    return None
+                segments.append(("num", numeric))
+            else:
+                return None
+
+        dtype = np.float32 if _is_tree_model(estimator) else np.float64
+        return cls(estimator, segments, dtype)
+
+    @staticmethod
+    def _compile_numeric(transformer, columns, aliases):
+        scaler = transformer.steps[-1][1] if isinstance(transformer, Pipeline) else transformer
+        center = getattr(scaler, "center_", getattr(scaler, "mean_", None))
+        scale = getattr(scaler, "scale_", None)
+        if center is None and scale is None:
+            return None
+        center = np.zeros(len(columns)) if center is None else np.asarray(center, dtype=np.float64)
+        scale = np.ones(len(columns)) if scale is None else np.asarray(scale, dtype=np.float64)
+        return [(aliases[col], center[i], scale[i]) for i, col in enumerate(columns)]
+
+    @staticmethod
+    def _compile_categorical(transformer, columns, aliases, enums):
+        # Passe tout le vocabulaire de chaque Enum dans le transformeur appris (une seule fois)
+        vocab = [list(enums[col]) for col in columns]
+        n_rows = max(len(values) for values in vocab)
+        frame = pd.DataFrame({
+            col: [values[i % len(values)].value for i in range(n_rows)]
+            for col, values in zip(columns, vocab)
+        })
+        encoded = np.asarray(transformer.transform(frame), dtype=np.float64)
+
+        compiled = []
+        for j, (col, values) in enumerate(zip(columns, vocab)):
+            index = {member: i for i, member in enumerate(values)}
+            compiled.append((aliases[col], index, encoded[:len(values), j].copy()))
+        return compiled
+
+    # ====== ENCODAGE ======
+    def encode_many(self, items) -> np.ndarray:
+        rows = np.empty((len(items), self.n_features), dtype=np.float64)
+        for r, item in enumerate(items):
+            j = 0
+            for kind, columns in self.segments:
+                if kind == "num":
+                    for field, center, scale in columns:
+                        rows[r, j] = (getattr(item, field) - center) / scale
+                        j += 1
+                else:
+                    for field, index, table in columns:
+                        rows[r, j] = table[index[getattr(item, field)]]
+                        j += 1
+        return rows.astype(self.dtype, copy=False)
+
+    def encode(self, item: LogistikData) -> np.ndarray:
+        return self.encode_many([item])
+
+    # ====== PREDICTION ======
+    def _predict(self, rows: np.ndarray) -> np.ndarray:
+        estimators = getattr(self.estimator, "estimators_", None)
+        if not isinstance(estimators, list) or not hasattr(self.estimator, "classes_"):
+            return self.estimator.predict(rows)
+        # Forêt : même accumulation que predict_proba (arbre par arbre), sans le pool joblib
+        proba = estimators[0].predict_proba(rows, check_input=False)
+        for tree in estimators[1:]:
+            proba += tree.predict_proba(rows, check_input=False)
+        return self.estimator.classes_.take(np.argmax(proba, axis=1), axis=0)
+
+    def predict_many(self, items) -> list:
+        if not items:
+            return []
+        return [int(p) for p in self._predict(self.encode_many(items))]
+
+    def predict_one(self, item: LogistikData) -> int:
+        return int(self._predict(self.encode(item))[0])
+
+    # ====== CONTROLE DE PARITE AVEC LE PIPELINE COMPLET ======
+    def check_parity(self, model, records: list) -> bool:
+        """
+        Compare encodage et prédictions avec le pipeline complet sur les mêmes enregistrements.
+        """
+        pipeline = unwrap_model(model)
+        items = [LogistikData.model_validate(record) for record in records]
+        df = pd.DataFrame([item.dict(by_alias=True) for item in items])
+
+        expected = np.asarray(pipeline.steps[0][1].transform(df), dtype=np.float64).astype(self.dtype)
+        if not np.array_equal(expected, self.encode_many(items)):
+            logger.warning("⚠️ Encodage compilé différent du ColumnTransformer")
+            return False
+        if not np.array_equal(np.asarray(pipeline.predict(df)).astype(int), np.asarray(self.predict_many(items))):
+            logger.warning("⚠️ Prédictions compilées différentes du pipeline complet")
+            return False
+        return True
+
+def build_compiled_pipeline(model, n_parity_records: int = 512):
+    """
+    Compile le modèle au chargement et vérifie la parité ; retourne None en cas d'échec.
+    """
+    try:
+        compiled = CompiledPipeline.from_model(model)
+    except Exception as e:
+        logger.warning(f"⚠️ Compilation du pipeline impossible : {e}")
+        return None
+    if compiled is None:
+        logger.info("ℹ️ Structure de modèle non reconnue, chemin rapide désactivé")
+        return None
+    if not compiled.check_parity(model, sample_records(n_parity_records, seed=0)):
+        logger.warning("⚠️ Parité non vérifiée, chemin rapide désactivé")
+        return None
+    logger.info("⚡ Chemin d'inférence compilé activé")
+    return compiled
@@ -13,4 +13,65 @@ class Settings:
         self.bentoml = os.getenv("BENTOML_MODEL")
         self.api_title = os.getenv("API_TITLE")
         self.api_version = os.getenv("API_VERSION")
-        self.api_description = os.getenv("API_DESCRIPTION")
\ No newline at end of file
+        self.api_description = os.getenv("API_DESCRIPTION")
+        # Prédiction par lots
+        self.batch_chunk_size = int(os.getenv("BATCH_CHUNK_SIZE", "1000"))
+        # Isolation de l'inférence : pool borné ("thread" ou "process"), requêtes en vol et échéances (0 = aucune)
+        self.inference_executor = os.getenv("INFERENCE_EXECUTOR", "thread")
+        self.inference_workers = int(os.getenv("INFERENCE_WORKERS", "0"))
+        self.inference_max_in_flight = int(os.getenv("INFERENCE_MAX_IN_FLIGHT", "256"))
+        self.request_deadline_ms = float(os.getenv("REQUEST_DEADLINE_MS", "1000"))
+        self.batch_deadline_ms = float(os.getenv("BATCH_DEADLINE_MS", "30000"))
+        # Explications TreeSHAP (/v1/explain) : budget du calcul exact (0 = sans limite), grille coût/distance
+        # (0 = valeurs exactes ; > 0 = attributions du centre de cellule, méthode "cell")
+        self.explain_budget_ms = float(os.getenv("EXPLAIN_BUDGET_MS", "250"))
+        self.explain_grid_resolution = int(os.getenv("EXPLAIN_GRID_RESOLUTION", "0"))
+        self.explain_cache_max_entries = int(os.getenv("EXPLAIN_CACHE_MAX_ENTRIES", "50000"))
+        self.explain_max_records = int(os.getenv("EXPLAIN_MAX_RECORDS", "256"))
+        self.explain_top_k = int(os.getenv("EXPLAIN_TOP_K", "3"))
+        # Micro-batching des appels concurrents à /v1/predict
+        self.micro_batch_enabled = os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+        self.micro_batch_max_size = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+        self.micro_batch_max_wait_ms = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+        # Chemin d'inférence compilé (sans pandas)
+        self.fast_path_enabled = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+        # Mode tables précalculées (combinaisons catégorielles + grille de prédictions)
+        self.lookup_table_enabled = os.getenv("LOOKUP_TABLE_ENABLED", "false").lower() == "true"
+        self.prediction_grid_enabled = os.getenv("PREDICTION_GRID_ENABLED", "false").lower() == "true"
+        self.prediction_grid_resolution = int(os.getenv("PREDICTION_GRID_RESOLUTION", "64"))
+        self.prediction_grid_budget_mb = float(os.getenv("PREDICTION_GRID_BUDGET_MB", "64"))
+        self.prediction_grid_min_accuracy = float(os.getenv("PREDICTION_GRID_MIN_ACCURACY", "0.99"))
+        # Cache LRU/TTL des prédictions
+        self.prediction_cache_enabled = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+        self.prediction_cache_max_entries = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "10000"))
+        self.prediction_cache_ttl_seconds = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "0"))
+        # Écriture différée des prédictions dans MySQL
+        self.persist_predictions = os.getenv("PERSIST_PREDICTIONS", "true").lower() == "true"
+        self.persist_pool_size = int(os.getenv("PERSIST_POOL_SIZE", "5"))
+        self.persist_batch_size = int(os.getenv("PERSIST_BATCH_SIZE", "500"))
+        self.persist_flush_interval = float(os.getenv("PERSIST_FLUSH_INTERVAL", "1.0"))
+        self.persist_buffer_size = int(os.getenv("PERSIST_BUFFER_SIZE", "10000"))
+        self.persist_overflow = os.getenv("PERSIST_OVERFLOW", "drop")
+        # Rechargement à chaud du modèle
+        self.model_watch_enabled = os.getenv("MODEL_WATCH_ENABLED", "false").lower() == "true"
+        self.model_watch_uri = os.getenv("MODEL_WATCH_URI", self.mlflow or "")
+        self.model_watch_interval = float(os.getenv("MODEL_WATCH_INTERVAL", "30"))
+        self.golden_requests_path = os.getenv("GOLDEN_REQUESTS_PATH")
+        self.golden_min_agreement = float(os.getenv("GOLDEN_MIN_AGREEMENT", "0.9"))
+        # Cache local des artefacts de modèle
+        self.model_cache_enabled = os.getenv("MODEL_CACHE_ENABLED", "true").lower() == "true"
+        self.model_cache_dir = os.getenv("MODEL_CACHE_DIR", ".model_cache")
+        # Modèle exporté en tableaux mappés, partagé entre workers uvicorn
+        self.shared_model_dir = os.getenv("SHARED_MODEL_DIR")
+        # Moteur NumPy pour les forêts scikit-learn et CatBoost (model_type "NumPy")
+        self.numpy_engine_enabled = os.getenv("NUMPY_ENGINE_ENABLED", "false").lower() == "true"
+        # Dérive en ligne sur le trafic de prédiction (profil produit par python -m app.live_drift)
+        self.live_drift_enabled = os.getenv("LIVE_DRIFT_ENABLED", "true").lower() == "true"
+        self.live_drift_baseline_path = os.getenv("LIVE_DRIFT_BASELINE_PATH", "drift_baseline.json")
+        self.live_drift_flush_interval = float(os.getenv("LIVE_DRIFT_FLUSH_INTERVAL", "5"))
+        # Profilage à la demande (/admin/profile) : désactivé sans jeton, durée plafonnée
+        self.admin_token = os.getenv("ADMIN_TOKEN")
+        self.profile_max_seconds = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+        # Scoring hors ligne (score.py) : lignes par bloc et processus (0 = tous les cœurs)
+        self.score_chunk_size = int(os.getenv("SCORE_CHUNK_SIZE", "50000"))
+        self.score_workers = int(os.getenv("SCORE_WORKERS", "0"))
@@ -1,7 +1,9 @@
-import mysql.connector
+import time
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
+from prometheus_client import Counter, Gauge, Histogram
 
 load_dotenv()
 host = os.getenv("HOST")
@@ -9,7 +11,36 @@ user = os.getenv("USER")
 password = os.getenv("PASSWORD")
 database = os.getenv("DATABASE")
 
+logger = logging.getLogger(__name__)
+
+# ====== TABLE DES PREDICTIONS ======
+LOGISTIC_CHAIN_COLUMNS = (
+    "transportation_cost",
+    "distance_km",
+    "state",
+    "delivery_urgency",
+    "urgency_level",
+    "client_type",
+    "carrier_type",
+    "transportation_method",
+    "day_of_week",
+    "weather_condition",
+    "delivery_status",
+)
+
+def build_insert_query(placeholder="%s"):
+    columns = ", ".join(LOGISTIC_CHAIN_COLUMNS)
+    values = ", ".join([placeholder] * len(LOGISTIC_CHAIN_COLUMNS))
+    return f"INSERT INTO logistic_chain ({columns}) VALUES ({values})"
+
+def prediction_row(data, Delivery_Status):
+    # Les Enum sont stockés par leur valeur ("California", "Express"...)
+    values = [getattr(data, column) for column in LOGISTIC_CHAIN_COLUMNS[:-1]]
+    return tuple(getattr(value, "value", value) for value in values) + (Delivery_Status,)
+
 def insert_data(data, Delivery_Status):
+    import mysql.connector
+
     try:
         with mysql.connector.connect(
             host=host,
@@ -19,39 +50,9 @@ def insert_data(data, Delivery_Status):
         ) as connection:
             if connection.is_connected():
                 logging.info("✅ Connexion à MySQL réussie")
-            
+
             with connection.cursor() as cursor:
-                insert_query = """
-                INSERT INTO logistic_chain (
-                    transportation_cost, 
-                    distance_km, 
-                    state,
-                    delivery_urgency, 
-                    urgency_level,  
-                    client_type,
-                    carrier_type,
-                    transportation_method,
-                    day_of_week,
-                    weather_condition,
-                    delivery_status
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-
-                values = (
-                    data.transportation_cost,  
-                    data.distance_km,
-                    data.state,
-                    data.delivery_urgency,
-                    data.urgency_level,
-                    data.client_type,
-                    data.carrier_type,
-                    data.transportation_method,
-                    data.day_of_week,
-                    data.weather_condition,
-                    Delivery_Status
-                )
-
-                cursor.execute(insert_query, values)
+                cursor.execute(build_insert_query(), prediction_row(data, Delivery_Status))
                 connection.commit()
                 print("✅ Nouvelles données enregistrées avec succès")
 
@@ -62,3 +63,134 @@ def insert_data(data, Delivery_Status):
     except Exception as e:
         logging.error(f"❌ Erreur générale : {e}")
         print(f"❌ Erreur générale : {e}")
+
+def mysql_pool_factory(pool_size=5, pool_name="routewise"):
+    # Fabrique de connexions issues d'un pool MySQL (close() rend la connexion au pool)
+    from mysql.connector import pooling
+
+    pool = pooling.MySQLConnectionPool(
+        pool_name=pool_name,
+        pool_size=pool_size,
+        host=host,
+        user=user,
+        password=password,
+        database=database
+    )
+    return pool.get_connection
+
+# ====== METRIQUES DE PERSISTANCE ======
+rows_written = Counter("predictions_persisted", "Prédictions insérées dans logistic_chain")
+rows_dropped = Counter("predictions_persist_dropped", "Prédictions abandonnées (file pleine)")
+rows_failed = Counter("predictions_persist_failed", "Prédictions perdues suite à une erreur d'insertion")
+buffer_depth = Gauge("predictions_persist_queue_depth", "Prédictions en attente d'écriture", multiprocess_mode="livesum")
+flush_size = Histogram(
+    "predictions_persist_flush_size",
+    "Nombre de lignes par executemany",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 5000),
+)
+
+_STOP = object()
+
+class PredictionWriter:
+    """
+    Écriture différée des prédictions : file asynchrone bornée vidée par une tâche de fond.
+
+    Les lignes sont insérées par executemany dès que max_batch lignes sont en attente ou que
+    flush_interval secondes se sont écoulées. La file pleine applique la politique overflow :
+    "drop" abandonne la prédiction (compteur), "block" fait attendre la requête (backpressure).
+
+    :param connection_factory: Callable sans argument retournant une connexion DB-API
+        (pool MySQL en production, sqlite3 en test).
+    :param placeholder: Marqueur de paramètre du driver ("%s" pour MySQL, "?" pour SQLite).
+    """
+
+    def __init__(self, connection_factory, placeholder="%s", max_batch=500, flush_interval=1.0,
+                 max_buffer=10000, overflow="drop"):
+        if overflow not in ("drop", "block"):
+            raise ValueError("overflow doit valoir 'drop' ou 'block'")
+        self.connection_factory = connection_factory
+        self.query = build_insert_query(placeholder)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.overflow = overflow
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_buffer)
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"🗄️ Écriture différée active (lots de {self.max_batch}, {self.flush_interval}s)")
+
+    async def stop(self):
+        # Sentinelle en fin de file : la tâche écrit tout ce qui précède puis s'arrête
+        if self._worker is None:
+            return
+        await self._queue.put(_STOP)
+        await self._worker
+        self._worker = None
+
+    async def enqueue(self, data, Delivery_Status) -> bool:
+        if self._queue is None:
+            raise RuntimeError("PredictionWriter non démarré")
+        row = prediction_row(data, Delivery_Status)
+        if self.overflow == "block":
+            await self._queue.put(row)
+        else:
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                rows_dropped.inc()
+                return False
+        buffer_depth.set(self._queue.qsize())
+        return True
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is _STOP:
+                break
+            rows = [row]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    row = self._queue.get_nowait()
+                if row is _STOP:
+                    stopping = True
+                    break
+                rows.append(row)
+            await self._flush(rows)
+
+    async def _flush(self, rows):
+        if not rows:
+            return
+        buffer_depth.set(self._queue.qsize())
+        try:
+            await asyncio.to_thread(self._write, rows)
+            rows_written.inc(len(rows))
+            flush_size.observe(len(rows))
+        except Exception as e:
+            rows_failed.inc(len(rows))
+            logger.error(f"❌ Échec de l'insertion de {len(rows)} prédictions : {e}")
+
+    def _write(self, rows):
+        connection = self.connection_factory()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.executemany(self.query, rows)
+            finally:
+                cursor.close()
+            connection.commit()
+        finally:
+            connection.close()
@@ -0,0 +1,221 @@
+# app/explainer.py
+import time
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from prometheus_client import Counter, Gauge
+from sklearn.pipeline import Pipeline
+from sklearn.compose import ColumnTransformer
+
+from app.schema import LogistikData, categorical_fields, numeric_bounds, sample_records
+from app.model_loader import unwrap_model
+
+logger = logging.getLogger(__name__)
+
+# ====== METRIQUES DES EXPLICATIONS ======
+explained_rows = Counter("explanation_rows", "Enregistrements expliqués, par méthode (exact, cell, approximate) et lecture du cache", ["method", "cached"])
+explanation_cache_entries = Gauge("explanation_cache_entries", "Attributions conservées dans le cache des explications", multiprocess_mode="livesum")
+
+class ExplanationUnavailable(Exception):
+    """Modèle servi sans arbres exploitables par TreeSHAP (moteur NumPy, modèle linéaire...)."""
+
+class TreeExplanations:
+    """
+    TreeSHAP construit une fois par modèle servi, avec cache LRU des attributions et budget de temps.
+
+    Le cache est indexé par la combinaison catégorielle (finie, fixée par les Enum du schéma) et par les
+    valeurs numériques. Par défaut (grid_resolution=0) ce sont les valeurs exactes : les attributions sont
+    celles de l'enregistrement. Avec grid_resolution > 0, coût et distance sont ramenés à une cellule de
+    grille et les attributions sont celles de son centre (méthode "cell") : elles ne somment plus
+    exactement à la probabilité servie, en échange d'un cache bien plus souvent atteint.
+
+    Les clés absentes du cache passent en TreeSHAP tant que le coût estimé tient dans le budget ; les
+    suivantes reçoivent l'approximation de Saabas (shap approximate=True), non mise en cache.
+
+    :param explainer: shap.TreeExplainer de l'estimateur.
+    :param encode: Fonction liste de LogistikData -> entrées de l'estimateur.
+    :param feature_names: Alias des champs, dans l'ordre des colonnes de l'estimateur.
+    :param approximate: Fonction entrées encodées -> attributions approchées ; par défaut Saabas de shap.
+    """
+
+    def __init__(self, explainer, encode, feature_names, grid_resolution=0, max_entries=50000, approximate=None):
+        self.explainer = explainer
+        self.encode = encode
+        self.approximate = approximate
+        self.feature_names = list(feature_names)
+        self.grid_resolution = grid_resolution
+        self.max_entries = max_entries
+
+        fields = {field.alias: name for name, field in LogistikData.model_fields.items()}
+        self.categorical = [fields[alias] for alias in categorical_fields()]
+        bounds = numeric_bounds()
+        self.numeric = [fields[alias] for alias in bounds]
+        self.low = np.array([low for low, _ in bounds.values()], dtype=np.float64)
+        self.width = np.array([high - low for low, high in bounds.values()], dtype=np.float64) / max(grid_resolution, 1)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Coût d'une ligne en TreeSHAP exact (moyenne glissante), mesuré dès la construction
+        self.exact_row_seconds = 0.0
+        warmup = [LogistikData.model_validate(record) for record in sample_records(4, seed=7)]
+        if self._measured(warmup).shape[1] != len(self.feature_names):
+            raise ExplanationUnavailable("Colonnes de l'estimateur sans correspondance un à un avec les champs du schéma")
+        # Valeur de base lue après le premier calcul (renseignée à ce moment pour CatBoost)
+        self.base_value = float(np.ravel(explainer.expected_value)[-1])
+
+    # ====== CLE ET POINT EXPLIQUE ======
+    def cell(self, item: LogistikData) -> tuple:
+        values = np.array([getattr(item, name) for name in self.numeric], dtype=np.float64)
+        if self.grid_resolution <= 0:
+            return tuple(values)
+        return tuple(np.clip(((values - self.low) // self.width).astype(int), 0, self.grid_resolution - 1))
+
+    def key(self, item: LogistikData) -> tuple:
+        return tuple(getattr(item, name).value for name in self.categorical) + self.cell(item)
+
+    def point(self, item: LogistikData) -> LogistikData:
+        # Centre de la cellule : les numériques de l'enregistrement remplacés, les catégorielles gardées
+        if self.grid_resolution <= 0:
+            return item
+        centers = self.low + (np.asarray(self.cell(item)) + 0.5) * self.width
+        return item.model_copy(update={name: float(center) for name, center in zip(self.numeric, centers)})
+
+    # ====== CALCUL DES ATTRIBUTIONS ======
+    def attributions(self, items: list, approximate: bool = False) -> np.ndarray:
+        """
+        :return: Tableau (n, champs) des contributions à la classe "Late".
+        """
+        rows = self.encode(items)
+        if approximate and self.approximate is not None:
+            values = self.approximate(rows)
+        else:
+            values = self.explainer.shap_values(rows, approximate=approximate, check_additivity=False)
+        if isinstance(values, list):
+            values = values[-1]
+        values = np.asarray(values, dtype=np.float64)
+        return values[..., -1] if values.ndim == 3 else values
+
+    def _measured(self, points: list) -> np.ndarray:
+        started = time.perf_counter()
+        values = self.attributions(points)
+        per_row = (time.perf_counter() - started) / len(points)
+        self.exact_row_seconds = per_row if not self.exact_row_seconds else 0.8 * self.exact_row_seconds + 0.2 * per_row
+        return values
+
+    # ====== CACHE LRU ======
+    def _get(self, key):
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+            return values
+
+    def _set(self, key, values):
+        with self._lock:
+            self._entries[key] = values
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            explanation_cache_entries.set(len(self._entries))
+
+    # ====== EXPLICATION D'UN LOT ======
+    def explain(self, items: list, budget_ms: float = 0, top_k: int = 3) -> list:
+        """
+        Explique un lot d'enregistrements validés, dans l'ordre d'entrée.
+
+        "Method" vaut "exact" (TreeSHAP de l'enregistrement), "cell" (TreeSHAP du centre de sa cellule,
+        grid_resolution > 0) ou "approximate" (Saabas de l'enregistrement, budget épuisé) ; "Cached"
+        indique une lecture du cache.
+
+        :param budget_ms: Temps alloué au TreeSHAP des clés absentes du cache (0 = sans limite).
+        :return: Liste de {"Method", "Cached", "Base Value", "Attributions", "Top Reasons"}.
+        """
+        started = time.perf_counter()
+        keys = [self.key(item) for item in items]
+        found = {key: self._get(key) for key in dict.fromkeys(keys)}
+        cached = {key: values is not None for key, values in found.items()}
+        missing = [key for key, values in found.items() if values is None]
+        method = "exact" if self.grid_resolution <= 0 else "cell"
+
+        n_exact = len(missing)
+        if missing and budget_ms > 0 and self.exact_row_seconds > 0:
+            remaining = budget_ms / 1000.0 - (time.perf_counter() - started)
+            n_exact = min(n_exact, max(0, int(remaining / self.exact_row_seconds)))
+        exact, approximate = missing[:n_exact], set(missing[n_exact:])
+        if exact:
+            points = {key: self.point(item) for item, key in zip(items, keys) if key in exact}
+            for key, values in zip(exact, self._measured([points[key] for key in exact])):
+                self._set(key, values)
+                found[key] = values
+
+        rows = [found[key] for key in keys]
+        # Approximation calculée sur l'enregistrement lui-même, jamais mise en cache
+        fallback = [i for i, key in enumerate(keys) if key in approximate]
+        if fallback:
+            for i, values in zip(fallback, self.attributions([items[i] for i in fallback], approximate=True)):
+                rows[i] = values
+
+        results = []
+        for item, key, values in zip(items, keys, rows):
+            row_method = "approximate" if key in approximate else method
+            explained_rows.labels(row_method, str(cached[key]).lower()).inc()
+            inputs = item.model_dump(by_alias=True, mode="json")
+            order = [j for j in np.argsort(-values) if values[j] > 0][:top_k]
+            results.append({
+                "Method": row_method,
+                "Cached": cached[key],
+                "Base Value": self.base_value,
+                "Attributions": {name: float(value) for name, value in zip(self.feature_names, values)},
+                "Top Reasons": [
+                    {"Feature": self.feature_names[j], "Value": inputs.get(self.feature_names[j]), "Contribution": float(values[j])}
+                    for j in order
+                ],
+            })
+        return results
+
+# ====== CONSTRUCTION A PARTIR DU MODELE SERVI ======
+def build_tree_explanations(serving, grid_resolution=0, max_entries=50000) -> TreeExplanations:
+    """
+    Construit l'explicateur du modèle servi : pipeline (ColumnTransformer -> arbres) ou CatBoost brut.
+
+    :raises ExplanationUnavailable: Structure non reconnue ou estimateur refusé par TreeSHAP.
+    """
+    import shap
+
+    raw = unwrap_model(serving.model)
+    if type(raw).__name__ == "CatBoostClassifier":
+        estimator, names = raw, list(raw.feature_names_)
+
+        def encode(items):
+            return pd.DataFrame([item.dict(by_alias=True) for item in items])[names]
+
+        def approximate(rows):
+            # shap refuse approximate=True pour CatBoost : calcul approché natif, colonne de la valeur de base retirée
+            from catboost import Pool
+
+            pool = Pool(rows, cat_features=raw.get_cat_feature_indices())
+            return raw.get_feature_importance(pool, type="ShapValues", shap_calc_type="Approximate")[:, :-1]
+    elif isinstance(raw, Pipeline) and len(raw.steps) == 2 and isinstance(raw.steps[0][1], ColumnTransformer):
+        preprocessor, estimator = raw.steps[0][1], raw.steps[1][1]
+        # Une colonne transformée par champ (RobustScaler, CatBoostEncoder) : attributions par champ d'entrée
+        names = [column for _, transformer, columns in preprocessor.transformers_ if transformer != "drop" for column in columns]
+        approximate = None
+        compiled = getattr(serving.compiled, "compiled", serving.compiled)
+        if compiled is not None and hasattr(compiled, "encode_many"):
+            encode = compiled.encode_many
+        else:
+            def encode(items):
+                return preprocessor.transform(pd.DataFrame([item.dict(by_alias=True) for item in items]))
+    else:
+        raise ExplanationUnavailable(f"Structure de modèle non prise en charge : {type(raw).__name__}")
+
+    try:
+        explainer = shap.TreeExplainer(estimator)
+    except Exception as e:
+        raise ExplanationUnavailable(f"TreeSHAP indisponible pour {type(estimator).__name__} : {e}")
+    started = time.perf_counter()
+    explanations = TreeExplanations(explainer, encode, names, grid_resolution, max_entries, approximate)
+    logger.info(f"🔎 Explicateur TreeSHAP prêt en {time.perf_counter() - started:.2f}s ({explanations.exact_row_seconds * 1000:.1f} ms par ligne exacte)")
+    return explanations
@@ -0,0 +1,191 @@
+# app/hot_reload.py
+import os
+import json
+import time
+import asyncio
+import logging
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.schema import LogistikData, sample_records
+from app.predictor import make_batch_prediction, format_message
+from app.profiling import stage_timer
+
+logger = logging.getLogger(__name__)
+
+# ====== METRIQUES DU MODELE ACTIF ======
+# Mode multiprocess : version servie par worker vivant, activation la plus récente tous workers confondus
+model_info = Gauge("model_active_info", "Modèle actuellement servi (valeur 1)", ["model_type", "version"], multiprocess_mode="liveall")
+model_loaded_at = Gauge("model_last_reload_timestamp_seconds", "Horodatage de l'activation du modèle courant", multiprocess_mode="max")
+reload_duration = Histogram(
+    "model_reload_duration_seconds",
+    "Durée de chargement + préchauffage + contrôle d'un nouveau modèle",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+reload_total = Counter("model_reloads", "Tentatives de rechargement du modèle", ["result"])
+
+class ServingModel:
+    """
+    Modèle servi et tout ce qui en dépend (version, chemin compilé), remplacé d'un bloc.
+
+    Une requête lit la référence une seule fois : elle termine sur ce modèle même si un
+    rechargement a lieu entre-temps.
+    """
+
+    def __init__(self, model, model_type, version, compiled=None):
+        self.model = model
+        self.model_type = model_type
+        self.version = version
+        self.compiled = compiled
+        # Explicateur TreeSHAP (/v1/explain), construit à la première demande
+        self.explanations = None
+        self.loaded_at = time.time()
+        # Version du cache de prédictions : MODEL_VERSION reste identique d'un rechargement à l'autre,
+        # l'activation la distingue (une requête en cours ne réinsère pas une prédiction de l'ancien modèle)
+        self.cache_version = f"{version}@{self.loaded_at!r}"
+
+    def predict_one(self, item: LogistikData) -> tuple:
+        if self.compiled is not None:
+            # Chemin compilé : encodage NumPy et arbres en une seule étape
+            with stage_timer("compiled", self.model_type, self.version):
+                code = self.compiled.predict_one(item)
+            return code, format_message(code)
+        return self.predict_items([item])[0]
+
+    def predict_items(self, items: list, chunk_size: int = 1000) -> list:
+        if self.compiled is not None:
+            with stage_timer("compiled", self.model_type, self.version):
+                codes = self.compiled.predict_many(items)
+            return [(code, format_message(code)) for code in codes]
+        records = [item.dict(by_alias=True) for item in items]
+        return make_batch_prediction(self.model, self.model_type, records, chunk_size, self.version)
+
+published_models = set()
+
+def publish_model_metrics(serving: ServingModel):
+    # Anciennes versions remises à 0 : clear() n'est pas pris en charge en mode multiprocess (PROMETHEUS_MULTIPROC_DIR)
+    for model_type, version in published_models:
+        model_info.labels(model_type=model_type, version=version).set(0)
+    published_models.add((serving.model_type, serving.version))
+    model_info.labels(model_type=serving.model_type, version=serving.version).set(1)
+    model_loaded_at.set(serving.loaded_at)
+
+# ====== JEU DE REQUETES DE REFERENCE ======
+def load_golden_requests(path=None, n_default=64) -> list:
+    """
+    Charge le jeu de référence NDJSON ; chaque ligne peut porter la classe attendue sous "Code".
+
+    :return: Liste de (LogistikData, code attendu ou None).
+    """
+    if not path or not os.path.exists(path):
+        return [(LogistikData.model_validate(r), None) for r in sample_records(n_default, seed=99)]
+    golden = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                golden.append((LogistikData.model_validate(record), record.get("Code")))
+    return golden
+
+def check_golden(serving: ServingModel, golden: list, min_agreement: float = 0.9) -> bool:
+    # Préchauffe le modèle et vérifie ses sorties sur le jeu de référence
+    items = [item for item, _ in golden]
+    predictions = [code for code, _ in serving.predict_items(items)]
+    if any(code not in (0, 1) for code in predictions):
+        logger.warning("⚠️ Classes inattendues sur le jeu de référence")
+        return False
+    expected = [(code, target) for code, (_, target) in zip(predictions, golden) if target is not None]
+    if expected:
+        agreement = sum(code == target for code, target in expected) / len(expected)
+        if agreement < min_agreement:
+            logger.warning(f"⚠️ Accord {agreement:.3f} < {min_agreement} sur le jeu de référence")
+            return False
+    return True
+
+# ====== EMPREINTE DE LA SOURCE DU MODELE ======
+def fingerprint_source(uri: str) -> str:
+    """
+    Empreinte qui change quand un nouveau modèle est publié à cet emplacement.
+
+    Répertoire ou fichier local : noms, tailles et dates de modification.
+    Registry MLflow (models:/nom/Stage) : numéro et run de la dernière version du stage.
+    """
+    if os.path.exists(uri):
+        paths = [uri]
+        if os.path.isdir(uri):
+            paths = [os.path.join(root, name) for root, _, files in os.walk(uri) for name in files]
+        entries = []
+        for path in sorted(paths):
+            stat = os.stat(path)
+            entries.append(f"{os.path.relpath(path, uri)}:{stat.st_size}:{stat.st_mtime_ns}")
+        return "|".join(entries)
+    if uri.startswith("models:/"):
+        from mlflow.tracking import MlflowClient
+
+        name, _, stage = uri[len("models:/"):].partition("/")
+        if stage.isdigit():
+            return uri
+        versions = MlflowClient().get_latest_versions(name, stages=[stage or "Production"])
+        return "|".join(f"{v.version}:{v.run_id}" for v in versions)
+    return uri
+
+class ModelWatcher:
+    """
+    Surveille une source de modèle et bascule sans interruption quand elle change.
+
+    :param prepare: Fonction bloquante uri -> ServingModel (chargement, préchauffage, contrôle) ;
+        exécutée dans un thread, elle lève une exception si le candidat est refusé.
+    :param swap: Fonction appelée dans la boucle avec le nouveau ServingModel.
+    """
+
+    def __init__(self, uri, prepare, swap, interval=30.0):
+        self.uri = uri
+        self.prepare = prepare
+        self.swap = swap
+        self.interval = interval
+        self.fingerprint = None
+        self._task = None
+
+    async def start(self, initial_fingerprint=None):
+        if self._task is None:
+            self.fingerprint = initial_fingerprint
+            if self.fingerprint is None:
+                self.fingerprint = await asyncio.to_thread(fingerprint_source, self.uri)
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"👀 Surveillance du modèle : {self.uri} (toutes les {self.interval}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check_once(self) -> bool:
+        fingerprint = await asyncio.to_thread(fingerprint_source, self.uri)
+        if fingerprint == self.fingerprint:
+            return False
+        started = time.perf_counter()
+        try:
+            candidate = await asyncio.to_thread(self.prepare, self.uri)
+        except Exception as e:
+            reload_total.labels(result="rejected").inc()
+            logger.error(f"❌ Nouveau modèle refusé ({self.uri}) : {e}")
+            # Même empreinte refusée : on ne réessaie qu'au prochain changement
+            self.fingerprint = fingerprint
+            return False
+        self.swap(candidate)
+        self.fingerprint = fingerprint
+        reload_duration.observe(time.perf_counter() - started)
+        reload_total.labels(result="swapped").inc()
+        logger.info(f"🔁 Modèle rechargé : {candidate.model_type} ({candidate.version})")
+        return True
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check_once()
+            except Exception as e:
+                logger.error(f"❌ Surveillance du modèle : {e}")
@@ -0,0 +1,173 @@
+# app/live_drift.py
+import os
+import json
+import asyncio
+import logging
+import argparse
+from bisect import bisect_right
+from prometheus_client import Counter, Gauge
+
+from app.schema import LogistikData
+from app.predictor import logistik_mapping
+from drift.streaming import psi_from_counts
+
+logger = logging.getLogger(__name__)
+
+# Comptages additifs, PSI calculé par drift_rules.yml. Avec uvicorn --workers N, les comptages de tous les workers ne
+# sont agrégés que si PROMETHEUS_MULTIPROC_DIR est défini (et vidé au démarrage : docker/Dockerfile, make run_workers) ;
+# /metrics passe alors par MultiProcessCollector. Sans lui, chaque scrape ne voit que le worker qui répond.
+live_observations = Counter("live_drift_observations", "Requêtes servies par case de la baseline", ["feature", "bin"])
+baseline_ratio = Gauge(
+    "live_drift_baseline_ratio",
+    "Proportion de la baseline dans chaque case",
+    ["feature", "bin"],
+    multiprocess_mode="max",
+)
+
+PREDICTION_FEATURE = "Delivery_Status"
+
+# ====== PROFIL DE REFERENCE ======
+def build_baseline_profile(frame, bins: int = 10) -> dict:
+    """
+    Profil JSON de la baseline : bornes intérieures et comptages des numériques (mêmes quantiles que
+    DriftEngine), comptages par valeur d'Enum des catégorielles et distribution de Delivery_Status.
+    """
+    from drift.engine import DriftEngine
+
+    engine = DriftEngine.from_baseline(frame, bins=bins)
+    profile = {"numeric": {}, "categorical": {}}
+    for f, col in enumerate(engine.numeric_columns):
+        profile["numeric"][col] = {"edges": engine.edges[f].tolist(), "counts": engine.baseline_numeric[f].tolist()}
+    for c, (col, vocabulary) in enumerate(zip(engine.categorical_columns, engine.vocabularies)):
+        profile["categorical"][col] = {"values": vocabulary, "counts": engine.baseline_categorical[c, :len(vocabulary)].tolist()}
+    if PREDICTION_FEATURE in frame:
+        labels = [logistik_mapping.get(int(v), str(v)) if not isinstance(v, str) else v for v in frame[PREDICTION_FEATURE].dropna()]
+        classes = list(logistik_mapping.values())
+        profile["categorical"][PREDICTION_FEATURE] = {"values": classes, "counts": [labels.count(name) for name in classes]}
+    return profile
+
+def load_baseline_profile(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+# ====== SKETCHES PAR WORKER ======
+class LiveDriftTracker:
+    """
+    Histogrammes du trafic réel, mis à jour à chaque requête validée.
+
+    Chaque worker compte dans une simple liste d'entiers (bisect sur les bornes de la baseline pour
+    les numériques, index par valeur d'Enum pour les catégorielles, classe prédite). Les mises à jour
+    et le vidage vers Prometheus s'exécutent tous deux dans la boucle d'événements : aucun verrou.
+    Les deltas sont ajoutés aux compteurs live_drift_observations toutes les flush_interval secondes.
+
+    :param profile: Profil produit par build_baseline_profile.
+    """
+
+    def __init__(self, profile: dict, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self.cells = []
+        self.baseline = []
+        aliases = {field.alias: name for name, field in LogistikData.model_fields.items()}
+        self._numeric = []
+        self._categorical = []
+        for col, spec in profile.get("numeric", {}).items():
+            if col in aliases:
+                self._numeric.append((aliases[col], spec["edges"], len(self.cells)))
+                self._add_feature(col, [str(i) for i in range(len(spec["edges"]) + 1)], spec["counts"])
+        for col, spec in profile.get("categorical", {}).items():
+            if col in aliases:
+                index = {value: len(self.cells) + i for i, value in enumerate(spec["values"])}
+                self._categorical.append((aliases[col], index))
+                self._add_feature(col, spec["values"], spec["counts"])
+        spec = profile.get("categorical", {}).get(PREDICTION_FEATURE)
+        self._classes = {}
+        if spec is not None:
+            self._classes = {value: len(self.cells) + i for i, value in enumerate(spec["values"])}
+            self._add_feature(PREDICTION_FEATURE, spec["values"], spec["counts"])
+        self.pending = [0] * len(self.cells)
+        self.totals = [0] * len(self.cells)
+        self._task = None
+
+    def _add_feature(self, feature, bins, counts):
+        total = sum(counts)
+        for label, count in zip(bins, counts):
+            self.cells.append((feature, label))
+            self.baseline.append(count)
+            baseline_ratio.labels(feature=feature, bin=label).set(count / total if total else 0.0)
+
+    def observe(self, item: LogistikData, predicted_class=None):
+        pending = self.pending
+        for name, edges, offset in self._numeric:
+            pending[offset + bisect_right(edges, getattr(item, name))] += 1
+        for name, index in self._categorical:
+            value = getattr(item, name)
+            cell = index.get(getattr(value, "value", value))
+            if cell is not None:
+                pending[cell] += 1
+        cell = self._classes.get(logistik_mapping.get(predicted_class))
+        if cell is not None:
+            pending[cell] += 1
+
+    def flush(self):
+        pending, self.pending = self.pending, [0] * len(self.cells)
+        for cell, delta in enumerate(pending):
+            if delta:
+                feature, label = self.cells[cell]
+                live_observations.labels(feature=feature, bin=label).inc(delta)
+                self.totals[cell] += delta
+
+    def psi(self) -> dict:
+        # PSI de ce worker seul depuis le démarrage (le PSI fusionné est calculé côté Prometheus)
+        counts = [total + pending for total, pending in zip(self.totals, self.pending)]
+        features = {}
+        for cell, (feature, _) in enumerate(self.cells):
+            features.setdefault(feature, []).append(cell)
+        return {
+            feature: psi_from_counts([self.baseline[c] for c in cells], [counts[c] for c in cells])
+            for feature, cells in features.items()
+        }
+
+    # ====== VIDAGE PERIODIQUE ======
+    async def start(self):
+        for feature, label in self.cells:
+            # Séries créées à zéro : une case jamais atteinte compte dans le PSI
+            live_observations.labels(feature=feature, bin=label)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+def build_live_drift(path, flush_interval):
+    profile = load_baseline_profile(path)
+    if profile is None:
+        logger.warning(f"⚠️ Profil de baseline introuvable ({path}) : dérive en ligne désactivée")
+        return None
+    return LiveDriftTracker(profile, flush_interval)
+
+if __name__ == "__main__":
+    from train_pipeline.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Profil de baseline pour la dérive en ligne")
+    parser.add_argument("--dataset", default=os.getenv("TRAIN_DATASET_PATH"))
+    parser.add_argument("--output", default=os.getenv("LIVE_DRIFT_BASELINE_PATH", "drift_baseline.json"))
+    parser.add_argument("--bins", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = load_dataset(args.dataset)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(build_baseline_profile(baseline, args.bins), handle, ensure_ascii=False, indent=2)
+    print(f"✅ Profil de baseline écrit dans {args.output}")
@@ -0,0 +1,182 @@
+# app/lookup_table.py
+import logging
+import numpy as np
+from prometheus_client import Gauge
+
+from app.schema import LogistikData, numeric_bounds, sample_records
+
+logger = logging.getLogger(__name__)
+
+# ====== METRIQUES ======
+table_bytes_gauge = Gauge("lookup_table_bytes", "Mémoire occupée par les tables précalculées", ["table"])
+grid_accuracy_gauge = Gauge("prediction_grid_accuracy", "Taux d'accord de la grille quantifiée avec l'inférence exacte")
+
+class CategoricalTable:
+    """
+    Partie catégorielle du vecteur transformé, précalculée pour toutes les combinaisons d'Enum.
+
+    Chaque combinaison est repérée par une clé entière (base mixte sur les ordinaux), la ligne
+    transformée devient une lecture de table plus la mise à l'échelle des deux numériques.
+    """
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.numeric, self.categorical = [], []
+        position = 0
+        for kind, columns in compiled.segments:
+            for column in columns:
+                (self.numeric if kind == "num" else self.categorical).append((position, column))
+                position += 1
+
+        self.num_positions = np.array([p for p, _ in self.numeric], dtype=np.intp)
+        self.cat_positions = np.array([p for p, _ in self.categorical], dtype=np.intp)
+        self.centers = np.array([center for _, (_, center, _) in self.numeric])
+        self.scales = np.array([scale for _, (_, _, scale) in self.numeric])
+        radices = [len(index) for _, (_, index, _) in self.categorical]
+        self.strides = np.array([int(np.prod(radices[j + 1:])) for j in range(len(radices))], dtype=np.int64)
+        self.size = int(np.prod(radices))
+
+        keys = np.arange(self.size, dtype=np.int64)
+        self.table = np.empty((self.size, len(self.categorical)), dtype=compiled.dtype)
+        for j, (_, (_, _, lookup)) in enumerate(self.categorical):
+            self.table[:, j] = lookup[(keys // self.strides[j]) % radices[j]]
+        table_bytes_gauge.labels(table="categorical").set(self.table.nbytes)
+
+    def key(self, item: LogistikData) -> int:
+        key = 0
+        for stride, (_, (field, index, _)) in zip(self.strides, self.categorical):
+            key += int(stride) * index[getattr(item, field)]
+        return key
+
+    def numerics(self, items) -> np.ndarray:
+        values = np.array([[getattr(item, field) for _, (field, _, _) in self.numeric] for item in items], dtype=np.float64)
+        return values.reshape(len(items), len(self.numeric))
+
+    def encode_many(self, items) -> np.ndarray:
+        rows = np.empty((len(items), self.compiled.n_features), dtype=np.float64)
+        rows[:, self.num_positions] = (self.numerics(items) - self.centers) / self.scales
+        rows[:, self.cat_positions] = self.table[[self.key(item) for item in items]]
+        return rows.astype(self.compiled.dtype, copy=False)
+
+class PredictionGrid:
+    """
+    Cache de prédictions complètes sur une grille quantifiée coût/distance, par combinaison.
+
+    La résolution est réduite jusqu'à tenir dans le budget mémoire ; chaque combinaison est
+    remplie en un seul appel vectorisé la première fois qu'elle est demandée.
+    """
+
+    def __init__(self, table: CategoricalTable, resolution: int, budget_bytes: int):
+        self.table = table
+        n_axes = len(table.numeric)
+        fit = int((budget_bytes / table.size) ** (1.0 / n_axes)) if n_axes else 0
+        self.resolution = min(resolution, fit)
+        if self.resolution < 2:
+            raise ValueError(f"Budget insuffisant pour la grille ({budget_bytes} octets)")
+
+        bounds = numeric_bounds()
+        fields = [field for _, (field, _, _) in table.numeric]
+        aliases = {name: field.alias for name, field in LogistikData.model_fields.items()}
+        self.low = np.array([bounds[aliases[f]][0] for f in fields], dtype=np.float64)
+        self.width = (np.array([bounds[aliases[f]][1] for f in fields], dtype=np.float64) - self.low) / self.resolution
+
+        # Centres des cellules, déjà mis à l'échelle comme le ferait le pipeline
+        axes = [self.low[a] + (np.arange(self.resolution) + 0.5) * self.width[a] for a in range(n_axes)]
+        mesh = np.stack([m.ravel() for m in np.meshgrid(*axes, indexing="ij")], axis=1)
+        self.scaled_centers = (mesh - table.centers) / table.scales
+
+        self.grid = np.full((table.size,) + (self.resolution,) * n_axes, -1, dtype=np.int8)
+        table_bytes_gauge.labels(table="prediction_grid").set(self.grid.nbytes)
+
+    def _fill(self, key: int):
+        rows = np.empty((len(self.scaled_centers), self.table.compiled.n_features), dtype=np.float64)
+        rows[:, self.table.num_positions] = self.scaled_centers
+        rows[:, self.table.cat_positions] = self.table.table[key]
+        predictions = self.table.compiled._predict(rows.astype(self.table.compiled.dtype, copy=False))
+        self.grid[key] = np.asarray(predictions, dtype=np.int8).reshape(self.grid.shape[1:])
+
+    def cells(self, items) -> np.ndarray:
+        cells = ((self.table.numerics(items) - self.low) // self.width).astype(np.intp)
+        return np.clip(cells, 0, self.resolution - 1)
+
+    def predict_centers(self, items) -> np.ndarray:
+        """
+        Prédictions que la grille donnerait pour ces enregistrements, calculées au centre de leur cellule
+        sans remplir la grille.
+        """
+        rows = self.table.encode_many(items).astype(np.float64)
+        centers = self.low + (self.cells(items) + 0.5) * self.width
+        rows[:, self.table.num_positions] = (centers - self.table.centers) / self.table.scales
+        return np.asarray(self.table.compiled._predict(rows.astype(self.table.compiled.dtype, copy=False)))
+
+    def predict_many(self, items) -> list:
+        if not items:
+            return []
+        cells = self.cells(items)
+        results = []
+        for item, cell in zip(items, cells):
+            key = self.table.key(item)
+            if self.grid[(key,) + tuple(cell)] < 0:
+                self._fill(key)
+            results.append(int(self.grid[(key,) + tuple(cell)]))
+        return results
+
+class LookupPredictor:
+    """
+    Mode de service par tables : même interface que CompiledPipeline (predict_one / predict_many).
+    """
+
+    def __init__(self, compiled, grid_enabled=False, grid_resolution=64, grid_budget_mb=64.0):
+        self.compiled = compiled
+        self.table = CategoricalTable(compiled)
+        self.grid = None
+        if grid_enabled:
+            self.grid = PredictionGrid(self.table, grid_resolution, int(grid_budget_mb * 1024 * 1024))
+
+    def predict_many(self, items) -> list:
+        if not items:
+            return []
+        if self.grid is not None:
+            return self.grid.predict_many(items)
+        return [int(p) for p in self.compiled._predict(self.table.encode_many(items))]
+
+    def predict_one(self, item: LogistikData) -> int:
+        return self.predict_many([item])[0]
+
+    def check_accuracy(self, n_records: int = 2000) -> float:
+        """
+        Taux d'accord entre ce mode et l'inférence exacte du pipeline compilé.
+
+        La grille est évaluée au centre des cellules des enregistrements tirés, sans être remplie :
+        le remplissage reste paresseux, au fil des requêtes.
+        """
+        items = [LogistikData.model_validate(r) for r in sample_records(n_records, seed=1)]
+        exact = np.asarray(self.compiled.predict_many(items))
+        if self.grid is not None:
+            served = self.grid.predict_centers(items)
+        else:
+            served = np.asarray(self.predict_many(items))
+        accuracy = float(np.mean(exact == served))
+        grid_accuracy_gauge.set(accuracy)
+        return accuracy
+
+def build_lookup_predictor(compiled, grid_enabled=False, grid_resolution=64, grid_budget_mb=64.0, min_accuracy=0.99):
+    """
+    Construit le mode tables ; retourne le pipeline compilé si la grille n'atteint pas la précision requise.
+    """
+    try:
+        predictor = LookupPredictor(compiled, grid_enabled, grid_resolution, grid_budget_mb)
+    except ValueError as e:
+        logger.warning(f"⚠️ Grille de prédictions désactivée : {e}")
+        predictor = LookupPredictor(compiled)
+
+    accuracy = predictor.check_accuracy()
+    if predictor.grid is not None and accuracy < min_accuracy:
+        logger.warning(f"⚠️ Grille trop imprécise ({accuracy:.4f} < {min_accuracy}), tables catégorielles seules")
+        predictor.grid = None
+        predictor.check_accuracy()
+    elif predictor.grid is None and accuracy < 1.0:
+        logger.warning("⚠️ Table catégorielle incohérente avec le pipeline compilé, mode désactivé")
+        return compiled
+    logger.info(f"📇 Mode tables actif ({predictor.table.size} combinaisons, accord {accuracy:.4f})")
+    return predictor
@@ -1,11 +1,18 @@
 # app/model_loader.py
-import mlflow
-import bentoml
+# mlflow et bentoml sont importés à la demande : un démarrage depuis le cache local n'en a pas besoin
+import os
+import json
+import hashlib
 import logging
+import tempfile
 
 logger = logging.getLogger(__name__)
 
-def load_mlflow_model(path):
+def load_mlflow_model(path, tracking_uri=None):
+    import mlflow
+
+    if tracking_uri:
+        mlflow.set_tracking_uri(tracking_uri)
     logger.info(f"🔄 Chargement MLflow depuis: {path}")
     model = mlflow.pyfunc.load_model(path)
     if model is None:
@@ -13,8 +20,126 @@ def load_mlflow_model(path):
     return model
 
 def load_bentoml_model(tag):
+    import bentoml
+
     logger.info("🔄 Chargement via BentoML...")
     model = bentoml.sklearn.load_model(tag)
     if model is None:
         raise RuntimeError("⚠️ Échec BentoML.")
     return model
+
+def unwrap_model(model):
+    # Retourne l'objet scikit-learn sous-jacent (pyfunc MLflow ou modèle BentoML brut)
+    if hasattr(model, "get_raw_model"):
+        try:
+            return model.get_raw_model()
+        except NotImplementedError:
+            pass
+    impl = getattr(model, "_model_impl", None)
+    if impl is not None:
+        return getattr(impl, "sklearn_model", impl)
+    return model
+
+def resolve_model_version(model, default=None, fingerprint=None):
+    # Identifiant de la version chargée : run MLflow, tag BentoML, sinon valeur par défaut.
+    # Repli stable (libellé "version" des métriques) : empreinte de l'artefact local, ou "local"
+    metadata = getattr(model, "metadata", None)
+    for attribute in ("run_id", "model_uuid"):
+        value = getattr(metadata, attribute, None)
+        if value:
+            return str(value)
+    tag = getattr(model, "tag", None)
+    if tag is not None:
+        return str(tag)
+    if default:
+        return default
+    if fingerprint:
+        return f"local-{hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:12]}"
+    return "local"
+
+def load_local_model(path):
+    # Artefact scikit-learn local (fichier joblib ou répertoire contenant model.joblib)
+    import joblib
+
+    if os.path.isdir(path):
+        path = os.path.join(path, "model.joblib")
+    logger.info(f"🔄 Chargement local depuis: {path}")
+    return joblib.load(path)
+
+def load_model_from_uri(uri, tracking_uri=None):
+    # Retourne (modèle, model_type) selon la nature de la source
+    if any(os.path.isfile(os.path.join(uri, name)) for name in ("forest.json", "oblivious.json")):
+        from app.tree_engine import load_shared_model
+
+        return load_shared_model(uri), "Shared"
+    if os.path.isfile(uri) or os.path.isfile(os.path.join(uri, "model.joblib")):
+        return load_local_model(uri), "Local"
+    return load_mlflow_model(uri, tracking_uri), "MLflow"
+
+# ====== CACHE LOCAL DES ARTEFACTS ======
+class ModelArtifactCache:
+    """
+    Cache disque adressé par contenu des modèles résolus (MLflow ou BentoML).
+
+    Chaque artefact est stocké une seule fois sous <sha256>.joblib ; index.json associe la
+    source (URI ou tag) au condensat, au model_type, à la version et à l'empreinte de la source.
+    Un redémarrage relit le modèle avec joblib seul, sans importer mlflow ni bentoml.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+
+    def _read_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def lookup(self, source):
+        # Retourne l'entrée d'index (avec le chemin de l'artefact) ou None
+        if not source:
+            return None
+        entry = self._read_index().get(source)
+        if entry is None:
+            return None
+        path = os.path.join(self.cache_dir, f"{entry['digest']}.joblib")
+        if not os.path.exists(path):
+            return None
+        return dict(entry, path=path)
+
+    def load(self, source):
+        # Retourne (modèle, model_type, version, empreinte) ou None si la source n'est pas en cache
+        entry = self.lookup(source)
+        if entry is None:
+            return None
+        model = load_local_model(entry["path"])
+        logger.info(f"⚡ Modèle {source} chargé depuis le cache local ({entry['digest'][:12]})")
+        return model, entry["model_type"], entry["version"], entry.get("fingerprint")
+
+    def store(self, source, model, model_type, version, fingerprint=None) -> str:
+        import joblib
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(handle)
+        try:
+            joblib.dump(unwrap_model(model), tmp_path)
+            digest = hashlib.sha256()
+            with open(tmp_path, "rb") as artifact:
+                for block in iter(lambda: artifact.read(1 << 20), b""):
+                    digest.update(block)
+            digest = digest.hexdigest()
+            os.replace(tmp_path, os.path.join(self.cache_dir, f"{digest}.joblib"))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        index = self._read_index()
+        index[source] = {"digest": digest, "model_type": model_type, "version": version, "fingerprint": fingerprint}
+        handle, tmp_index = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+        with os.fdopen(handle, "w", encoding="utf-8") as output:
+            json.dump(index, output, indent=2)
+        os.replace(tmp_index, self.index_path)
+        logger.info(f"💾 Modèle {source} mis en cache ({digest[:12]})")
+        return digest
@@ -1,13 +1,56 @@
 import pandas as pd
 from fastapi import HTTPException
+from app.profiling import stage_timer
 
 logistik_mapping = {0: "On Time", 1: "Late"}
+SUPPORTED_MODEL_TYPES = ("MLflow", "BentoML", "Local", "Shared", "NumPy")
 
-def make_prediction(model, model_type: str, input_dict: dict) -> tuple:
-    df = pd.DataFrame([input_dict])
-    if model_type in ["MLflow", "BentoML"]:
-        prediction = model.predict(df)
+def format_message(predicted_class: int) -> str:
+    return f"Your delivery status prediction is: {logistik_mapping.get(predicted_class, 'Unknown')}. Stay informed and plan accordingly!"
+
+# ====== PREDICTION DECOUPEE EN ETAPES ======
+def timed_predict(model, df: pd.DataFrame, model_type: str, version):
+    # Pipeline scikit-learn : ColumnTransformer et estimateur mesurés séparément ; sinon un seul predict
+    steps = getattr(model, "steps", None)
+    if steps and len(steps) > 1:
+        with stage_timer("preprocessing", model_type, version):
+            rows = model[:-1].transform(df)
+        with stage_timer("estimator", model_type, version):
+            return model[-1].predict(rows)
+    with stage_timer("estimator", model_type, version):
+        return model.predict(df)
+
+def make_prediction(model, model_type: str, input_dict: dict, version="unknown") -> tuple:
+    with stage_timer("dataframe", model_type, version):
+        df = pd.DataFrame([input_dict])
+    if model_type in SUPPORTED_MODEL_TYPES:
+        prediction = timed_predict(model, df, model_type, version)
         predicted_class = int(prediction[0])
-        message = f"Your delivery status prediction is: {logistik_mapping.get(predicted_class, 'Unknown')}. Stay informed and plan accordingly!"
+        message = format_message(predicted_class)
         return predicted_class, message
     raise HTTPException(status_code=500, detail="Modèle non initialisé correctement")
+
+# ====== PREDICTION PAR LOTS ======
+def make_batch_prediction(model, model_type: str, records: list, chunk_size: int = 1000, version="unknown") -> list:
+    """
+    Prédit un lot d'enregistrements avec un seul DataFrame colonnaire.
+
+    :param records: Liste de dictionnaires (alias de LogistikData) déjà validés.
+    :param chunk_size: Nombre de lignes envoyées à model.predict par appel.
+    :param version: Version du modèle, libellé des histogrammes d'étapes.
+    :return: Liste de tuples (classe prédite, message) dans l'ordre d'entrée.
+    """
+    if model_type not in SUPPORTED_MODEL_TYPES:
+        raise HTTPException(status_code=500, detail="Modèle non initialisé correctement")
+    if not records:
+        return []
+    if chunk_size < 1:
+        raise ValueError("chunk_size doit être strictement positif")
+
+    with stage_timer("dataframe", model_type, version):
+        df = pd.DataFrame.from_records(records)
+    results = []
+    for start in range(0, len(df), chunk_size):
+        prediction = timed_predict(model, df.iloc[start:start + chunk_size], model_type, version)
+        results.extend((int(p), format_message(int(p))) for p in prediction)
+    return results
@@ -0,0 +1,111 @@
+# app/profiling.py
+import os
+import sys
+import time
+import asyncio
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from prometheus_client import Histogram
+
+# ====== LATENCE PAR ETAPE ======
+stage_histogram = Histogram(
+    "predict_stage_seconds",
+    "Durée de chaque étape de la prédiction (une observation par appel)",
+    ["stage", "model_type", "version"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+def observe_stage(stage: str, model_type: str, version, seconds: float):
+    stage_histogram.labels(stage, model_type, str(version)).observe(seconds)
+
+@contextmanager
+def stage_timer(stage: str, model_type: str, version):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, model_type, version, time.perf_counter() - started)
+
+# ====== PROFILAGE PAR ECHANTILLONNAGE ======
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+class SamplingProfiler:
+    """
+    Relève les piles de tous les threads (boucle d'événements et pool to_thread) toutes les interval secondes.
+
+    Sortie au format replié ("thread;appelant;...;appelé N"), lu par flamegraph.pl et speedscope.
+    Aucun traceur n'est installé : le coût est celui d'un relevé par intervalle, pas par appel.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfileWindow:
+    """
+    Fenêtre de profilage : se ferme après max_requests prédictions servies ou au bout de seconds.
+
+    :param max_requests: Nombre de requêtes /v1/predict et /v1/predict/batch ; None pour la durée seule.
+    """
+
+    def __init__(self, profiler: SamplingProfiler, max_requests=None, seconds: float = 10.0):
+        self.profiler = profiler
+        self.max_requests = max_requests
+        self.seconds = seconds
+        self.requests = 0
+        self._done = asyncio.Event()
+
+    def request_done(self):
+        # Appelé depuis la boucle d'événements, à la fin de chaque prédiction
+        self.requests += 1
+        if self.max_requests is not None and self.requests >= self.max_requests:
+            self._done.set()
+
+    async def run(self) -> str:
+        started = time.perf_counter()
+        self.profiler.start()
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=self.seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await asyncio.to_thread(self.profiler.stop)
+        self.elapsed = time.perf_counter() - started
+        return self.profiler.folded()
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+import time
+import random
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, model_validator
 from enum import Enum
 
 # ===== DEFINITION DES COLONNES CATEGORIELLES ======
@@ -79,12 +81,75 @@ class LogistikData(BaseModel):
     transportation_method: TransportationMethod = Field(..., alias="Transportation_Method")
     day_of_week: DayWeek = Field(..., alias="Day_of_Week")
     weather_condition: Weather = Field(..., alias="Weather_Condition")
+    # Durée de la validation, lue par main.py (histogramme d'étape "validation") ; exclue des dumps
+    _validation_seconds: float = PrivateAttr(default=0.0)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _time_validation(cls, data, handler):
+        started = time.perf_counter()
+        item = handler(data)
+        item._validation_seconds = time.perf_counter() - started
+        return item
 
     class Config:
         validate_by_name = True
         from_attributes = True
 
 
+# ===== VOCABULAIRE DES COLONNES CATEGORIELLES ======
+def categorical_fields() -> dict:
+    """
+    Retourne {alias: classe Enum} pour chaque champ catégoriel de LogistikData, dans l'ordre du schéma.
+    """
+    return {
+        field.alias: field.annotation
+        for field in LogistikData.model_fields.values()
+        if isinstance(field.annotation, type) and issubclass(field.annotation, Enum)
+    }
+
+def numeric_bounds() -> dict:
+    """
+    Retourne {alias: (borne basse incluse, borne haute exclue)} pour les champs numériques.
+    """
+    bounds = {}
+    for field in LogistikData.model_fields.values():
+        if field.annotation is float:
+            low = next(m.ge for m in field.metadata if getattr(m, "ge", None) is not None)
+            high = next(m.lt for m in field.metadata if getattr(m, "lt", None) is not None)
+            bounds[field.alias] = (low, high)
+    return bounds
+
+def sample_records(n: int, seed: int = 42) -> list:
+    """
+    Génère n enregistrements valides (alias de LogistikData) tirés uniformément dans le schéma.
+    """
+    rng = random.Random(seed)
+    enums = categorical_fields()
+    bounds = numeric_bounds()
+    records = []
+    for _ in range(n):
+        record = {alias: round(rng.uniform(low, high - 1), 2) for alias, (low, high) in bounds.items()}
+        record.update({alias: rng.choice(list(enum)).value for alias, enum in enums.items()})
+        records.append(record)
+    return records
+
+# ===== VALIDATION D'UN LOT ======
+def validate_records(raw_records: list) -> tuple:
+    """
+    Valide chaque enregistrement séparément pour qu'une ligne invalide ne fasse pas échouer tout le lot.
+
+    :return: (liste de (index, LogistikData), liste de {"Index", "Detail"})
+    """
+    valid, errors = [], []
+    for index, raw in enumerate(raw_records):
+        try:
+            valid.append((index, LogistikData.model_validate(raw)))
+        except ValidationError as e:
+            errors.append({"Index": index, "Detail": e.errors(include_url=False, include_context=False)})
+    return valid, errors
+
+
 # {
 #   "Transportation_Cost": 1500,
 #   "Distance_Km": 2100,
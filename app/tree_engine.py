@@ -0,0 +1,451 @@
+# app/tree_engine.py
+import os
+import json
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.pipeline import Pipeline
+
+logger = logging.getLogger(__name__)
+
+FOREST_ARRAYS = ("feature", "threshold", "children", "value", "roots")
+
+class ForestArrays(ClassifierMixin, BaseEstimator):
+    """
+    Forêt aplatie en tableaux contigus de nœuds, évaluée avec NumPy.
+
+    Tous les arbres sont concaténés : un nœud est un indice global, les feuilles pointent
+    sur elles-mêmes. Un lot descend tous les arbres à la fois, niveau par niveau, par
+    indexation avancée ; les tableaux peuvent être mappés en mémoire (np.load mmap_mode="r")
+    et partagés entre workers.
+
+    children est entrelacé (2 * nœud + aller_à_gauche) : un seul accès par niveau. Les seuils
+    sont les plus grands float32 <= seuil scikit-learn, ce qui laisse le test x <= seuil
+    inchangé pour une entrée float32.
+    """
+
+    def __init__(self, feature=None, threshold=None, children=None, value=None, roots=None,
+                 classes=None, max_depth=0, n_features=0):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.classes_ = np.asarray(classes) if classes is not None else None
+        self.n_features_in_ = n_features
+
+    def fit(self, X=None, y=None):
+        raise TypeError("ForestArrays s'obtient par export d'un modèle entraîné (from_sklearn)")
+
+    # ====== EXPORT D'UNE FORET SCIKIT-LEARN ======
+    @classmethod
+    def from_sklearn(cls, forest):
+        estimators = getattr(forest, "estimators_", None)
+        if estimators is None and hasattr(forest, "tree_"):
+            estimators = [forest]
+        if not estimators or not hasattr(forest, "classes_"):
+            raise ValueError(f"{type(forest).__name__} n'est pas une forêt de classification scikit-learn")
+        n_classes = len(forest.classes_)
+
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+            children.append(np.stack([right, left], axis=1).ravel())
+            # tree_.value contient déjà les fractions par classe (predict_proba d'un arbre)
+            values.append(tree.value[:, 0, :n_classes])
+            roots.append(offset)
+            offset += tree.node_count
+
+        threshold = np.concatenate(thresholds)
+        rounded = threshold.astype(np.float32)
+        above = rounded.astype(np.float64) > threshold
+        rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+        return cls(
+            feature=np.concatenate(features),
+            threshold=rounded,
+            children=np.concatenate(children).astype(np.int64),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=forest.classes_.tolist(),
+            max_depth=max(e.tree_.max_depth for e in estimators),
+            n_features=int(forest.n_features_in_),
+        )
+
+    # ====== PERSISTANCE (TABLEAUX .npy MAPPABLES) ======
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in FOREST_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        meta = {"classes": list(self.classes), "max_depth": int(self.max_depth), "n_features": int(self.n_features)}
+        with open(os.path.join(directory, "forest.json"), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        with open(os.path.join(directory, "forest.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in FOREST_ARRAYS}
+        return cls(**arrays, classes=meta["classes"], max_depth=meta["max_depth"], n_features=meta["n_features"])
+
+    # ====== EVALUATION VECTORISEE ======
+    def leaves(self, X) -> np.ndarray:
+        # Comme scikit-learn : entrées en float32, x <= seuil -> gauche
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat = X.ravel()
+        rows = (np.arange(X.shape[0], dtype=np.int64) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(np.asarray(self.roots, dtype=np.int64), (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = flat[rows + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        # Somme arbre par arbre (réduction sur l'axe externe) puis moyenne, dans l'ordre de scikit-learn
+        per_tree = self.value[self.leaves(X).T]
+        return per_tree.sum(axis=0) / len(self.roots)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+# ====== CATBOOST : ARBRES SYMETRIQUES ======
+SPLIT_FLOAT, SPLIT_TABLE, SPLIT_NONE = 0, 1, 2
+OBLIVIOUS_ARRAYS = ("kind", "feature", "border", "row", "leaf_values")
+
+class ObliviousForest(ClassifierMixin, BaseEstimator):
+    """
+    Arbres symétriques CatBoost (classification binaire) aplatis en tableaux (arbres, profondeur).
+
+    Un arbre symétrique applique le même test à tout un niveau : l'indice de feuille est l'entier
+    formé par les bits des tests. Les tests sur flottants comparent x > seuil en float32 ; les
+    tests CTR/one-hot ne dépendent que des modalités concernées et sont tabulés une fois sur le
+    vocabulaire des Enum (table de vérité indexée en base mixte), sans recalculer les hash CatBoost.
+    """
+
+    def __init__(self, kind=None, feature=None, border=None, row=None, leaf_values=None, tables=None,
+                 groups=None, float_names=None, cat_names=None, vocabularies=None, scale=1.0, bias=0.0,
+                 classes=None):
+        self.kind = kind
+        self.feature = feature
+        self.border = border
+        self.row = row
+        self.leaf_values = leaf_values
+        self.tables = tables
+        self.groups = groups
+        self.float_names = float_names
+        self.cat_names = cat_names
+        self.vocabularies = vocabularies
+        self.scale = scale
+        self.bias = bias
+        self.classes = classes
+        self.classes_ = np.asarray(classes) if classes is not None else None
+        self.n_features_in_ = len(float_names or []) + len(cat_names or [])
+        self._plan = None
+        self._indexes = None
+
+    def fit(self, X=None, y=None):
+        raise TypeError("ObliviousForest s'obtient par export d'un modèle entraîné (from_catboost)")
+
+    # ====== EXPORT D'UN MODELE CATBOOST ======
+    @classmethod
+    def from_catboost(cls, model, vocabularies=None):
+        """
+        :param vocabularies: {colonne catégorielle: [modalités]} ; par défaut les Enum de LogistikData.
+        """
+        import tempfile
+        from catboost import Pool
+
+        if vocabularies is None:
+            from app.schema import categorical_fields
+
+            vocabularies = {name: [member.value for member in enum] for name, enum in categorical_fields().items()}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.json")
+            model.save_model(path, format="json")
+            with open(path, encoding="utf-8") as handle:
+                exported = json.load(handle)
+
+        info = exported["features_info"]
+        names = list(model.feature_names_)
+        float_names = [names[f["flat_feature_index"]] for f in info.get("float_features", [])]
+        cat_names = [names[f["flat_feature_index"]] for f in info.get("categorical_features", [])]
+        missing = [name for name in cat_names if name not in vocabularies]
+        if missing:
+            raise ValueError(f"Vocabulaire inconnu pour les colonnes catégorielles {missing}")
+
+        # Ordre des split_index CatBoost : seuils flottants, puis one-hot, puis seuils des CTR
+        offset = sum(len(f.get("borders") or []) for f in info.get("float_features", []))
+        offset += sum(len(f.get("values") or []) for f in info.get("one_hot_features", []))
+        ctr_splits = []
+        for ctr in info.get("ctrs", []):
+            elements = tuple(sorted(cls._ctr_element(e) for e in ctr["elements"]))
+            ctr_splits.extend((elements, border) for border in ctr["borders"])
+
+        # Un arbre sans test (une seule feuille) est exporté avec "splits": null
+        trees = exported["oblivious_trees"]
+        for tree in trees:
+            tree["splits"] = tree["splits"] or []
+        depth = max(len(tree["splits"]) for tree in trees)
+        kind = np.full((len(trees), depth), SPLIT_NONE, dtype=np.int8)
+        feature = np.zeros((len(trees), depth), dtype=np.int32)
+        border = np.zeros((len(trees), depth), dtype=np.float32)
+        row = np.zeros((len(trees), depth), dtype=np.int32)
+        leaf_values = np.zeros((len(trees), 2 ** depth), dtype=np.float64)
+        groups, pending = [], {}
+        for t, tree in enumerate(trees):
+            if len(tree["leaf_values"]) != 2 ** len(tree["splits"]):
+                raise ValueError("Seule la classification binaire CatBoost est prise en charge")
+            leaf_values[t, :len(tree["leaf_values"])] = tree["leaf_values"]
+            for k, split in enumerate(tree["splits"]):
+                if split["split_type"] == "FloatFeature":
+                    kind[t, k], feature[t, k], border[t, k] = SPLIT_FLOAT, split["float_feature_index"], split["border"]
+                    continue
+                if split["split_type"] == "OneHotFeature":
+                    elements = (("cat", split["cat_feature_index"]),)
+                elif split["split_type"] == "OnlineCtr":
+                    elements, ctr_border = ctr_splits[split["split_index"] - offset]
+                    if ctr_border != split["border"]:
+                        raise ValueError("Correspondance des CTR incohérente dans l'export JSON")
+                else:
+                    raise ValueError(f"Type de test CatBoost non pris en charge : {split['split_type']}")
+                if elements not in groups:
+                    groups.append(elements)
+                kind[t, k], feature[t, k] = SPLIT_TABLE, groups.index(elements)
+                pending.setdefault(feature[t, k], []).append((t, k))
+
+        # Tables de vérité : chaque combinaison de modalités du groupe passe une fois dans CatBoost
+        cat_indices = model.get_cat_feature_indices()
+        tables = []
+        for g, elements in enumerate(groups):
+            sizes = [cls._element_size(element, cat_names, vocabularies) for element in elements]
+            codes = np.unravel_index(np.arange(int(np.prod(sizes))), sizes)
+            probe = {name: np.zeros(len(codes[0])) for name in float_names}
+            probe.update({name: vocabularies[name][0] for name in cat_names})
+            floats_at = {}
+            for element, code in zip(elements, codes):
+                if element[0] == "cat":
+                    probe[cat_names[element[1]]] = np.asarray(vocabularies[cat_names[element[1]]], dtype=object)[code]
+                else:
+                    floats_at.setdefault(element[1], []).append((np.float32(element[2]), code))
+            for f, thresholds in floats_at.items():
+                # Plus petit seuil si aucun bit n'est levé, sinon le float32 juste au-dessus du plus
+                # grand seuil levé (les combinaisons de bits incohérentes ne sont jamais consultées)
+                value = np.full(len(codes[0]), min(threshold for threshold, _ in thresholds), dtype=np.float32)
+                for threshold, code in thresholds:
+                    above = np.nextafter(threshold, np.float32(np.inf))
+                    value = np.where(code == 1, np.maximum(value, above), value)
+                probe[float_names[f]] = value.astype(np.float64)
+            leaves = model.calc_leaf_indexes(Pool(pd.DataFrame(probe)[names], cat_features=cat_indices))
+            table = np.zeros((len(pending[g]), len(codes[0])), dtype=np.uint8)
+            for r, (t, k) in enumerate(pending[g]):
+                table[r] = (leaves[:, t] >> k) & 1
+                row[t, k] = r
+            tables.append(table)
+
+        scale, bias = exported["scale_and_bias"]
+        return cls(
+            kind=kind, feature=feature, border=border, row=row, leaf_values=leaf_values, tables=tables,
+            groups=[[list(element) for element in elements] for elements in groups], float_names=float_names, cat_names=cat_names,
+            vocabularies={name: list(vocabularies[name]) for name in cat_names},
+            scale=float(scale), bias=float(np.sum(bias)), classes=np.asarray(model.classes_).tolist(),
+        )
+
+    @staticmethod
+    def _ctr_element(element):
+        # Élément d'une combinaison CTR : modalité ("cat", i) ou seuil flottant ("float", i, seuil)
+        if element["combination_element"] == "cat_feature_value":
+            return ("cat", element["cat_feature_index"])
+        if element["combination_element"] == "float_feature":
+            return ("float", element["float_feature_index"], element["border"])
+        raise ValueError(f"Élément de CTR non pris en charge : {element['combination_element']}")
+
+    @staticmethod
+    def _element_size(element, cat_names, vocabularies):
+        return len(vocabularies[cat_names[element[1]]]) if element[0] == "cat" else 2
+
+    # ====== PERSISTANCE (TABLEAUX .npy MAPPABLES) ======
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in OBLIVIOUS_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        for g, table in enumerate(self.tables):
+            np.save(os.path.join(directory, f"table_{g}.npy"), table)
+        meta = {
+            "groups": self.groups, "float_names": self.float_names, "cat_names": self.cat_names,
+            "vocabularies": self.vocabularies, "scale": self.scale, "bias": self.bias, "classes": self.classes,
+        }
+        with open(os.path.join(directory, "oblivious.json"), "w", encoding="utf-8") as handle:
+            json.dump(meta, handle)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        with open(os.path.join(directory, "oblivious.json"), encoding="utf-8") as handle:
+            meta = json.load(handle)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in OBLIVIOUS_ARRAYS}
+        tables = [np.load(os.path.join(directory, f"table_{g}.npy"), mmap_mode=mmap_mode) for g in range(len(meta["groups"]))]
+        return cls(**arrays, tables=tables, **meta)
+
+    # ====== EVALUATION VECTORISEE ======
+    def _columns(self, X):
+        # Colonnes flottantes en float32 (comme CatBoost), modalités en indices du vocabulaire
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(X)
+        if self._indexes is None:
+            self._indexes = [{value: i for i, value in enumerate(self.vocabularies[name])} for name in self.cat_names]
+        floats = X[self.float_names].to_numpy(dtype=np.float32)
+        values = X[self.cat_names].to_numpy(dtype=object)
+        codes = np.empty(values.shape, dtype=np.int64)
+        for c, (name, index) in enumerate(zip(self.cat_names, self._indexes)):
+            try:
+                codes[:, c] = [index[getattr(value, "value", value)] for value in values[:, c]]
+            except KeyError as e:
+                raise ValueError(f"Modalité inconnue pour {name} : {e}")
+        return floats, codes
+
+    def _build_plan(self):
+        """
+        Prépare une évaluation sans boucle Python : une matrice de « parts » (colonne nulle, indices des
+        modalités, bits des seuils flottants des CTR), la clé de chaque groupe comme produit scalaire
+        avec ses pas en base mixte, et toutes les tables de vérité concaténées en un seul tableau.
+        """
+        float_at = np.nonzero(self.kind == SPLIT_FLOAT)
+        float_elements = sorted({(e[1], e[2]) for elements in self.groups for e in elements if e[0] == "float"})
+        column = {("float", f, b): 1 + len(self.cat_names) + j for j, (f, b) in enumerate(float_elements)}
+        column.update({("cat", c): 1 + c for c in range(len(self.cat_names))})
+
+        arity = max((len(elements) for elements in self.groups), default=1)
+        part_index = np.zeros((len(self.groups), arity), dtype=np.int64)
+        part_stride = np.zeros((len(self.groups), arity), dtype=np.int64)
+        offsets, flat, position = [], [], 0
+        for g, elements in enumerate(self.groups):
+            sizes = [self._element_size(element, self.cat_names, self.vocabularies) for element in elements]
+            for i, element in enumerate(elements):
+                part_index[g, i] = column[tuple(element)]
+                part_stride[g, i] = int(np.prod(sizes[i + 1:]))
+            offsets.append(position)
+            flat.append(np.asarray(self.tables[g]).ravel())
+            position += flat[-1].size
+
+        t, k = np.nonzero(self.kind == SPLIT_TABLE)
+        split_group = self.feature[t, k]
+        table_width = np.asarray([np.asarray(table).shape[1] for table in self.tables] or [0], dtype=np.int64)
+        split_base = np.asarray(offsets or [0], dtype=np.int64)[split_group] + self.row[t, k] * table_width[split_group]
+        return {
+            "float_at": float_at,
+            "float_feature": self.feature[float_at],
+            "float_border": self.border[float_at],
+            "element_feature": np.asarray([f for f, _ in float_elements], dtype=np.int64),
+            "element_border": np.asarray([b for _, b in float_elements], dtype=np.float32),
+            "part_index": part_index,
+            "part_stride": part_stride,
+            "table_at": (t, k),
+            "split_group": split_group,
+            "split_base": split_base,
+            "flat": np.concatenate(flat) if flat else np.zeros(0, dtype=np.uint8),
+        }
+
+    def leaves(self, X) -> np.ndarray:
+        if self._plan is None:
+            self._plan = self._build_plan()
+        plan = self._plan
+        floats, codes = self._columns(X)
+        bits = np.zeros((len(floats),) + self.kind.shape, dtype=bool)
+        bits[:, plan["float_at"][0], plan["float_at"][1]] = floats[:, plan["float_feature"]] > plan["float_border"]
+        if len(plan["split_base"]):
+            parts = np.concatenate([
+                np.zeros((len(floats), 1), dtype=np.int64),
+                codes,
+                floats[:, plan["element_feature"]] > plan["element_border"],
+            ], axis=1)
+            keys = (parts[:, plan["part_index"]] * plan["part_stride"]).sum(axis=2)
+            t, k = plan["table_at"]
+            bits[:, t, k] = plan["flat"][plan["split_base"] + keys[:, plan["split_group"]]]
+        # Indice de feuille : le test du niveau k donne le bit k
+        leaves = np.zeros(bits.shape[:2], dtype=np.int64)
+        for k in range(bits.shape[2]):
+            leaves |= bits[:, :, k].astype(np.int64) << k
+        return leaves
+
+    def decision_function(self, X) -> np.ndarray:
+        values = self.leaf_values[np.arange(len(self.leaf_values)), self.leaves(X)]
+        # Somme séquentielle arbre par arbre (cumsum), dans l'ordre de CatBoost
+        return self.scale * values.cumsum(axis=1)[:, -1] + self.bias
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = 1 / (1 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take((self.decision_function(X) > 0).astype(int), axis=0)
+
+# ====== CONVERSION DU MODELE SERVI ======
+def compile_numpy_model(model):
+    """
+    Retourne l'équivalent NumPy du modèle chargé (pipeline forêt scikit-learn ou CatBoost), sinon None.
+    """
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+    from app.model_loader import unwrap_model
+
+    raw = unwrap_model(model)
+    if type(raw).__name__ == "CatBoostClassifier":
+        return ObliviousForest.from_catboost(raw)
+    if isinstance(raw, Pipeline):
+        classifier = raw.steps[-1][1]
+        if isinstance(classifier, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+            return Pipeline(raw.steps[:-1] + [(raw.steps[-1][0], ForestArrays.from_sklearn(classifier))])
+    return None
+
+# ====== MODELE PARTAGE ENTRE WORKERS ======
+def export_shared_model(pipeline, directory):
+    """
+    Exporte un pipeline (preprocessing -> forêt) : le ColumnTransformer en joblib, les nœuds en .npy.
+    Un CatBoostClassifier est exporté en arbres symétriques (ObliviousForest).
+    """
+    import joblib
+
+    if type(pipeline).__name__ == "CatBoostClassifier":
+        ObliviousForest.from_catboost(pipeline).save(directory)
+        logger.info(f"📤 Modèle CatBoost partagé exporté dans {directory}")
+        return
+    preprocessor, forest = pipeline.steps[0][1], pipeline.steps[-1][1]
+    ForestArrays.from_sklearn(forest).save(directory)
+    joblib.dump(preprocessor, os.path.join(directory, "preprocessing.joblib"))
+    logger.info(f"📤 Modèle partagé exporté dans {directory}")
+
+def load_shared_model(directory, mmap_mode="r"):
+    """
+    Recharge le pipeline exporté ; les tableaux de nœuds restent mappés (pages partagées en lecture seule).
+    """
+    import joblib
+
+    if os.path.exists(os.path.join(directory, "oblivious.json")):
+        return ObliviousForest.load(directory, mmap_mode=mmap_mode)
+    preprocessor = joblib.load(os.path.join(directory, "preprocessing.joblib"))
+    forest = ForestArrays.load(directory, mmap_mode=mmap_mode)
+    logger.info(f"🗺️ Modèle partagé mappé depuis {directory} ({len(forest.roots)} arbres)")
+    return Pipeline([('preprocessing', preprocessor), ('classifier', forest)])
+
+if __name__ == "__main__":
+    from app.config import Settings
+    from app.model_loader import load_model_from_uri, unwrap_model
+
+    parser = argparse.ArgumentParser(description="Export du modèle en tableaux mappables pour les workers uvicorn")
+    parser.add_argument("--source", default=Settings().mlflow, help="URI MLflow ou artefact joblib local")
+    parser.add_argument("--out", default=Settings().shared_model_dir or "shared_model")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    loaded, _ = load_model_from_uri(args.source, Settings().mlflow_tracking_uri)
+    export_shared_model(unwrap_model(loaded), args.out)
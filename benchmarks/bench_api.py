@@ -0,0 +1,234 @@
+# Benchmark : test de charge de l'API (/v1/predict et /v1/predict/batch), en processus ou en HTTP
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.common import build_standin_model, write_results
+from benchmarks.corpus import build_corpus
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCENARIOS = ("predict", "batch")
+
+# ====== MODELE DE SUBSTITUTION ======
+def export_standin(directory, artifact="joblib", n_estimators=300) -> str:
+    # Servi via SHARED_MODEL_DIR : ni MLflow ni BentoML au démarrage de l'API
+    model = build_standin_model(n_estimators=n_estimators, max_depth=10)
+    if artifact == "shared":
+        from app.tree_engine import export_shared_model
+
+        target = os.path.join(directory, "shared")
+        export_shared_model(model, target)
+        return target
+    import joblib
+
+    target = os.path.join(directory, "model.joblib")
+    joblib.dump(model, target)
+    return target
+
+def serving_environment(model_dir, cache=True) -> dict:
+    # Variables de l'API pendant la mesure : sans MySQL, sans dérive en ligne, sans rechargement
+    return {
+        "API_TITLE": os.getenv("API_TITLE") or "RouteWise-Server",
+        "API_VERSION": os.getenv("API_VERSION") or "bench",
+        "SHARED_MODEL_DIR": model_dir,
+        "PERSIST_PREDICTIONS": "false",
+        "LIVE_DRIFT_ENABLED": "false",
+        "MODEL_WATCH_ENABLED": "false",
+        "PREDICTION_CACHE_ENABLED": "true" if cache else "false",
+    }
+
+# ====== GENERATION DE CHARGE ======
+def summarize(latencies, statuses, wall, rows_per_request) -> dict:
+    latencies = np.asarray(latencies) * 1000
+    ok = sum(1 for status in statuses if status == 200)
+    codes = {}
+    for status in statuses:
+        codes[str(status)] = codes.get(str(status), 0) + 1
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        "requests": len(statuses),
+        "errors": len(statuses) - ok,
+        "status_codes": codes,
+        "wall_s": wall,
+        "throughput_rps": len(statuses) / wall if wall else 0.0,
+        "rows_per_second": ok * rows_per_request / wall if wall else 0.0,
+        "mean_ms": float(latencies.mean()) if len(latencies) else 0.0,
+        "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+    }
+
+async def drive(client, scenario, records, concurrency, n_requests, batch_size=64, warmup=20) -> dict:
+    """
+    n_requests requêtes envoyées par concurrency clients simultanés, payloads pris à la suite dans le corpus.
+
+    :param scenario: "predict" (un enregistrement par requête) ou "batch" (batch_size enregistrements).
+    """
+    if scenario == "predict":
+        path, rows = "/v1/predict", 1
+        payloads = records
+    else:
+        path, rows = "/v1/predict/batch", batch_size
+        payloads = [records[i:i + batch_size] for i in range(0, len(records) - batch_size + 1, batch_size)] or [records]
+    for i in range(warmup):
+        await client.post(path, json=payloads[i % len(payloads)])
+
+    latencies, statuses, cursor = [], [], iter(range(n_requests))
+
+    async def worker():
+        for i in cursor:
+            started = time.perf_counter()
+            try:
+                status = (await client.post(path, json=payloads[i % len(payloads)])).status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses.append(status)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall
+    return dict(scenario=scenario, concurrency=concurrency, batch_size=rows, **summarize(latencies, statuses, wall, rows))
+
+async def run_scenarios(client, records, args) -> list:
+    runs = []
+    for scenario in args.scenarios:
+        for concurrency in args.concurrency:
+            run = await drive(client, scenario, records, concurrency, args.requests, args.batch_size)
+            print(f"⏱️ {scenario} x{concurrency} : {run['throughput_rps']:.0f} req/s, p50 {run['p50_ms']:.1f} ms, p99 {run['p99_ms']:.1f} ms")
+            runs.append(run)
+    return runs
+
+# ====== MODES : EN PROCESSUS OU HTTP ======
+async def run_inprocess(model_dir, records, args) -> list:
+    # L'application tourne dans ce processus (transport ASGI) : démarrage et arrêt réels, sans réseau
+    import httpx
+
+    os.environ.update(serving_environment(model_dir, args.cache))
+    import main
+
+    # main déjà importé : les variables ci-dessus n'ont pas été lues, réglages appliqués directement
+    main.settings.shared_model_dir = model_dir
+    main.settings.persist_predictions = main.settings.live_drift_enabled = main.settings.model_watch_enabled = False
+    if not args.cache:
+        main.prediction_cache = None
+    await main.startup_event()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            return await run_scenarios(client, records, args)
+    finally:
+        await main.shutdown_event()
+
+async def run_http(url, records, args) -> list:
+    import httpx
+
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        return await run_scenarios(client, records, args)
+
+def spawn_server(model_dir, port, workers, cache=True, ready_timeout=60.0):
+    # Serveur uvicorn local sur le modèle de substitution ; prêt quand /metrics répond
+    import httpx
+
+    env = dict(os.environ, PYTHONPATH=ROOT, **serving_environment(model_dir, cache))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.perf_counter() + ready_timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1.0).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            break
+        time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("❌ Le serveur uvicorn n'a pas démarré")
+
+# ====== COMPARAISON AVEC UNE MESURE PRECEDENTE ======
+def compare_with(baseline_path, runs) -> list:
+    # Écart relatif de débit et de p99 par (scénario, concurrence), pour suivre les régressions entre commits
+    with open(baseline_path, encoding="utf-8") as handle:
+        previous = {(r["scenario"], r["concurrency"]): r for r in json.load(handle)["runs"]}
+    deltas = []
+    for run in runs:
+        before = previous.get((run["scenario"], run["concurrency"]))
+        if before is None:
+            continue
+        deltas.append({
+            "scenario": run["scenario"], "concurrency": run["concurrency"],
+            "throughput_change": run["throughput_rps"] / before["throughput_rps"] - 1 if before["throughput_rps"] else None,
+            "p99_change": run["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else None,
+        })
+    return deltas
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge de l'API RouteWise")
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--url", default=None, help="API déjà lancée (mode http) ; sinon un uvicorn local est démarré")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Workers uvicorn du serveur démarré")
+    parser.add_argument("--corpus", default=None, help="Payloads NDJSON (python -m benchmarks.corpus)")
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=1000, help="Requêtes par scénario et niveau de concurrence")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--artifact", choices=["joblib", "shared"], default="joblib")
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--cache", action="store_true", help="Garde le cache des prédictions (corpus rejoué : mesure les hits)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--baseline", default=None, help="Résultats JSON d'un commit précédent à comparer")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.corpus, args.corpus_size, args.seed)
+    records = corpus["records"]
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        if args.mode == "http" and args.url:
+            url = args.url
+            runs = asyncio.run(run_http(url, records, args))
+        else:
+            model_dir = export_standin(directory, args.artifact, args.n_estimators)
+            if args.mode == "inprocess":
+                runs = asyncio.run(run_inprocess(model_dir, records, args))
+            else:
+                server = spawn_server(model_dir, args.port, args.workers, args.cache)
+                try:
+                    runs = asyncio.run(run_http(f"http://127.0.0.1:{args.port}", records, args))
+                finally:
+                    server.terminate()
+                    server.wait()
+
+    results = {
+        "benchmark": "api",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "target": args.url or ("in-process" if args.mode == "inprocess" else f"uvicorn x{args.workers} (local)"),
+        "model": None if args.url else {"artifact": args.artifact, "n_estimators": args.n_estimators},
+        "prediction_cache": args.cache,
+        "corpus": {key: value for key, value in corpus.items() if key != "records"} | {"size": len(records), "seed": args.seed},
+        "runs": runs,
+    }
+    if args.baseline:
+        results["baseline"] = {"path": args.baseline, "deltas": compare_with(args.baseline, runs)}
+    write_results(results, args.output)
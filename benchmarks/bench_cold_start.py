@@ -0,0 +1,72 @@
+# Benchmark : temps entre exec et la première prédiction réussie, modèle servi depuis le cache local
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.model_loader import ModelArtifactCache
+from app.schema import sample_records
+from benchmarks.common import build_standin_model, write_results
+
+SOURCE = "models:/routewise_standin/Production"
+
+CHILD = """
+import sys, json, time
+started = time.time()
+from fastapi.testclient import TestClient
+import main
+imported = time.time()
+with TestClient(main.app) as client:
+    ready = time.time()
+    response = client.post("/v1/predict", json=json.loads(sys.argv[1]))
+    answered = time.time()
+print(json.dumps({
+    "status": response.status_code,
+    "import_s": imported - started,
+    "startup_s": ready - imported,
+    "first_prediction_s": answered - ready,
+    "mlflow_imported": "mlflow" in sys.modules,
+    "bentoml_imported": "bentoml" in sys.modules,
+}))
+"""
+
+def run_once(env, payload):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, json.dumps(payload)],
+        env=env, capture_output=True, text=True, check=True,
+        cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+    )
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    result["exec_to_first_prediction_s"] = time.perf_counter() - started
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Démarrage à froid de l'API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        model = build_standin_model()
+        ModelArtifactCache(cache_dir).store(SOURCE, model, "MLflow", "standin-1")
+        env = dict(
+            os.environ,
+            API_TITLE="RouteWise-Server", API_VERSION="bench",
+            MLFLOW_MODEL=SOURCE, MODEL_CACHE_DIR=cache_dir,
+            PERSIST_PREDICTIONS="false", MODEL_WATCH_ENABLED="false",
+        )
+        runs = [run_once(env, sample_records(1)[0]) for _ in range(args.runs)]
+
+    summary = {
+        key: statistics.median(run[key] for run in runs)
+        for key in ("import_s", "startup_s", "first_prediction_s", "exec_to_first_prediction_s")
+    }
+    summary["mlflow_imported"] = any(run["mlflow_imported"] for run in runs)
+    summary["bentoml_imported"] = any(run["bentoml_imported"] for run in runs)
+    write_results({"benchmark": "cold_start", "runs": runs, "median": summary}, args.output)
@@ -0,0 +1,62 @@
+# Benchmark : collecte de logistic_chain (SQLite local) en Parquet, débit et pic de mémoire par taille de bloc
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.database import LOGISTIC_CHAIN_COLUMNS
+from app.schema import sample_records
+from benchmarks.common import write_results
+from retrain.data_collect import RETRAIN_COLUMNS
+
+# Une collecte complète par processus neuf : le pic de mémoire est celui de la taille de bloc mesurée
+CHILD = """
+import sys, json, sqlite3
+sys.path.insert(0, sys.argv[1])
+from retrain.data_collect import ChunkedCollector, Watermark
+database, root, state, chunk_size = sys.argv[2:6]
+collector = ChunkedCollector(lambda: sqlite3.connect(database), root, Watermark(state), int(chunk_size), placeholder="?")
+print(json.dumps(collector.collect()))
+"""
+
+def build_database(path, n_rows, batch=50_000):
+    connection = sqlite3.connect(path)
+    columns = ", ".join(f"{column} {'REAL' if column.endswith(('cost', 'km')) else 'TEXT'}" for column in LOGISTIC_CHAIN_COLUMNS)
+    # Statut observé (RETRAIN_LABEL_COLUMN) à côté de la prédiction écrite par l'API
+    label = list(RETRAIN_COLUMNS)[-1]
+    connection.execute(f"CREATE TABLE logistic_chain (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns}, {label} TEXT)")
+    aliases = list(RETRAIN_COLUMNS.values())[:-1]
+    names = LOGISTIC_CHAIN_COLUMNS + (label,)
+    query = f"INSERT INTO logistic_chain ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+    for start in range(0, n_rows, batch):
+        records = sample_records(min(batch, n_rows - start), seed=start)
+        statuses = ("On Time", "Late")
+        connection.executemany(query, [tuple(r[a] for a in aliases) + (statuses[i % 2], statuses[(i // 2) % 2]) for i, r in enumerate(records)])
+    connection.commit()
+    connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Débit de la collecte logistic_chain -> Parquet")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    results = {"benchmark": "collector", "rows": args.rows, "runs": []}
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "logistik.db")
+        build_database(database, args.rows)
+        for chunk_size in args.chunk_sizes:
+            target = os.path.join(directory, f"collected-{chunk_size}")
+            state = os.path.join(directory, f"state-{chunk_size}.json")
+            output = subprocess.run(
+                [sys.executable, "-c", CHILD, root, database, target, state, str(chunk_size)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results["runs"].append({"chunk_size": chunk_size, **json.loads(output.strip().splitlines()[-1])})
+    write_results(results, args.output)
@@ -0,0 +1,81 @@
+# Benchmark : chargement du dataset, lecture de la source face au cache Feather (complet, projeté)
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.common import write_results
+from train_pipeline.synthetic import make_synthetic_supply
+
+# Chaque mesure tourne dans un processus neuf (Linux) : pic de mémoire du seul chargement
+CHILD = """
+import sys, json, time
+sys.path.insert(0, sys.argv[1])
+from train_pipeline.dataset import load_dataset, read_source
+method, path, cache_dir = sys.argv[2:5]
+
+def status_mb(key):
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith(key)) / 1024
+
+# Remise à zéro du pic (VmHWM) après les imports : seul le chargement est mesuré
+with open("/proc/self/clear_refs", "w") as refs:
+    refs.write("5")
+imported_rss = status_mb("VmRSS")
+started = time.perf_counter()
+if method == "source":
+    frame = read_source(path)
+elif method == "projected":
+    frame = load_dataset(path, columns=["Distance_Km", "State"], cache_dir=cache_dir)
+else:
+    frame = load_dataset(path, cache_dir=cache_dir)
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "seconds": elapsed,
+    "load_peak_mb": status_mb("VmHWM") - imported_rss,
+    "frame_mb": frame.memory_usage(deep=True).sum() / 1e6,
+}))
+"""
+
+def measure(method, path, cache_dir):
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, root, method, path, cache_dir],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def synthetic_source(directory, n_rows):
+    # Excel si openpyxl est disponible, sinon CSV (même chemin de conversion)
+    supply = make_synthetic_supply(n_rows)
+    try:
+        import openpyxl  # noqa: F401
+        path = os.path.join(directory, "supply.xlsx")
+        supply.to_excel(path, index=False)
+    except ImportError:
+        path = os.path.join(directory, "supply.csv")
+        supply.to_csv(path, index=False)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chargement du dataset : source face au cache colonnaire")
+    parser.add_argument("--source", default=os.getenv("TRAIN_DATASET_PATH"))
+    parser.add_argument("--rows", type=int, default=200_000, help="Taille du jeu synthétique sans --source")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.source or synthetic_source(directory, args.rows)
+        cache_dir = os.path.join(directory, "cache")
+        results = {
+            "benchmark": "dataset",
+            "source": os.path.basename(path),
+            "source_read": measure("source", path, cache_dir),
+            "cache_build": measure("cache", path, cache_dir),
+            "cache_read": measure("cache", path, cache_dir),
+            "cache_read_projected": measure("projected", path, cache_dir),
+        }
+    write_results(results, args.output)
@@ -0,0 +1,62 @@
+# Benchmark : latence de /v1/explain (TreeSHAP exact, budget + approximation, cache) face au predict servi
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.schema import LogistikData, sample_records
+from app.compiled import build_compiled_pipeline
+from app.explainer import build_tree_explanations
+from app.hot_reload import ServingModel
+from benchmarks.common import build_standin_model, write_results
+from benchmarks.bench_tree_engine import build_catboost, latency_ms
+
+def cold(explanations, budget_ms):
+    # Cache vidé avant chaque appel : toutes les cellules sont à calculer
+    def explain(items):
+        explanations._entries.clear()
+        return explanations.explain(items, budget_ms)
+    return explain
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latence des explications TreeSHAP")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--budget-ms", type=float, default=250)
+    parser.add_argument("--grid-resolution", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    native = build_standin_model(n_estimators=args.n_estimators)
+    models = {
+        "random_forest": ServingModel(native, "Local", "bench", build_compiled_pipeline(native)),
+        "catboost": ServingModel(build_catboost(iterations=args.n_estimators), "Local", "bench"),
+    }
+    results = []
+    for name, serving in models.items():
+        explanations = build_tree_explanations(serving, args.grid_resolution)
+        for batch_size in args.batch_sizes:
+            items = [LogistikData.model_validate(record) for record in sample_records(batch_size, seed=7)]
+            methods = [result["Method"] for result in cold(explanations, args.budget_ms)(items)]
+            run = {
+                "model": name,
+                "batch_size": batch_size,
+                "predict": latency_ms(serving.predict_items, items, args.repeats),
+                "explain_exact": latency_ms(cold(explanations, 0), items, args.repeats),
+                "explain_budget": latency_ms(cold(explanations, args.budget_ms), items, args.repeats),
+                "exact_share_within_budget": 1 - methods.count("approximate") / len(methods),
+            }
+            # Toutes les cellules du lot en cache avant la mesure
+            explanations.explain(items)
+            run["explain_cached"] = latency_ms(lambda batch: explanations.explain(batch, args.budget_ms), items, args.repeats)
+            print(f"⏱️ {name} x{batch_size} : predict {run['predict']['p50_ms']:.1f} ms, exact {run['explain_exact']['p50_ms']:.1f} ms, "
+                  f"budget {run['explain_budget']['p50_ms']:.1f} ms, cache {run['explain_cached']['p50_ms']:.2f} ms")
+            results.append(run)
+    write_results({
+        "benchmark": "explain",
+        "budget_ms": args.budget_ms,
+        "grid_resolution": args.grid_resolution,
+        "n_estimators": args.n_estimators,
+        "runs": results,
+    }, args.output)
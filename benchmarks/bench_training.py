@@ -0,0 +1,60 @@
+# Benchmark : recherche d'hyperparamètres (cache des prétraitements, stratégies random / halving)
+import os
+import sys
+import time
+import argparse
+import tempfile
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.common import write_results
+from train_pipeline.config import settings
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+from train_pipeline.training import train_models, cpu_seconds
+from train_pipeline.catboost_ml import train_catboost
+
+def run(train, x_test, y_test):
+    # Temps jusqu'au meilleur modèle retourné par la recherche, et son score sur le jeu de test
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    best_models = train()
+    return {
+        "time_to_best_s": time.perf_counter() - wall,
+        "cpu_s": cpu_seconds() - cpu,
+        "test_accuracy": {name: float((model.predict(x_test).ravel() == y_test).mean()) for name, model in best_models.items()},
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de la recherche d'hyperparamètres")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--n-iter", type=int, default=settings.N_ITER)
+    parser.add_argument("--splits", type=int, default=settings.N_SPLITE)
+    parser.add_argument("--strategies", nargs="+", default=["random", "halving"])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    supply = make_synthetic_supply(args.rows)
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"].to_numpy()
+    x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.2, random_state=settings.RANDOM_STATE)
+    cat_cols = x.select_dtypes(include="object").columns.tolist()
+    settings.N_ITER, settings.N_SPLITE = args.n_iter, args.splits
+    results = {"benchmark": "training", "rows": args.rows, "n_iter": args.n_iter, "splits": args.splits, "runs": []}
+    caller_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        settings.PREPROCESSING_CACHE_DIR = directory
+        # catboost_info de la configuration fixe écrit dans le dossier temporaire, répertoire d'appel restauré
+        # avant sa suppression (y compris en cas d'erreur) : un --output relatif reste relatif à l'appelant
+        os.chdir(directory)
+        try:
+            for strategy in args.strategies:
+                settings.SEARCH_STRATEGY = strategy
+                # Sans cache uniquement pour la stratégie de référence
+                for cache in ((False, True) if strategy == "random" else (True,)):
+                    settings.PREPROCESSING_CACHE_ENABLED = cache
+                    run_result = run(lambda: train_models(x_train, y_train, get_preprocessor(supply)), x_test, y_test)
+                    results["runs"].append({"strategy": strategy, "family": "sklearn", "cache": cache, **run_result})
+                run_result = run(lambda: {"catboost": train_catboost(x_train, y_train, cat_cols)}, x_test, y_test)
+                results["runs"].append({"strategy": strategy, "family": "catboost", **run_result})
+        finally:
+            os.chdir(caller_dir)
+    write_results(results, args.output)
@@ -0,0 +1,58 @@
+# Benchmark : latence du moteur NumPy face au predict natif (forêt scikit-learn et CatBoost)
+import os
+import sys
+import time
+import argparse
+import statistics
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.schema import sample_records
+from app.tree_engine import compile_numpy_model
+from benchmarks.common import build_standin_model, write_results
+from train_pipeline.synthetic import make_synthetic_supply
+
+def build_catboost(n_rows=5000, iterations=300, depth=6):
+    from catboost import CatBoostClassifier, Pool
+
+    supply = make_synthetic_supply(n_rows)
+    X, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"]
+    cat_cols = X.select_dtypes(include="object").columns.tolist()
+    model = CatBoostClassifier(iterations=iterations, depth=depth, verbose=0, random_seed=42, allow_writing_files=False)
+    return model.fit(Pool(X, y, cat_features=cat_cols))
+
+def latency_ms(predict, batch, repeats):
+    predict(batch)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        predict(batch)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": statistics.median(timings), "p95_ms": statistics.quantiles(timings, n=20)[-1]}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latence du moteur NumPy")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    models = {
+        "random_forest": build_standin_model(n_estimators=args.n_estimators),
+        "catboost": build_catboost(iterations=args.n_estimators),
+    }
+    results = []
+    for name, native in models.items():
+        compiled = compile_numpy_model(native)
+        for batch_size in args.batch_sizes:
+            batch = pd.DataFrame(sample_records(batch_size, seed=7))
+            if not (compiled.predict(batch) == native.predict(batch).ravel()).all():
+                raise RuntimeError(f"Prédictions NumPy différentes du modèle natif ({name})")
+            results.append({
+                "model": name,
+                "batch_size": batch_size,
+                "native": latency_ms(native.predict, batch, args.repeats),
+                "numpy": latency_ms(compiled.predict, batch, args.repeats),
+            })
+    write_results({"benchmark": "tree_engine", "runs": results}, args.output)
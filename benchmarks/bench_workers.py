@@ -0,0 +1,94 @@
+# Benchmark : mémoire (RSS/PSS) et débit de N workers, pickle joblib complet vs modèle partagé mappé
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.tree_engine import export_shared_model
+from benchmarks.common import build_standin_model, write_results
+
+CHILD = """
+import sys, json, time
+import pandas as pd
+from app.model_loader import load_model_from_uri
+from app.schema import sample_records
+
+def memory():
+    usage = {}
+    with open("/proc/self/status") as handle:
+        for line in handle:
+            if line.startswith("VmRSS:"):
+                usage["rss_mb"] = int(line.split()[1]) / 1024
+    # PSS : pages partagées divisées par le nombre de processus qui les mappent
+    with open("/proc/self/smaps_rollup") as handle:
+        for line in handle:
+            if line.startswith("Pss:"):
+                usage["pss_mb"] = int(line.split()[1]) / 1024
+    return usage
+
+model, model_type = load_model_from_uri(sys.argv[1])
+batch = pd.DataFrame(sample_records(int(sys.argv[3])))
+model.predict(batch)
+sys.stdout.write("ready\\n")
+sys.stdout.flush()
+sys.stdin.readline()
+deadline = time.perf_counter() + float(sys.argv[2])
+rows = 0
+while time.perf_counter() < deadline:
+    model.predict(batch)
+    rows += len(batch)
+print(json.dumps(dict(memory(), model_type=model_type, rows=rows)))
+"""
+
+def run_workers(source, n_workers, duration, batch_size):
+    # Démarrage synchronisé : chaque worker charge le modèle, puis tous mesurent en même temps
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", CHILD, source, str(duration), str(batch_size)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=root,
+            env=dict(os.environ, PYTHONPATH=root),
+        )
+        for _ in range(n_workers)
+    ]
+    for worker in workers:
+        assert worker.stdout.readline().strip() == "ready"
+    for worker in workers:
+        worker.stdin.write("go\n")
+        worker.stdin.flush()
+    reports = [json.loads(worker.communicate()[0].strip().splitlines()[-1]) for worker in workers]
+    return {
+        "workers": n_workers,
+        "model_type": reports[0]["model_type"],
+        "rss_mb_per_worker": max(report["rss_mb"] for report in reports),
+        "pss_mb_total": sum(report["pss_mb"] for report in reports),
+        "rows_per_second": sum(report["rows"] for report in reports) / duration,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mémoire et débit multi-workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    import joblib
+
+    with tempfile.TemporaryDirectory() as workdir:
+        model = build_standin_model(n_estimators=args.n_estimators, max_depth=None)
+        pickled = os.path.join(workdir, "model.joblib")
+        shared = os.path.join(workdir, "shared")
+        joblib.dump(model, pickled)
+        export_shared_model(model, shared)
+
+        results = [
+            dict(run_workers(source, n_workers, args.duration, args.batch_size), artifact=artifact)
+            for artifact, source in (("joblib", pickled), ("shared_mmap", shared))
+            for n_workers in args.workers
+        ]
+    write_results({"benchmark": "workers", "runs": results}, args.output)
@@ -0,0 +1,36 @@
+# Utilitaires partagés par les benchmarks
+import os
+import sys
+import json
+import resource
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+
+# ====== MODELE DE SUBSTITUTION (SANS MLFLOW) ======
+def build_standin_model(kind="random_forest", n_rows=5000, n_estimators=300, max_depth=10, random_state=42):
+    """
+    Entraîne localement un pipeline identique à celui de train_models sur le jeu synthétique.
+    """
+    supply = make_synthetic_supply(n_rows, random_state=random_state)
+    if kind == "random_forest":
+        classifier = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=random_state)
+    else:
+        classifier = LogisticRegression(max_iter=1000, solver='liblinear', class_weight="balanced")
+    pipe = Pipeline([('preprocessing', get_preprocessor(supply)), ('classifier', classifier)])
+    return pipe.fit(supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"])
+
+def peak_rss_mb() -> float:
+    # Pic de mémoire résidente du processus courant (ru_maxrss est en Ko sous Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def write_results(results: dict, output=None):
+    text = json.dumps(results, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as handle:
+            handle.write(text)
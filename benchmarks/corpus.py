@@ -0,0 +1,73 @@
+# Corpus de requêtes des tests de charge : fichier NDJSON de payloads, complété par le générateur du schéma
+import os
+import sys
+import json
+import random
+import argparse
+from pydantic import ValidationError
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app.schema import LogistikData, sample_records
+
+# ====== LECTURE ET ECRITURE NDJSON ======
+def read_corpus(path) -> tuple:
+    """
+    Lit un fichier NDJSON de payloads /v1/predict (même format que GOLDEN_REQUESTS_PATH).
+
+    Les lignes qui ne sont pas des enregistrements LogistikData valides sont ignorées ;
+    la classe attendue éventuelle ("Code") est retirée du payload.
+
+    :return: (liste de payloads par alias, nombre de lignes rejetées)
+    """
+    records, rejected = [], 0
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                item = LogistikData.model_validate(json.loads(line))
+            except (json.JSONDecodeError, ValidationError):
+                rejected += 1
+                continue
+            records.append(item.model_dump(by_alias=True, mode="json"))
+    return records, rejected
+
+def write_corpus(records: list, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+
+# ====== CORPUS REPRODUCTIBLE ======
+def build_corpus(path=None, size=2000, seed=42) -> dict:
+    """
+    Corpus de size requêtes : celles du fichier NDJSON (au plus size), complétées par
+    sample_records ; même fichier et même graine, même corpus.
+
+    :return: {"records", "source", "from_file", "generated", "rejected"}
+    """
+    recorded, rejected = read_corpus(path) if path and os.path.exists(path) else ([], 0)
+    generated = sample_records(max(0, size - len(recorded)), seed=seed)
+    records = (recorded + generated)[:size]
+    # Mélange déterministe : les requêtes enregistrées ne partent pas toutes en tête
+    random.Random(seed).shuffle(records)
+    return {
+        "records": records,
+        "source": path if recorded else "schema",
+        "from_file": min(len(recorded), size),
+        "generated": len(generated),
+        "rejected": rejected,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit un corpus NDJSON de requêtes /v1/predict")
+    parser.add_argument("--input", default=None, help="Payloads NDJSON enregistrés (facultatif)")
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmarks/corpus.jsonl")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.input, args.size, args.seed)
+    write_corpus(corpus["records"], args.output)
+    print(f"✅ {len(corpus['records'])} requêtes écrites dans {args.output} "
+          f"({corpus['from_file']} du fichier, {corpus['generated']} générées, {corpus['rejected']} rejetées)")
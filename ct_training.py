@@ -0,0 +1,82 @@
+# Entraînement continu : lancé par l'étape CT de Jenkins (un passage) ou en service (--loop)
+import argparse
+import logging
+import numpy as np
+import pandas as pd
+
+from app.database import mysql_pool_factory
+from retrain.data_collect import Watermark, table_source
+from retrain.models_comparator import promote_candidates
+from retrain.retraining_task import RetrainingTask
+from train_pipeline.config import settings
+from train_pipeline.data_loader import load_and_encode_data
+from train_pipeline.orchestrator import train_all_families
+from train_pipeline.prediction import log_and_save_models
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CATBOOST_MODEL_NAME = "catboost_delivery_status"
+
+# ====== MODELES EN PRODUCTION ======
+def load_production_models(families) -> dict:
+    # Saveurs natives (et non pyfunc) : les modèles doivent pouvoir être poursuivis à chaud
+    import mlflow
+
+    if settings.MLFLOW_TRACKING_URI:
+        mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
+    models = {}
+    for name in families:
+        if name == "catboost":
+            models[name] = mlflow.catboost.load_model(f"models:/{CATBOOST_MODEL_NAME}/Production")
+        else:
+            models[name] = mlflow.sklearn.load_model(f"models:/{name}/Production")
+    return models
+
+def save_models(models, x_test, y_test):
+    # Nouvelles versions enregistrées en challengers ; seules les gagnantes passent en Production
+    sklearn_models = {name: model for name, model in models.items() if name != "catboost"}
+    registered = log_and_save_models(sklearn_models, x_test, y_test)
+    if "catboost" in models:
+        from catboost import Pool
+        from train_pipeline.catboost_ml import predict_log_save
+
+        cat_cols = x_test.select_dtypes(include=["object", "category"]).columns.tolist()
+        x_catboost = x_test.assign(**{col: x_test[col].astype(object).fillna('missing') for col in cat_cols})
+        version = predict_log_save(models["catboost"], Pool(x_catboost, y_test, cat_features=cat_cols), y_test, model_name=CATBOOST_MODEL_NAME)
+        if version is not None:
+            registered[CATBOOST_MODEL_NAME] = (models["catboost"], version)
+    return promote_candidates(registered, x_test, y_test)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entraînement continu sur les nouvelles lignes de logistic_chain")
+    parser.add_argument("--loop", action="store_true", help="Tourne en continu toutes les RETRAIN_INTERVAL_SECONDS")
+    args = parser.parse_args()
+
+    # Dataset DVC seul : les nouvelles lignes de logistic_chain sont lues par la tâche, derrière son propre filigrane
+    x_train, x_test, y_train, y_test, supply = load_and_encode_data(include_collected=False)
+    watermark = Watermark(settings.RETRAIN_STATE_PATH)
+
+    def full_refit(rows):
+        # Réentraînement complet : dataset DVC et nouvelles lignes réunis
+        x = pd.concat([x_train, rows.drop(columns=["Delivery_Status"])], ignore_index=True)
+        y = np.concatenate([y_train, rows["Delivery_Status"].to_numpy()])
+        best_models, _ = train_all_families(x, y)
+        return best_models
+
+    task = RetrainingTask(
+        table_source(mysql_pool_factory(1, "routewise_retraining"), watermark.load()),
+        watermark,
+        load_production_models(settings.TRAIN_FAMILIES),
+        x_train.assign(Delivery_Status=y_train),
+        full_refit,
+        on_update=lambda models, mode: save_models(models, x_test, y_test),
+        min_rows=settings.RETRAIN_MIN_ROWS,
+        psi_threshold=settings.RETRAIN_PSI_THRESHOLD,
+        extra_trees=settings.RETRAIN_EXTRA_TREES,
+        extra_iterations=settings.RETRAIN_EXTRA_ITERATIONS,
+    )
+    if args.loop:
+        task.run_forever(settings.RETRAIN_INTERVAL_SECONDS)
+    else:
+        logger.info(f"✅ Entraînement continu : {task.run_once()}")
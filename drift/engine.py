@@ -0,0 +1,136 @@
+# drift/engine.py
+from enum import Enum
+import numpy as np
+import pandas as pd
+
+from drift.streaming import PSI_EPSILON
+
+def quantile_edges(values, bins=10) -> np.ndarray:
+    """
+    Bornes intérieures (bins - 1) aux quantiles de la baseline : intervalles de même effectif.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.zeros(bins - 1)
+    return np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])
+
+def divergences(expected, actual, eps=PSI_EPSILON) -> dict:
+    """
+    PSI, KL(actual || expected) et Jensen-Shannon ligne par ligne sur deux matrices de comptages (features, cases).
+
+    Lignes lissées par eps ; une ligne vide d'un côté ou de l'autre donne 0.
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    expected_total = expected.sum(axis=1, keepdims=True)
+    actual_total = actual.sum(axis=1, keepdims=True)
+    valid = (expected_total[:, 0] > 0) & (actual_total[:, 0] > 0)
+    e = np.divide(expected, expected_total, out=np.zeros_like(expected), where=expected_total > 0)
+    a = np.divide(actual, actual_total, out=np.zeros_like(actual), where=actual_total > 0)
+
+    psi = np.sum((e - a) * np.log((e + eps) / (a + eps)), axis=1)
+    kl = np.sum(a * np.log((a + eps) / (e + eps)), axis=1)
+    m = (e + a) / 2
+    js = 0.5 * np.sum(a * np.log((a + eps) / (m + eps)), axis=1) + 0.5 * np.sum(e * np.log((e + eps) / (m + eps)), axis=1)
+    return {name: np.where(valid, value, 0.0) for name, value in (("psi", psi), ("kl", kl), ("js", js))}
+
+class DriftEngine:
+    """
+    Dérive de toutes les features d'un lot en un seul passage vectorisé.
+
+    Numériques : bornes aux quantiles de la baseline, calculées une fois (matrice (F, bins - 1)). Un
+    lot est converti une fois en bloc (n, F) et chaque colonne du bloc est classée par np.searchsorted.
+    Catégorielles : codes sur le vocabulaire des Enum de app/schema, plus une case « autre ».
+    Les comptages de toutes les colonnes sont obtenus par un seul np.bincount décalé par colonne,
+    puis PSI, KL et JS sont calculés pour toutes les features à la fois.
+
+    :param vocabularies: {colonne: [modalités]} ; par défaut les Enum de LogistikData.
+    """
+
+    def __init__(self, numeric_columns, edges, categorical_columns, vocabularies, chunk_size=1_000_000):
+        self.numeric_columns = list(numeric_columns)
+        self.edges = np.asarray(edges, dtype=np.float64).reshape(len(self.numeric_columns), -1)
+        self.categorical_columns = list(categorical_columns)
+        self.vocabularies = [list(vocabularies[col]) for col in self.categorical_columns]
+        self.chunk_size = chunk_size
+
+        self._vocab_width = max((len(v) for v in self.vocabularies), default=0) + 1
+        self.baseline_numeric = None
+        self.baseline_categorical = None
+
+    @classmethod
+    def from_baseline(cls, baseline: pd.DataFrame, bins=10, vocabularies=None, exclude=("Delivery_Status",), chunk_size=1_000_000):
+        if vocabularies is None:
+            from app.schema import categorical_fields
+
+            vocabularies = {col: [member.value for member in enum] for col, enum in categorical_fields().items()}
+        columns = [col for col in baseline.columns if col not in exclude]
+        numeric = [col for col in columns if pd.api.types.is_numeric_dtype(baseline[col])]
+        categorical = [col for col in columns if col in vocabularies and col not in numeric]
+        edges = [quantile_edges(baseline[col].to_numpy(dtype=np.float64), bins) for col in numeric]
+        engine = cls(numeric, np.asarray(edges).reshape(len(numeric), bins - 1), categorical, vocabularies, chunk_size)
+        engine.baseline_numeric, _ = engine.numeric_counts(baseline)
+        engine.baseline_categorical, _ = engine.categorical_counts(baseline)
+        return engine
+
+    # ====== COMPTAGES VECTORISES ======
+    def numeric_counts(self, frame: pd.DataFrame):
+        # Retourne (comptages (F, bins), nulls (F,)) ; traitement par blocs de chunk_size lignes
+        n_features, n_bins = len(self.numeric_columns), self.edges.shape[1] + 1
+        counts = np.zeros(n_features * n_bins, dtype=np.int64)
+        nulls = np.zeros(n_features, dtype=np.int64)
+        if not n_features:
+            return counts.reshape(0, n_bins), nulls
+        values = frame[self.numeric_columns].to_numpy(dtype=np.float64)
+        offsets = np.arange(n_features) * n_bins
+        for start in range(0, len(values), self.chunk_size):
+            block = values[start:start + self.chunk_size]
+            missing = np.isnan(block)
+            nulls += missing.sum(axis=0)
+            # Une recherche vectorisée par colonne du bloc (un seul np.searchsorted sur des clés
+            # complexes colonne + i * valeur est deux fois plus lent), décalée de f * n_bins
+            bins = np.empty(block.shape, dtype=np.int64)
+            for f in range(n_features):
+                bins[:, f] = np.searchsorted(self.edges[f], block[:, f], side="right") + offsets[f]
+            counts += np.bincount(bins[~missing], minlength=len(counts))
+        return counts.reshape(n_features, n_bins), nulls
+
+    def categorical_counts(self, frame: pd.DataFrame):
+        # Retourne (comptages (C, largeur), nulls (C,)) ; la case vocab_len de chaque ligne compte les modalités inconnues
+        width = self._vocab_width
+        flat = []
+        nulls = np.zeros(len(self.categorical_columns), dtype=np.int64)
+        for c, (col, vocabulary) in enumerate(zip(self.categorical_columns, self.vocabularies)):
+            series = frame[col] if col in frame else pd.Series([None] * len(frame), dtype=object)
+            missing = series.isna().to_numpy()
+            if isinstance(series.dtype, pd.CategoricalDtype) and list(series.cat.categories) == vocabulary:
+                codes = series.cat.codes.to_numpy().astype(np.int64)
+            else:
+                if series.dtype == object and isinstance(series.iloc[0] if len(series) else None, Enum):
+                    # Membres d'Enum (LogistikData.dict) : leur hash n'est pas celui de leur valeur
+                    series = series.map(lambda value: getattr(value, "value", value))
+                codes = pd.Categorical(series, categories=vocabulary).codes.astype(np.int64)
+            codes = np.where(codes < 0, len(vocabulary), codes)[~missing]
+            nulls[c] = missing.sum()
+            flat.append(codes + c * width)
+        size = len(self.categorical_columns) * width
+        counts = np.bincount(np.concatenate(flat), minlength=size) if flat else np.zeros(size, dtype=np.int64)
+        return counts.reshape(len(self.categorical_columns), width), nulls
+
+    # ====== COMPARAISON A LA BASELINE ======
+    def compare(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        :return: DataFrame indexé par feature : psi, kl, js, null_rate.
+        """
+        numeric, numeric_nulls = self.numeric_counts(frame)
+        categorical, categorical_nulls = self.categorical_counts(frame)
+        scores = {
+            name: np.concatenate([numeric_scores, categorical_scores])
+            for (name, numeric_scores), categorical_scores in zip(
+                divergences(self.baseline_numeric, numeric).items(),
+                divergences(self.baseline_categorical, categorical).values(),
+            )
+        }
+        scores["null_rate"] = np.concatenate([numeric_nulls, categorical_nulls]) / max(len(frame), 1)
+        return pd.DataFrame(scores, index=self.numeric_columns + self.categorical_columns)
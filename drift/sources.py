@@ -0,0 +1,92 @@
+# drift/sources.py
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NDJSONTail:
+    """
+    Lit uniquement les nouvelles lignes complètes d'un journal NDJSON (une requête par ligne).
+
+    La position est conservée entre deux lectures ; un fichier tronqué ou remplacé (rotation)
+    est relu depuis le début. Une ligne en cours d'écriture (sans retour à la ligne) est
+    laissée pour la lecture suivante.
+    """
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self.inode = None
+        self.malformed = 0
+
+    def read(self, max_records=None) -> list:
+        if not os.path.exists(self.path):
+            return []
+        stat = os.stat(self.path)
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            if self.inode is not None:
+                logger.info(f"🔄 Journal {self.path} remplacé ou tronqué, relecture depuis le début")
+                self.offset = 0
+            self.inode = stat.st_ino
+
+        records = []
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offset)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self.malformed += 1
+                if max_records is not None and len(records) >= max_records:
+                    break
+        return records
+
+class SequenceTableSource:
+    """
+    Lit les nouvelles lignes d'une table à clé croissante (id > dernier id lu), par pages.
+
+    :param connection_factory: Callable sans argument retournant une connexion DB-API.
+    :param columns: {colonne SQL: nom de la feature} ; les enregistrements sont retournés par nom de feature.
+    :param placeholder: Marqueur de paramètre du driver ("%s" pour MySQL, "?" pour SQLite).
+    """
+
+    def __init__(self, connection_factory, columns: dict, table="logistic_chain", id_column="id",
+                 last_id=0, placeholder="%s", page_size=5000):
+        self.connection_factory = connection_factory
+        self.columns = columns
+        self.last_id = last_id
+        self.page_size = page_size
+        self.query = (
+            f"SELECT {id_column}, {', '.join(columns)} FROM {table} "
+            f"WHERE {id_column} > {placeholder} ORDER BY {id_column} LIMIT {placeholder}"
+        )
+
+    def read(self, max_records=None) -> list:
+        records = []
+        connection = self.connection_factory()
+        try:
+            cursor = connection.cursor()
+            try:
+                while max_records is None or len(records) < max_records:
+                    # Page réduite au reste demandé : jamais plus de max_records lignes en mémoire
+                    limit = self.page_size if max_records is None else min(self.page_size, max_records - len(records))
+                    cursor.execute(self.query, (self.last_id, limit))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    names = list(self.columns.values())
+                    records.extend(dict(zip(names, row[1:])) for row in rows)
+                    self.last_id = rows[-1][0]
+                    if len(rows) < limit:
+                        break
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+        return records
@@ -0,0 +1,238 @@
+# drift/streaming.py
+from collections import deque
+import numpy as np
+import pandas as pd
+
+PSI_EPSILON = 1e-6
+
+def psi_from_counts(expected, actual, eps=PSI_EPSILON) -> float:
+    """
+    PSI entre deux histogrammes de comptages (mêmes intervalles), même formule que calculate_psi.
+
+    Retourne 0 si l'un des deux histogrammes est vide.
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return 0.0
+    expected_perc = expected / expected.sum()
+    actual_perc = actual / actual.sum()
+    return float(np.sum((expected_perc - actual_perc) * np.log((expected_perc + eps) / (actual_perc + eps))))
+
+# ====== STATISTIQUES INCREMENTALES PAR FEATURE ======
+class NumericSketch:
+    """
+    Statistiques d'une feature numérique en mémoire constante.
+
+    Comptages (valeurs, nulls), moyenne et variance de Welford (fusion de Chan pour un lot),
+    histogramme sur des bornes fixées une fois sur la baseline ; les valeurs hors de la plage
+    de la baseline tombent dans le premier ou le dernier intervalle.
+
+    :param edges: Bornes de l'histogramme (len(edges) - 1 intervalles).
+    """
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.hist = np.zeros(max(len(self.edges) - 1, 1), dtype=np.int64)
+
+    def empty_like(self):
+        return NumericSketch(self.edges)
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+        present = values[~np.isnan(values)]
+        self.nulls += len(values) - len(present)
+        if len(present) == 0:
+            return
+        self._combine(len(present), present.mean(), ((present - present.mean()) ** 2).sum())
+        bins = np.searchsorted(self.edges[1:-1], present, side="right")
+        self.hist += np.bincount(bins, minlength=len(self.hist))
+
+    def merge(self, other: "NumericSketch"):
+        self.nulls += other.nulls
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            self.hist += other.hist
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def null_rate(self) -> float:
+        seen = self.count + self.nulls
+        return self.nulls / seen if seen else 0.0
+
+class CategoricalSketch:
+    """
+    Fréquences d'une feature catégorielle sur le vocabulaire de la baseline.
+
+    Les modalités absentes de la baseline sont regroupées dans une case « autre » (dernière case).
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self.index = {category: i for i, category in enumerate(self.categories)}
+        self.reset()
+
+    def reset(self):
+        self.nulls = 0
+        self.counts = np.zeros(len(self.categories) + 1, dtype=np.int64)
+
+    def empty_like(self):
+        return CategoricalSketch(self.categories)
+
+    def update(self, values):
+        other = len(self.categories)
+        codes = []
+        for value in values:
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                self.nulls += 1
+            else:
+                codes.append(self.index.get(getattr(value, "value", value), other))
+        if codes:
+            self.counts += np.bincount(codes, minlength=len(self.counts))
+
+    def merge(self, other: "CategoricalSketch"):
+        self.nulls += other.nulls
+        self.counts += other.counts
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def null_rate(self) -> float:
+        seen = self.count + self.nulls
+        return self.nulls / seen if seen else 0.0
+
+    @property
+    def n_unique(self) -> int:
+        return int(np.count_nonzero(self.counts[:-1])) + int(self.counts[-1] > 0)
+
+    def top_frequency(self) -> float:
+        return float(self.counts.max() / self.count) if self.count else 0.0
+
+# ====== PROFIL D'UN ENSEMBLE DE FEATURES ======
+class DriftProfile:
+    """
+    Ensemble de sketches (un par feature), mis à jour par lots d'enregistrements.
+
+    :param sketches: {colonne: NumericSketch | CategoricalSketch}
+    """
+
+    def __init__(self, sketches: dict):
+        self.sketches = sketches
+        self.records = 0
+
+    @classmethod
+    def from_baseline(cls, baseline: pd.DataFrame, bins: int = 10, exclude=("Delivery_Status",)):
+        """
+        Fixe les bornes (quantiles de la baseline) et les vocabulaires, puis compte la baseline.
+        """
+        from drift.engine import quantile_edges
+
+        sketches = {}
+        for col in baseline.columns:
+            if col in exclude:
+                continue
+            series = baseline[col].dropna()
+            if pd.api.types.is_numeric_dtype(baseline[col]):
+                inner = quantile_edges(series.to_numpy(dtype=np.float64), bins)
+                outer = (series.min(), series.max()) if len(series) else (0.0, 1.0)
+                sketches[col] = NumericSketch(np.concatenate([[outer[0]], inner, [outer[1]]]))
+            elif baseline[col].dtype == object or isinstance(baseline[col].dtype, pd.CategoricalDtype):
+                sketches[col] = CategoricalSketch(sorted(series.astype(str).unique()))
+        profile = cls(sketches)
+        profile.update_frame(baseline)
+        return profile
+
+    def empty_like(self):
+        return DriftProfile({col: sketch.empty_like() for col, sketch in self.sketches.items()})
+
+    def update_frame(self, frame: pd.DataFrame):
+        for col, sketch in self.sketches.items():
+            sketch.update(frame[col].tolist() if col in frame else [None] * len(frame))
+        self.records += len(frame)
+
+    def update_records(self, records: list):
+        # Lot d'enregistrements dict (alias de LogistikData) : une liste de valeurs par feature
+        for col, sketch in self.sketches.items():
+            sketch.update([record.get(col) for record in records])
+        self.records += len(records)
+
+    def merge(self, other: "DriftProfile"):
+        for col, sketch in self.sketches.items():
+            sketch.merge(other.sketches[col])
+        self.records += other.records
+
+    def reset(self):
+        for sketch in self.sketches.values():
+            sketch.reset()
+        self.records = 0
+
+    def psi(self, baseline: "DriftProfile") -> dict:
+        values = {}
+        for col, sketch in self.sketches.items():
+            reference = baseline.sketches[col]
+            if isinstance(sketch, NumericSketch):
+                values[col] = psi_from_counts(reference.hist, sketch.hist)
+            else:
+                values[col] = psi_from_counts(reference.counts, sketch.counts)
+        return values
+
+# ====== FENETRES GLISSANTES ET FIXES ======
+class WindowedMonitor:
+    """
+    Dérive calculée sur des fenêtres de records, en mémoire O(features x intervalles x volets).
+
+    Le flux est découpé en volets de pane_size enregistrements. Fenêtre fixe (tumbling) : le
+    dernier volet complet. Fenêtre glissante : les n_panes derniers volets, volet en cours
+    compris, fusionnés à la demande.
+    """
+
+    def __init__(self, baseline: DriftProfile, pane_size: int = 1000, n_panes: int = 10):
+        if pane_size < 1 or n_panes < 1:
+            raise ValueError("pane_size et n_panes doivent être strictement positifs")
+        self.baseline = baseline
+        self.pane_size = pane_size
+        self.current = baseline.empty_like()
+        self.panes = deque(maxlen=n_panes)
+        self.total = 0
+
+    def update(self, records: list):
+        # Un lot peut compléter le volet courant et en ouvrir d'autres
+        start = 0
+        while start < len(records):
+            room = self.pane_size - self.current.records
+            self.current.update_records(records[start:start + room])
+            start += room
+            if self.current.records == self.pane_size:
+                self.panes.append(self.current)
+                self.current = self.baseline.empty_like()
+        self.total += len(records)
+
+    @property
+    def tumbling(self):
+        return self.panes[-1] if self.panes else None
+
+    def sliding(self) -> DriftProfile:
+        window = self.baseline.empty_like()
+        for pane in list(self.panes)[1:] if self.current.records else self.panes:
+            window.merge(pane)
+        window.merge(self.current)
+        return window
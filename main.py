@@ -1,14 +1,32 @@
 # Importation des librairies
-import mlflow
+import os
+import hmac
+import json
+import time
 import logging
 import asyncio
-from fastapi import FastAPI,HTTPException
+import threading
+from typing import Optional
+from fastapi import FastAPI,HTTPException,Request,Query,Header
+from fastapi.responses import PlainTextResponse
+from prometheus_client import Gauge
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from app.schema import LogistikData
+from app.schema import LogistikData, validate_records
 from app.config import Settings
-from app.predictor import make_prediction
-from app.model_loader import load_mlflow_model, load_bentoml_model
+from app.predictor import logistik_mapping
+from app.model_loader import load_mlflow_model, load_bentoml_model, load_model_from_uri, resolve_model_version, ModelArtifactCache
+from app.batcher import MicroBatcher
+from app.compiled import build_compiled_pipeline
+from app.lookup_table import build_lookup_predictor
+from app.tree_engine import compile_numpy_model
+from app.cache import PredictionCache, make_cache_key
+from app.database import PredictionWriter, mysql_pool_factory
+from app.live_drift import build_live_drift
+from app.profiling import observe_stage, stage_timer, SamplingProfiler, ProfileWindow
+from app.admission import InferenceExecutor, Overloaded, DeadlineExceeded, deadline_after
+from app.explainer import build_tree_explanations, ExplanationUnavailable
+from app.hot_reload import ServingModel, ModelWatcher, publish_model_metrics, load_golden_requests, check_golden, fingerprint_source
 
 # ====== PARAMETRAGE ======
 settings = Settings()
@@ -26,51 +44,489 @@ app = FastAPI(
 instrumentator = Instrumentator()
 instrumentator.instrument(app).expose(app)
 
-# ====== CONFIGURATION DE MLFLOW ======
-mlflow.set_tracking_uri(settings.mlflow_tracking_uri)
+# ====== TEMPS DE DEMARRAGE ======
+def process_start_time() -> float:
+    # Horodatage du lancement du processus (exec), à défaut celui de l'import de ce module
+    try:
+        with open("/proc/self/stat") as stat, open("/proc/stat") as system:
+            ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+            boot = next(int(line.split()[1]) for line in system if line.startswith("btime"))
+        return boot + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time()
+
+started_at = process_start_time()
+startup_gauge = Gauge("api_startup_seconds", "Durée entre le lancement du processus et le modèle prêt")
+first_prediction_gauge = Gauge("api_time_to_first_prediction_seconds", "Durée entre le lancement du processus et la première prédiction réussie")
+first_prediction_done = False
 
 # ====== INITIALISATION DU MODELE ======
-model = None
-model_type = None
+# Modèle servi (ServingModel), remplacé d'un bloc lors d'un rechargement
+serving = None
+batcher = None
+writer = None
+watcher = None
+live_drift = None
+profile_window = None
+background_tasks = set()
+artifact_cache = ModelArtifactCache(settings.model_cache_dir) if settings.model_cache_enabled else None
+prediction_cache = None
+if settings.prediction_cache_enabled:
+    prediction_cache = PredictionCache(settings.prediction_cache_max_entries, settings.prediction_cache_ttl_seconds)
+# Inférence hors de la boucle d'événements : pool borné, admission et échéances
+inference = InferenceExecutor(settings.inference_executor, settings.inference_workers, settings.inference_max_in_flight)
+# Explications : l'explicateur TreeSHAP reste dans ce processus, pool de threads borné dédié en mode processus
+explain_executor = inference
+if settings.inference_executor == "process":
+    explain_executor = InferenceExecutor("thread", settings.inference_workers, settings.inference_max_in_flight)
+
+def predict_records(entries: list) -> list:
+    # Micro-batcher : chaque entrée (ServingModel, LogistikData) est prédite par le modèle lu à sa réception
+    results = [None] * len(entries)
+    groups = {}
+    for index, (current, item) in enumerate(entries):
+        groups.setdefault(id(current), (current, []))[1].append(index)
+    for current, indexes in groups.values():
+        predictions = current.predict_items([entries[i][1] for i in indexes], settings.batch_chunk_size)
+        for index, prediction in zip(indexes, predictions):
+            results[index] = prediction
+    return results
+
+async def predict_micro_batch(entries: list) -> list:
+    # Micro-lot exécuté dans le pool d'inférence ; en mode processus, sur le modèle lié au pool
+    if inference.kind == "process":
+        return await inference.predict(None, [item for _, item in entries], settings.batch_chunk_size)
+    return await inference.execute(predict_records, entries)
+
+def build_fast_path(loaded_model):
+    # Chemins rapides construits une seule fois par modèle chargé
+    fast = build_compiled_pipeline(loaded_model) if settings.fast_path_enabled else None
+    if settings.lookup_table_enabled and fast is not None:
+        fast = build_lookup_predictor(
+            fast,
+            settings.prediction_grid_enabled,
+            settings.prediction_grid_resolution,
+            settings.prediction_grid_budget_mb,
+            settings.prediction_grid_min_accuracy,
+        )
+    return fast
+
+def numpy_engine(loaded_model, loaded_model_type):
+    # Remplace une forêt scikit-learn ou un CatBoost par son équivalent NumPy (model_type "NumPy")
+    if not settings.numpy_engine_enabled:
+        return loaded_model, loaded_model_type
+    try:
+        compiled_model = compile_numpy_model(loaded_model)
+    except Exception as e:
+        logger.warning(f"⚠️ Moteur NumPy indisponible : {str(e)}")
+        return loaded_model, loaded_model_type
+    if compiled_model is None:
+        return loaded_model, loaded_model_type
+    logger.info("🌲 Modèle servi par le moteur NumPy")
+    return compiled_model, "NumPy"
+
+def swap_model(candidate: ServingModel):
+    # Bascule atomique : les requêtes en cours gardent leur référence à l'ancien modèle
+    global serving
+    serving = candidate
+    inference.bind(candidate)
+    if prediction_cache is not None:
+        prediction_cache.clear()
+    publish_model_metrics(candidate)
+    logger.info(f"🔖 Modèle actif : {candidate.model_type} ({candidate.version})")
+
+def activate_model(new_model, new_model_type, new_compiled=None, version=None):
+    version = version or resolve_model_version(new_model, settings.model_version)
+    swap_model(ServingModel(new_model, new_model_type, version, new_compiled))
+
+def prepare_model(uri: str) -> ServingModel:
+    # Chargement, préchauffage et contrôle d'un candidat, hors de la boucle d'événements
+    new_model, new_model_type = load_model_from_uri(uri, settings.mlflow_tracking_uri)
+    fingerprint = fingerprint_source(uri) if os.path.exists(uri) else None
+    version = resolve_model_version(new_model, settings.model_version, fingerprint)
+    new_model, new_model_type = numpy_engine(new_model, new_model_type)
+    candidate = ServingModel(new_model, new_model_type, version, build_fast_path(new_model))
+    if not check_golden(candidate, load_golden_requests(settings.golden_requests_path), settings.golden_min_agreement):
+        raise RuntimeError("contrôle du jeu de référence échoué")
+    return candidate
 
-# ====== CHARGEMENT DU MODEL AVEC MLFLOW ET BENTOML(EN FALLBACK)
+# ====== CACHE LOCAL DU MODELE ======
+def run_in_background(function, *args):
+    # Tâche de fond hors du chemin de démarrage (référence conservée jusqu'à la fin) ;
+    # une fonction bloquante passe dans un thread, une coroutine tourne dans la boucle
+    if asyncio.iscoroutinefunction(function):
+        task = asyncio.create_task(function(*args))
+    else:
+        task = asyncio.create_task(asyncio.to_thread(function, *args))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def cache_model(source, loaded_model, loaded_model_type, version):
+    try:
+        fingerprint = fingerprint_source(source) if loaded_model_type == "MLflow" else None
+        artifact_cache.store(source, loaded_model, loaded_model_type, version, fingerprint)
+    except Exception as e:
+        logger.warning(f"⚠️ Mise en cache du modèle impossible : {str(e)}")
+
+def prepare_refreshed_model(source, fingerprint):
+    # Après un démarrage depuis le cache : candidat préparé si une nouvelle version a été publiée entre-temps
+    if fingerprint is None:
+        return None
+    try:
+        current_fingerprint = fingerprint_source(source)
+        if current_fingerprint == fingerprint:
+            return None
+        candidate = prepare_model(source)
+        artifact_cache.store(source, candidate.model, candidate.model_type, candidate.version, current_fingerprint)
+    except Exception as e:
+        logger.warning(f"⚠️ Vérification du modèle en cache impossible : {str(e)}")
+        return None
+    return candidate
+
+async def refresh_cached_model(source, fingerprint):
+    # Préparation dans un thread, bascule dans la boucle (pool d'inférence, cache, métriques)
+    candidate = await asyncio.to_thread(prepare_refreshed_model, source, fingerprint)
+    if candidate is not None:
+        swap_model(candidate)
+
+# ====== CHARGEMENT DU MODEL : CACHE LOCAL, PUIS MLFLOW ET BENTOML(EN FALLBACK)
 @app.on_event('startup')
 async def startup_event():
     print("🚀 Démarrage de l'API FastAPI...")
-    global model, model_type
+    global batcher, writer, watcher, live_drift
     logger.info("✅ Lancement de l'API")
-    try:
-        model = await asyncio.wait_for(asyncio.to_thread(load_mlflow_model, settings.mlflow), timeout=10.0)
-        model_type = "MLflow"
-        logger.info("Modèle chargé via MLflow ✅")
-    except Exception as e:
-        logger.warning(f"❌ Erreur MLflow : {str(e)}\n")
-        logger.info("Mode secours via BentoML activée")
+    cached = None
+    if artifact_cache is not None and not settings.shared_model_dir:
+        for source in (settings.mlflow, settings.bentoml):
+            cached = await asyncio.to_thread(artifact_cache.load, source)
+            if cached is not None:
+                break
+
+    if settings.shared_model_dir:
+        # Workers uvicorn multiples : nœuds des arbres mappés en mémoire, pages partagées
+        model, model_type = await asyncio.to_thread(load_model_from_uri, settings.shared_model_dir)
+        fingerprint = await asyncio.to_thread(fingerprint_source, settings.shared_model_dir)
+        version = resolve_model_version(model, settings.model_version, fingerprint)
+        activate_model(model, model_type, await asyncio.to_thread(build_fast_path, model), version)
+    elif cached is not None:
+        model, model_type, version, fingerprint = cached
+        model, model_type = await asyncio.to_thread(numpy_engine, model, model_type)
+        activate_model(model, model_type, await asyncio.to_thread(build_fast_path, model), version)
+        if model_type == "MLflow":
+            run_in_background(refresh_cached_model, source, fingerprint)
+    else:
+        try:
+            model = await asyncio.wait_for(asyncio.to_thread(load_mlflow_model, settings.mlflow, settings.mlflow_tracking_uri), timeout=10.0)
+            model_type, source = "MLflow", settings.mlflow
+            logger.info("Modèle chargé via MLflow ✅")
+        except Exception as e:
+            logger.warning(f"❌ Erreur MLflow : {str(e)}\n")
+            logger.info("Mode secours via BentoML activée")
+            try:
+                model = load_bentoml_model(settings.bentoml)
+                model_type, source = "BentoML", settings.bentoml
+                logger.info("Modèle chargé via BentoML chargé en secours ✅")
+            except Exception as bentoml_error:
+                logger.critical(f"❌ BentoML échec : {str(bentoml_error)}")
+                raise RuntimeError(f"Échec du chargement des modèles : {e} / {bentoml_error}")
+
+        version = resolve_model_version(model, settings.model_version)
+        served, served_type = await asyncio.to_thread(numpy_engine, model, model_type)
+        activate_model(served, served_type, await asyncio.to_thread(build_fast_path, served), version)
+        if artifact_cache is not None:
+            run_in_background(cache_model, source, model, model_type, version)
+
+    startup_gauge.set(time.time() - started_at)
+    logger.info(f"⏱️ Modèle prêt {time.time() - started_at:.2f}s après le lancement du processus")
+
+    if settings.micro_batch_enabled:
+        batcher = MicroBatcher(predict_micro_batch, settings.micro_batch_max_size, settings.micro_batch_max_wait_ms)
+        await batcher.start()
+
+    if settings.live_drift_enabled:
+        live_drift = build_live_drift(settings.live_drift_baseline_path, settings.live_drift_flush_interval)
+        if live_drift is not None:
+            await live_drift.start()
+
+    if settings.model_watch_enabled and settings.model_watch_uri:
+        watcher = ModelWatcher(settings.model_watch_uri, prepare_model, swap_model, settings.model_watch_interval)
+        await watcher.start()
+
+    if settings.persist_predictions:
         try:
-            model = load_bentoml_model(settings.bentoml)
-            model_type = "BentoML"
-            logger.info("Modèle chargé via BentoML chargé en secours ✅")
-        except Exception as bentoml_error:
-            logger.critical(f"❌ BentoML échec : {str(bentoml_error)}")
-            raise RuntimeError(f"Échec du chargement des modèles : {e} / {bentoml_error}")
+            factory = await asyncio.to_thread(mysql_pool_factory, settings.persist_pool_size)
+            writer = PredictionWriter(
+                factory,
+                max_batch=settings.persist_batch_size,
+                flush_interval=settings.persist_flush_interval,
+                max_buffer=settings.persist_buffer_size,
+                overflow=settings.persist_overflow,
+            )
+            await writer.start()
+        except Exception as e:
+            logger.warning(f"⚠️ Persistance MySQL désactivée : {str(e)}")
+
+@app.on_event('shutdown')
+async def shutdown_event():
+    global batcher, writer, watcher, live_drift
+    if watcher is not None:
+        await watcher.stop()
+        watcher = None
+    if batcher is not None:
+        await batcher.stop()
+        batcher = None
+    if live_drift is not None:
+        await live_drift.stop()
+        live_drift = None
+    if writer is not None:
+        await writer.stop()
+        writer = None
+    inference.shutdown()
+    if explain_executor is not inference:
+        explain_executor.shutdown()
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Jauges en mode live* (in-flight, files, caches, modèle actif) : ce worker quitte l'agrégat multiprocess
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(os.getpid())
 
 # ====== PREDICTION ET INSERTION DES DONNEES ======
 @app.post("/v1/predict")
 async def predict_logistic(data: LogistikData):
     try:
-        global model, model_type
-        input_dict = data.dict(by_alias=True)
-        predicted_class, message = make_prediction(model, model_type, input_dict)
+        current = serving
+        if current is None:
+            raise HTTPException(status_code=500, detail="Modèle non initialisé correctement")
+        # Validation pydantic faite par FastAPI avant l'appel : durée mesurée par le schéma
+        observe_stage("validation", current.model_type, current.version, data._validation_seconds)
+        with stage_timer("cache", current.model_type, current.version):
+            cache_key = make_cache_key(data, current.cache_version) if prediction_cache is not None else None
+            cached = prediction_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            predicted_class, message = cached
+        elif batcher is not None:
+            predicted_class, message = await inference.admit(batcher.submit((current, data)), settings.request_deadline_ms)
+        else:
+            deadline = deadline_after(settings.request_deadline_ms)
+            predictions = await inference.admit(inference.predict(current, [data], deadline=deadline), settings.request_deadline_ms)
+            predicted_class, message = predictions[0]
+        if cache_key is not None and cached is None:
+            prediction_cache.set(cache_key, (predicted_class, message))
+
+        responding = time.perf_counter()
+        global first_prediction_done
+        if not first_prediction_done:
+            first_prediction_done = True
+            first_prediction_gauge.set(time.time() - started_at)
 
-        logger.info("📢 Données insérées avec succès")
+        if live_drift is not None:
+            live_drift.observe(data, predicted_class)
 
-        return {
+        if writer is not None:
+            await writer.enqueue(data, logistik_mapping.get(predicted_class, "Unknown"))
+            logger.info("📢 Prédiction mise en file d'insertion")
+
+        response = {
             "Deliver Status": message,
             "Code": predicted_class,
             "Statut": "Success",
-            "Model Used": model_type
+            "Model Used": current.model_type
         }
+        observe_stage("response", current.model_type, current.version, time.perf_counter() - responding)
+        return response
 
+    except HTTPException:
+        raise
+    except Overloaded:
+        raise HTTPException(status_code=429, detail="Serveur saturé, réessayez plus tard", headers={"Retry-After": "1"})
+    except DeadlineExceeded:
+        raise HTTPException(status_code=503, detail="Échéance de la prédiction dépassée")
     except Exception as e:
         logger.error(f"Erreur de prédiction : {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Erreur de prédiction : {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erreur de prédiction : {str(e)}")
+    finally:
+        if profile_window is not None:
+            profile_window.request_done()
+
+# ====== PREDICTION PAR LOTS (JSON OU NDJSON) ======
+def parse_batch_body(body: bytes, content_type: str) -> tuple:
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="JSON invalide")
+    if "ndjson" in content_type or "jsonl" in content_type or not text.lstrip().startswith("["):
+        records, errors = [], []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                errors.append({"Index": len(records), "Detail": f"JSON invalide : {e.msg}"})
+                records.append(None)
+        return records, errors
+    try:
+        records = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"JSON invalide : {e.msg}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Le corps doit être une liste d'enregistrements")
+    return records, []
+
+@app.post("/v1/predict/batch")
+async def predict_logistic_batch(request: Request, chunk_size: Optional[int] = Query(None, ge=1)):
+    current = serving
+    if current is None:
+        raise HTTPException(status_code=500, detail="Modèle non initialisé correctement")
+    body = await request.body()
+    with stage_timer("parsing", current.model_type, current.version):
+        records, parse_errors = parse_batch_body(body, request.headers.get("content-type", ""))
+    with stage_timer("validation", current.model_type, current.version):
+        valid, validation_errors = validate_records(records)
+    invalid_lines = {e["Index"] for e in parse_errors}
+    errors = parse_errors + [e for e in validation_errors if e["Index"] not in invalid_lines]
+
+    try:
+        deadline = deadline_after(settings.batch_deadline_ms)
+        predictions = await inference.admit(
+            inference.predict(current, [item for _, item in valid], chunk_size or settings.batch_chunk_size, deadline),
+            settings.batch_deadline_ms,
+        )
+    except HTTPException:
+        raise
+    except Overloaded:
+        raise HTTPException(status_code=429, detail="Serveur saturé, réessayez plus tard", headers={"Retry-After": "1"})
+    except DeadlineExceeded:
+        raise HTTPException(status_code=503, detail="Échéance du lot dépassée")
+    except Exception as e:
+        logger.error(f"Erreur de prédiction par lots : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur de prédiction : {str(e)}")
+
+    responding = time.perf_counter()
+    results = [None] * len(records)
+    tracker = live_drift
+    for (index, item), (predicted_class, message) in zip(valid, predictions):
+        if tracker is not None:
+            tracker.observe(item, predicted_class)
+        results[index] = {"Index": index, "Deliver Status": message, "Code": predicted_class, "Statut": "Success"}
+    for error in errors:
+        results[error["Index"]] = {"Index": error["Index"], "Statut": "Error", "Detail": error["Detail"]}
+
+    logger.info(f"📦 Lot de {len(records)} enregistrements traité ({len(errors)} rejetés)")
+    observe_stage("response", current.model_type, current.version, time.perf_counter() - responding)
+    if profile_window is not None:
+        profile_window.request_done()
+    return {
+        "Statut": "Success",
+        "Model Used": current.model_type,
+        "Count": len(records),
+        "Errors": len(errors),
+        "Results": results
+    }
+
+# ====== EXPLICATION DES PREDICTIONS (TREESHAP) ======
+explainer_lock = threading.Lock()
+
+def explain_records(current: ServingModel, items: list) -> tuple:
+    # Explicateur construit une seule fois par modèle servi, à la première demande
+    with explainer_lock:
+        if current.explanations is None:
+            current.explanations = build_tree_explanations(current, settings.explain_grid_resolution, settings.explain_cache_max_entries)
+    predictions = current.predict_items(items, settings.batch_chunk_size)
+    return predictions, current.explanations.explain(items, settings.explain_budget_ms, settings.explain_top_k)
+
+@app.post("/v1/explain")
+async def explain_logistic(request: Request):
+    """
+    Prédiction et contributions TreeSHAP de chaque champ à la classe "Late", pour un enregistrement
+    (objet JSON) ou une liste d'enregistrements (au plus EXPLAIN_MAX_RECORDS).
+
+    "Method" vaut "exact", "cell" (centre de cellule, EXPLAIN_GRID_RESOLUTION > 0) ou "approximate"
+    (Saabas, budget EXPLAIN_BUDGET_MS épuisé) ; "Cached" indique une lecture du cache.
+    """
+    current = serving
+    if current is None:
+        raise HTTPException(status_code=500, detail="Modèle non initialisé correctement")
+    try:
+        payload = json.loads(await request.body())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="JSON invalide")
+    single = isinstance(payload, dict)
+    records = [payload] if single else payload
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Le corps doit être un enregistrement ou une liste d'enregistrements")
+    if len(records) > settings.explain_max_records:
+        raise HTTPException(status_code=413, detail=f"Au plus {settings.explain_max_records} enregistrements par requête")
+    with stage_timer("validation", current.model_type, current.version):
+        valid, errors = validate_records(records)
+    if single and errors:
+        raise HTTPException(status_code=422, detail=errors[0]["Detail"])
+
+    items = [item for _, item in valid]
+    try:
+        with stage_timer("explain", current.model_type, current.version):
+            # Tâche abandonnée sans calcul (ni construction de l'explicateur) si son échéance passe dans la file
+            timeout_ms = settings.request_deadline_ms if single else settings.batch_deadline_ms
+            task = explain_executor.execute(explain_records, current, items, deadline=deadline_after(timeout_ms))
+            predictions, explanations = await explain_executor.admit(task, timeout_ms)
+    except ExplanationUnavailable as e:
+        raise HTTPException(status_code=501, detail=f"Explications indisponibles pour ce modèle : {str(e)}")
+    except Overloaded:
+        raise HTTPException(status_code=429, detail="Serveur saturé, réessayez plus tard", headers={"Retry-After": "1"})
+    except DeadlineExceeded:
+        raise HTTPException(status_code=503, detail="Échéance de l'explication dépassée")
+    except Exception as e:
+        logger.error(f"Erreur d'explication : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur d'explication : {str(e)}")
+
+    results = [None] * len(records)
+    for (index, _), (predicted_class, message), explanation in zip(valid, predictions, explanations):
+        results[index] = {"Index": index, "Deliver Status": message, "Code": predicted_class, **explanation, "Statut": "Success"}
+    for error in errors:
+        results[error["Index"]] = {"Index": error["Index"], "Statut": "Error", "Detail": error["Detail"]}
+    if single:
+        result = results[0]
+        del result["Index"]
+        return {**result, "Model Used": current.model_type}
+    return {
+        "Statut": "Success",
+        "Model Used": current.model_type,
+        "Count": len(records),
+        "Errors": len(errors),
+        "Results": results
+    }
+
+# ====== PROFILAGE A LA DEMANDE (ADMIN) ======
+@app.post("/admin/profile", response_class=PlainTextResponse)
+async def profile_requests(
+    requests: Optional[int] = Query(None, ge=1),
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    Profile par échantillonnage les requêtes servies pendant la fenêtre : les `requests` prochaines
+    prédictions ou `seconds` secondes (plafonnées à PROFILE_MAX_SECONDS), au premier atteint.
+
+    Réponse au format replié (flamegraph.pl, speedscope). Désactivé tant qu'ADMIN_TOKEN n'est pas défini.
+    """
+    global profile_window
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
+    if profile_window is not None:
+        raise HTTPException(status_code=409, detail="Un profilage est déjà en cours")
+
+    window = ProfileWindow(SamplingProfiler(interval_ms / 1000.0), requests, min(seconds, settings.profile_max_seconds))
+    profile_window = window
+    try:
+        folded = await window.run()
+    finally:
+        profile_window = None
+    logger.info(f"🔬 Profilage : {window.profiler.samples} relevés, {window.requests} requêtes en {window.elapsed:.1f}s")
+    return PlainTextResponse(folded, headers={
+        "X-Profile-Samples": str(window.profiler.samples),
+        "X-Profile-Requests": str(window.requests),
+        "X-Profile-Seconds": f"{window.elapsed:.3f}",
+    })
@@ -1,19 +1,34 @@
 # Importation des bibliothèques nécessaires
+import time
 from train_pipeline.data_loader import load_and_encode_data
-from train_pipeline.preprocessing import get_preprocessor
-from train_pipeline.training import train_models
+from train_pipeline.orchestrator import train_all_families
+from train_pipeline.training import timed, cpu_seconds
 from train_pipeline.prediction import log_and_save_models
+from retrain.models_comparator import promote_candidates
 
 # Fonction principale pour exécuter le pipeline d'entraînement
 if __name__ == "__main__":
+    started, started_cpu = time.perf_counter(), cpu_seconds()
+
     # Chargement et encodage des données
-    x_train, x_test, y_train, y_test, supply = load_and_encode_data()
-    
-    # Prétraitement des données
-    preprocessor = get_preprocessor(supply)
+    x_train, x_test, y_train, y_test, supply = timed("Chargement", load_and_encode_data)
     
-    # Entraînement des modèles
-    best_models = train_models(x_train, y_train, preprocessor)
+    # Entraînement des familles de modèles en parallèle (TRAIN_FAMILIES, TRAIN_CPU_BUDGET)
+    best_models, report = train_all_families(x_train, y_train)
+    catboost_model = best_models.pop("catboost", None)
     
-    # Enregistrement des modèles dans MLflow et BentoML
-    log_and_save_models(best_models, x_test, y_test)
\ No newline at end of file
+    # Enregistrement des modèles dans le Registry MLflow (versions challengers)
+    registered = timed("Enregistrement", log_and_save_models, best_models, x_test, y_test)
+    if catboost_model is not None:
+        from catboost import Pool
+        from train_pipeline.catboost_ml import predict_log_save
+
+        cat_cols = x_test.select_dtypes(include=["object", "category"]).columns.tolist()
+        x_catboost = x_test.assign(**{col: x_test[col].astype(object).fillna('missing') for col in cat_cols})
+        version = predict_log_save(catboost_model, Pool(x_catboost, y_test, cat_features=cat_cols), y_test, model_name="catboost_delivery_status")
+        if version is not None:
+            registered["catboost_delivery_status"] = (catboost_model, version)
+
+    # Promotion des seuls challengers meilleurs que leur champion (objectif qualité/latence), puis BentoML
+    timed("Comparaison", promote_candidates, registered, x_test, y_test)
+    print(f"⏱️ Total : {time.perf_counter() - started:.1f}s (horloge), {cpu_seconds() - started_cpu:.1f}s (CPU)")
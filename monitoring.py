@@ -7,9 +7,25 @@ from dotenv import load_dotenv
 from prometheus_client import Counter
 from prometheus_client import Gauge, start_http_server
 
+from drift.engine import DriftEngine, quantile_edges
+from drift.streaming import DriftProfile, NumericSketch, WindowedMonitor, psi_from_counts
+from drift.sources import NDJSONTail, SequenceTableSource
+from retrain.data_collect import Watermark
+from train_pipeline.dataset import load_dataset
+
 # ====== CHARGEMENT DES PARAMETRES DEPUIS .env ======
 load_dotenv()
 dataset_path = os.getenv("TRAIN_DATASET_PATH")
+# Source incrémentale : "table" (logistic_chain, alimentée par l'API avec PERSIST_PREDICTIONS=true, lue par id
+# croissant via HOST, USER, PASSWORD et DATABASE) ou "ndjson" (journal de requêtes écrit par un outil externe)
+monitor_source = os.getenv("MONITOR_SOURCE", "table")
+monitor_log_path = os.getenv("MONITOR_LOG_PATH", "logs/requests.jsonl")
+monitor_id_column = os.getenv("MONITOR_ID_COLUMN", "id")
+# Dernier id de logistic_chain consommé, conservé entre deux redémarrages du monitoring
+monitor_state_path = os.getenv("MONITOR_STATE_PATH", "monitor_state.json")
+monitor_poll_seconds = float(os.getenv("MONITOR_POLL_SECONDS", "60"))
+monitor_pane_size = int(os.getenv("MONITOR_PANE_SIZE", "1000"))
+monitor_window_panes = int(os.getenv("MONITOR_WINDOW_PANES", "10"))
 
 # ====== DICTIONNAIRES DE METRIQUES ======
 null_rate_metrics = {}
@@ -18,27 +34,32 @@ psi_metrics = {}
 
 n_unique_metrics = {}
 top_category_freq_metrics = {}
+psi_tumbling_metrics = {}
 
 # ====== COMPTEUR D'ERREUR ======
 error_counter = Counter("monitoring_errors", "Nombre d’erreurs lors du monitoring")
+records_counter = Counter("monitoring_records", "Enregistrements consommés par le monitoring incrémental")
 
 # ====== FONCTION DE CALCUL L'INDICE DE STABILITE DE LA POPULATION ======
 def calculate_psi(expected, actual, buckets=10): 
-    def scale_range(series, bins) : 
-        return np.histogram(series.dropna(), bins=bins)[0]/len(series.dropna())
-    
-    expected_perc = scale_range(expected, buckets)
-    actual_perc = scale_range(actual, buckets)
+    # Mêmes intervalles des deux côtés : quantiles de la distribution attendue
+    edges = quantile_edges(pd.to_numeric(expected, errors="coerce").to_numpy(dtype=np.float64), buckets)
+    def scale_range(series) : 
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        return np.bincount(np.searchsorted(edges, values, side="right"), minlength=buckets)
     
-    # POur éviter les division par 0
-    psi_values = (expected_perc - actual_perc) * np.log((expected_perc + 1e-6)/(actual_perc + 1e-6))
-    return np.sum(psi_values)
+    return psi_from_counts(scale_range(expected), scale_range(actual))
 
 # ====== MONITORING LOOP ======
 def monitor_data(batch_df, baseline_df):
     numeric_cols = batch_df.select_dtypes(include=np.number).columns
     cat_cols = batch_df.select_dtypes(include='object').columns
     
+    # PSI de toutes les features numériques en un seul passage (bornes aux quantiles de la baseline)
+    engine = DriftEngine.from_baseline(baseline_df[numeric_cols], vocabularies={})
+    psi_values = engine.compare(batch_df[numeric_cols])["psi"]
+    
     # ====== FEATURES NUMERIQUES ======
     for col in numeric_cols: 
         # Crée les métriques si elles n'existent pas déjà
@@ -50,8 +71,8 @@ def monitor_data(batch_df, baseline_df):
         null_rate_metrics[col].set(batch_df[col].isnull().mean())
         mean_metrics[col].set(batch_df[col].mean())
         
-        if baseline[col].nunique() > 1 and batch_df[col].nunique() > 1:
-            psi = calculate_psi(baseline[col], batch_df[col])
+        if baseline_df[col].nunique() > 1 and batch_df[col].nunique() > 1:
+            psi = psi_values[col]
         else:
             psi = 0
         psi_metrics[col].set(psi)
@@ -74,18 +95,74 @@ def monitor_data(batch_df, baseline_df):
             top_freq = (batch_df[col]  == top_category).mean()
             top_category_freq_metrics[col].set(top_freq)
 
+# ====== MONITORING INCREMENTAL (FENETRES GLISSANTES ET FIXES) ======
+def gauge(store, prefix, col, description):
+    if col not in store:
+        store[col] = Gauge(f"{prefix}_{col}", description)
+    return store[col]
+
+def publish_window_metrics(monitor: WindowedMonitor):
+    # Fenêtre glissante pour les gauges historiques, dernier volet complet pour psi_tumbling_*
+    sliding = monitor.sliding()
+    psi = sliding.psi(monitor.baseline)
+    tumbling = monitor.tumbling.psi(monitor.baseline) if monitor.tumbling is not None else None
+    for col, sketch in sliding.sketches.items():
+        gauge(null_rate_metrics, "null_rate", col, f"Taux de valeurs nulles dans {col}").set(sketch.null_rate)
+        gauge(psi_metrics, "psi", col, f"PSI entre {col} et la baseline").set(psi[col])
+        if tumbling is not None:
+            gauge(psi_tumbling_metrics, "psi_tumbling", col, f"PSI du dernier volet complet pour {col}").set(tumbling[col])
+        if isinstance(sketch, NumericSketch):
+            gauge(mean_metrics, "mean", col, f"Moyenne de la feature {col}").set(sketch.mean)
+        else:
+            gauge(n_unique_metrics, "n_unique", col, f"Nombre de modalités unique pour {col}").set(sketch.n_unique)
+            gauge(top_category_freq_metrics, "top_category_freq", col, f"Fréquence de la modalité dominante pour {col}").set(sketch.top_frequency())
+
+def build_source(watermark=None):
+    if monitor_source == "table":
+        from app.schema import LogistikData
+        from app.database import LOGISTIC_CHAIN_COLUMNS, mysql_pool_factory
+
+        columns = {column: LogistikData.model_fields[column].alias for column in LOGISTIC_CHAIN_COLUMNS[:-1]}
+        last_id = watermark.load() if watermark is not None else 0
+        return SequenceTableSource(mysql_pool_factory(1, "routewise_monitoring"), columns, id_column=monitor_id_column, last_id=last_id)
+    return NDJSONTail(monitor_log_path)
+
+def drain(source, monitor: WindowedMonitor, page_size: int, watermark=None) -> int:
+    """
+    Consomme tout l'arriéré de la source par pages d'au plus page_size enregistrements.
+
+    La mémoire reste bornée par une page et les histogrammes de la fenêtre, quel que soit l'arriéré ;
+    le filigrane de la table avance après chaque page intégrée.
+
+    :return: Nombre d'enregistrements consommés.
+    """
+    consumed = 0
+    while True:
+        records = source.read(max_records=page_size)
+        if not records:
+            return consumed
+        monitor.update(records)
+        consumed += len(records)
+        records_counter.inc(len(records))
+        if watermark is not None and isinstance(source, SequenceTableSource):
+            watermark.save(source.last_id)
+
 if __name__ == "__main__" : 
     start_http_server(8001)
     print("✅ Monitoring Prometheus lancé sur  : 8001")
     
-    baseline = pd.read_excel(dataset_path)
+    # Baseline lue une seule fois : bornes des histogrammes et vocabulaires figés
+    monitor = WindowedMonitor(DriftProfile.from_baseline(load_dataset(dataset_path)), monitor_pane_size, monitor_window_panes)
+    watermark = Watermark(monitor_state_path)
+    source = build_source(watermark)
     
     while True: 
         try: 
-            batch = pd.read_excel(dataset_path)
-            monitor_data(batch, baseline)
-            print("✅ Batch analysé et metrics exposées")
-        except FileNotFoundError: 
+            consumed = drain(source, monitor, monitor_pane_size, watermark)
+            if consumed:
+                publish_window_metrics(monitor)
+                print(f"✅ {consumed} nouveaux enregistrements analysés et metrics exposées")
+        except Exception as e: 
             error_counter.inc()
-            print("⚠️ Fichier batch non trouvé, nouvelle tentative dans 1 min")
-        time.sleep(60)
\ No newline at end of file
+            print(f"⚠️ Lecture des nouveaux enregistrements impossible : {e}")
+        time.sleep(monitor_poll_seconds)
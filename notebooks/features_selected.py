@@ -1,4 +1,5 @@
 import os
+import sys
 import shap
 import eli5
 import logging
@@ -16,13 +17,16 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, RobustScaler, MinMaxScaler
 from sklearn.feature_selection import VarianceThreshold, RFE, chi2, SelectKBest
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from train_pipeline.dataset import load_dataset
+
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
 
 # Initialisation et chargement des données
 load_dotenv()
 data_path = os.getenv("DATASET_PATH")
-data = pd.read_excel(data_path)
+data = load_dataset(data_path)
 
 # Séparation features/target
 x = data.drop(columns=['Delivery_Status'])
@@ -32,8 +36,8 @@ y = LabelEncoder().fit_transform(data['Delivery_Status'])
 x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.2, random_state=42)
 
 # Colonnes numériques/catégorielles
-numeric_cols = x_train.select_dtypes(include=['int64', 'float64']).columns.tolist()
-categorical_cols = x_train.select_dtypes(include=['object']).columns.tolist()
+numeric_cols = x_train.select_dtypes(include=['number']).columns.tolist()
+categorical_cols = x_train.select_dtypes(include=['object', 'category']).columns.tolist()
 
 # Pipelines
 numeric_pipeline = Pipeline([
@@ -0,0 +1,273 @@
+# retrain/data_collect.py
+import os
+import json
+import time
+import logging
+import argparse
+import resource
+from datetime import datetime, timezone
+import pandas as pd
+
+from app.schema import LogistikData, numeric_bounds
+from app.predictor import logistik_mapping
+from app.database import LOGISTIC_CHAIN_COLUMNS
+from drift.sources import SequenceTableSource
+from train_pipeline.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Colonnes SQL de logistic_chain -> noms des features (alias de LogistikData) et de la cible.
+# La cible est le statut observé (RETRAIN_LABEL_COLUMN) : delivery_status, écrit par l'API, est la prédiction
+# du modèle servi, et l'apprendre reviendrait à entraîner le modèle sur ses propres sorties.
+RETRAIN_COLUMNS = {column: LogistikData.model_fields[column].alias for column in LOGISTIC_CHAIN_COLUMNS[:-1]}
+RETRAIN_COLUMNS[settings.RETRAIN_LABEL_COLUMN] = "Delivery_Status"
+LABEL_CODES = {label: code for code, label in logistik_mapping.items()}
+
+# ====== FILIGRANE (DERNIER ID TRAITE) ======
+class Watermark:
+    """
+    Dernier id de logistic_chain intégré à un modèle, conservé dans un fichier JSON.
+
+    Il n'avance qu'après un réentraînement réussi : un lot en échec est relu au passage suivant.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding="utf-8") as handle:
+            return int(json.load(handle).get("last_id", 0))
+
+    def save(self, last_id: int):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"last_id": int(last_id)}, handle)
+        os.replace(temporary, self.path)
+
+# ====== LECTURE DES NOUVELLES LIGNES ======
+def table_source(connection_factory, last_id=0, placeholder="%s", page_size=5000, table="logistic_chain", id_column="id"):
+    # Id conservé dans chaque enregistrement : collect_rows s'arrête avant la première ligne sans statut observé
+    columns = {id_column: "id", **RETRAIN_COLUMNS}
+    return SequenceTableSource(connection_factory, columns, table, id_column, last_id, placeholder, page_size)
+
+def collect_rows(source, max_records=None) -> pd.DataFrame:
+    """
+    Lignes ajoutées depuis le dernier id lu par la source, avec la cible observée encodée (0 / 1).
+
+    Une ligne sans statut observé (NULL) est une prédiction dont la livraison n'est pas encore connue :
+    la lecture s'arrête juste avant elle et la source y est repositionnée, le filigrane ne la dépasse
+    donc pas et elle sera relue une fois renseignée. Les statuts inexploitables ("Unknown") sont écartés.
+    """
+    start = source.last_id
+    frame = pd.DataFrame(source.read(max_records), columns=["id"] + list(RETRAIN_COLUMNS.values()))
+    pending = frame["Delivery_Status"].isna().to_numpy()
+    if pending.any():
+        first = int(pending.argmax())
+        source.last_id = int(frame["id"].iloc[first - 1]) if first else start
+        logger.info(f"⏸️ {len(frame) - first} lignes à partir de l'id {frame['id'].iloc[first]} en attente du statut observé")
+        frame = frame.iloc[:first]
+    frame = frame.drop(columns=["id"])
+    frame["Delivery_Status"] = frame["Delivery_Status"].map(LABEL_CODES)
+    # DECIMAL MySQL (objets Decimal) ou texte : les numériques sont convertis en float
+    for col in numeric_bounds():
+        frame[col] = pd.to_numeric(frame[col], errors="coerce").astype("float64")
+    labelled = frame.dropna(subset=["Delivery_Status"])
+    if len(labelled) < len(frame):
+        logger.info(f"⚠️ {len(frame) - len(labelled)} lignes au statut inexploitable ignorées")
+    return labelled.astype({"Delivery_Status": "int64"}).reset_index(drop=True)
+
+# ====== COLLECTE PAR BLOCS VERS PARQUET ======
+def arrow_schema(partition_column=None):
+    import pyarrow as pa
+
+    fields = [pa.field("id", pa.int64())]
+    for alias in RETRAIN_COLUMNS.values():
+        if alias in numeric_bounds():
+            fields.append(pa.field(alias, pa.float64()))
+        elif alias == "Delivery_Status":
+            fields.append(pa.field(alias, pa.string()))
+        else:
+            # Modalités répétées : encodage dictionnaire, relu en category par pandas
+            fields.append(pa.field(alias, pa.dictionary(pa.int32(), pa.string())))
+    if partition_column:
+        fields.append(pa.field(partition_column, pa.timestamp("us")))
+    return pa.schema(fields)
+
+class ChunkedCollector:
+    """
+    Copie les nouvelles lignes de logistic_chain en fichiers Parquet partitionnés par jour.
+
+    Pagination par clé (id > dernier id, LIMIT chunk_size) sur une seule connexion : avec le curseur
+    par défaut de mysql.connector (non bufferisé), les lignes arrivent du serveur au fil de la
+    lecture et la mémoire reste bornée par un bloc. Chaque bloc est converti directement en
+    table Arrow typée puis écrit dans root/day=AAAA-MM-JJ/part-<premier id>-<dernier id>.parquet,
+    et le filigrane avance après chaque fichier : une collecte interrompue reprend au bloc suivant.
+    Comme pour collect_rows, la copie s'arrête avant la première ligne sans statut observé : elle est
+    recopiée une fois renseignée, avec sa cible.
+
+    :param partition_column: Colonne horodatée de la table donnant le jour ; à défaut, jour de la collecte.
+    :param placeholder: Marqueur de paramètre du driver ("%s" pour MySQL, "?" pour SQLite).
+    """
+
+    def __init__(self, connection_factory, root, watermark: Watermark, chunk_size=10000, placeholder="%s",
+                 table="logistic_chain", id_column="id", partition_column=None):
+        self.connection_factory = connection_factory
+        self.root = root
+        self.watermark = watermark
+        self.chunk_size = chunk_size
+        self.partition_column = partition_column
+        self.schema = arrow_schema(partition_column)
+        columns = [id_column] + list(RETRAIN_COLUMNS) + ([partition_column] if partition_column else [])
+        self.label_position = columns.index(settings.RETRAIN_LABEL_COLUMN)
+        self.query = (
+            f"SELECT {', '.join(columns)} FROM {table} "
+            f"WHERE {id_column} > {placeholder} ORDER BY {id_column} LIMIT {int(chunk_size)}"
+        )
+
+    def stream(self, last_id=0):
+        # Blocs successifs de tuples, jamais plus de chunk_size lignes en mémoire
+        connection = self.connection_factory()
+        try:
+            cursor = connection.cursor()
+            try:
+                while True:
+                    cursor.execute(self.query, (last_id,))
+                    rows = cursor.fetchall()
+                    if not rows:
+                        break
+                    yield rows
+                    last_id = rows[-1][0]
+                    if len(rows) < self.chunk_size:
+                        break
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+
+    def to_arrow(self, rows):
+        import pyarrow as pa
+
+        arrays = []
+        for field, values in zip(self.schema, zip(*rows)):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                # DECIMAL MySQL et textes numériques convertis par Arrow
+                arrays.append(pa.array(values, from_pandas=True).cast(field.type))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def write(self, chunk) -> list:
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        if self.partition_column:
+            days = pc.strftime(chunk[self.partition_column], format="%Y-%m-%d")
+        else:
+            days = None
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        paths = []
+        for day in (pc.unique(days).to_pylist() if days is not None else [today]):
+            part = chunk.filter(pc.equal(days, day)) if days is not None else chunk
+            ids = part["id"]
+            directory = os.path.join(self.root, f"day={day}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{pc.min(ids).as_py():012d}-{pc.max(ids).as_py():012d}.parquet")
+            temporary = f"{path}.tmp"
+            pq.write_table(part, temporary)
+            os.replace(temporary, path)
+            paths.append(path)
+        return paths
+
+    def collect(self, max_rows=None) -> dict:
+        """
+        :return: Lignes, fichiers, durée, lignes par seconde et pic de mémoire résidente du processus
+            (ru_maxrss : tout le processus depuis son lancement, pas la seule collecte ; bench_collector
+            lance un processus neuf par mesure pour l'isoler).
+        """
+        started = time.perf_counter()
+        rows_read, files = 0, 0
+        for rows in self.stream(self.watermark.load()):
+            labels = [row[self.label_position] for row in rows]
+            held = None in labels
+            if held:
+                rows = rows[:labels.index(None)]
+            if rows:
+                files += len(self.write(self.to_arrow(rows)))
+                self.watermark.save(rows[-1][0])
+                rows_read += len(rows)
+            if held:
+                logger.info("⏸️ Collecte arrêtée avant une ligne sans statut observé")
+                break
+            if max_rows is not None and rows_read >= max_rows:
+                break
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": rows_read,
+            "files": files,
+            "seconds": elapsed,
+            "rows_per_second": rows_read / elapsed if elapsed else 0.0,
+            "process_peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+
+# ====== LECTURE PARESSEUSE DES PARTITIONS ======
+def collected_dataset(root):
+    import pyarrow.dataset as ds
+
+    return ds.dataset(root, format="parquet", partitioning="hive")
+
+def iter_collected(root, columns=None, since=None, batch_size=65536):
+    """
+    Parcourt les lignes collectées par lots de DataFrames, sans charger les partitions en entier.
+
+    :param since: Premier jour lu ("AAAA-MM-JJ") ; les partitions antérieures ne sont pas ouvertes.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = collected_dataset(root)
+    condition = ds.field("day") >= since if since else None
+    for batch in dataset.to_batches(columns=columns, filter=condition, batch_size=batch_size):
+        yield batch.to_pandas()
+
+def load_collected(root, columns=None, since=None) -> pd.DataFrame:
+    import pyarrow.dataset as ds
+
+    condition = ds.field("day") >= since if since else None
+    return collected_dataset(root).to_table(columns=columns, filter=condition).to_pandas()
+
+def collected_training_rows(root, since=None, batch_size=65536) -> pd.DataFrame:
+    """
+    Lignes collectées prêtes pour l'entraînement : features et Delivery_Status encodée (0 / 1), comme le dataset DVC.
+
+    Lecture lot par lot (iter_collected) ; les statuts inexploitables sont écartés avant l'assemblage.
+    """
+    columns = list(RETRAIN_COLUMNS.values())
+    parts = []
+    for batch in iter_collected(root, columns=columns, since=since, batch_size=batch_size):
+        batch["Delivery_Status"] = batch["Delivery_Status"].map(LABEL_CODES)
+        parts.append(batch.dropna(subset=["Delivery_Status"]))
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    # Modalités en texte : le vocabulaire est recalculé avec celui du dataset DVC (optimize_dtypes)
+    frame = pd.concat(parts, ignore_index=True).astype({"Delivery_Status": "int64"})
+    return frame.astype({col: object for col in frame.select_dtypes(include="category").columns})
+
+if __name__ == "__main__":
+    from app.database import mysql_pool_factory
+    from train_pipeline.config import settings
+
+    parser = argparse.ArgumentParser(description="Collecte des nouvelles lignes de logistic_chain en Parquet")
+    parser.add_argument("--max-rows", type=int, default=None)
+    args = parser.parse_args()
+
+    collector = ChunkedCollector(
+        mysql_pool_factory(1, "routewise_collect"),
+        settings.COLLECT_DIR,
+        Watermark(settings.COLLECT_STATE_PATH),
+        settings.COLLECT_CHUNK_SIZE,
+        partition_column=settings.COLLECT_PARTITION_COLUMN,
+    )
+    print(json.dumps(collector.collect(args.max_rows), indent=2))
+    print("ℹ️ process_peak_rss_mb : pic de tout ce processus (ru_maxrss), pas de la seule collecte ; "
+          "make bench_collector mesure chaque taille de bloc dans un processus neuf")
@@ -0,0 +1,204 @@
+# retrain/models_comparator.py
+import os
+import time
+import logging
+import joblib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.pipeline import Pipeline
+from sklearn.metrics import accuracy_score, f1_score, recall_score
+from train_pipeline.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ====== JEU DE TEST ENCODE UNE SEULE FOIS ======
+def is_catboost(model) -> bool:
+    return type(model).__name__ == "CatBoostClassifier"
+
+def model_input(frame: pd.DataFrame, model) -> pd.DataFrame:
+    # CatBoost attend ses colonnes catégorielles en object, sans valeur manquante
+    if not is_catboost(model):
+        return frame
+    cat_cols = frame.select_dtypes(include=["object", "category"]).columns.tolist()
+    return frame.assign(**{col: frame[col].astype(object).fillna('missing') for col in cat_cols})
+
+class HoldoutCache:
+    """
+    Jeu de test partagé par tous les modèles comparés.
+
+    Les Pipelines dont le préprocesseur ajusté est identique (même empreinte joblib) réutilisent
+    la même matrice encodée ; seul le classifieur est appliqué pour chacun.
+    """
+
+    def __init__(self, x_test: pd.DataFrame):
+        self.x_test = x_test.reset_index(drop=True)
+        self.encoded = {}
+        self.frames = {}
+
+    def raw(self, model) -> pd.DataFrame:
+        key = "catboost" if is_catboost(model) else "raw"
+        if key not in self.frames:
+            self.frames[key] = model_input(self.x_test, model)
+        return self.frames[key]
+
+    def encode(self, model):
+        # Entrée du classifieur : matrice encodée pour un Pipeline, jeu brut sinon
+        if not isinstance(model, Pipeline):
+            return self.raw(model)
+        preprocessing = model.named_steps["preprocessing"]
+        fingerprint = joblib.hash(preprocessing)
+        if fingerprint not in self.encoded:
+            self.encoded[fingerprint] = preprocessing.transform(self.x_test)
+        return self.encoded[fingerprint]
+
+    def predict(self, model) -> np.ndarray:
+        predictor = model.named_steps["classifier"] if isinstance(model, Pipeline) else model
+        return np.ravel(predictor.predict(self.encode(model)))
+
+# ====== QUALITE ET LATENCE ======
+def quality_scores(y_test, y_pred) -> dict:
+    return {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "f1": f1_score(y_test, y_pred, average="weighted", zero_division=0),
+        "recall": recall_score(y_test, y_pred, average="weighted", zero_division=0),
+    }
+
+def latency_scores(model, frame: pd.DataFrame, samples=200, batch_size=256, repeats=20) -> dict:
+    """
+    Latences du modèle complet (prétraitement compris), telles que vues par l'API.
+
+    :return: p50/p99 en millisecondes d'une prédiction sur une ligne et sur un lot de batch_size lignes.
+    """
+    rng = np.random.default_rng(settings.RANDOM_STATE)
+    rows = [frame.iloc[[i]] for i in rng.integers(0, len(frame), size=samples)]
+    batch = frame.iloc[:batch_size]
+    model.predict(rows[0])
+
+    def timings(inputs):
+        elapsed = []
+        for item in inputs:
+            started = time.perf_counter()
+            model.predict(item)
+            elapsed.append((time.perf_counter() - started) * 1000)
+        return np.percentile(elapsed, [50, 99])
+
+    single_p50, single_p99 = timings(rows)
+    batch_p50, batch_p99 = timings([batch] * repeats)
+    return {
+        "single_p50_ms": single_p50, "single_p99_ms": single_p99,
+        "batch_p50_ms": batch_p50, "batch_p99_ms": batch_p99, "batch_size": len(batch),
+    }
+
+def compare_models(models: dict, x_test: pd.DataFrame, y_test, max_workers=None) -> pd.DataFrame:
+    """
+    Évalue champion et challengers sur le même jeu de test.
+
+    Les prédictions de qualité tournent en parallèle (threads, jeu encodé partagé) ; les latences
+    sont mesurées ensuite, un modèle à la fois, pour que les mesures ne se perturbent pas.
+
+    :param models: {libellé: modèle ajusté}.
+    :return: Une ligne par modèle : accuracy, f1, recall et latences p50/p99.
+    """
+    cache, y_test = HoldoutCache(x_test), np.ravel(y_test)
+    # Encodages calculés avant le parallélisme : chaque empreinte n'est transformée qu'une fois
+    for model in models.values():
+        cache.encode(model)
+
+    workers = max_workers or min(len(models), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        predictions = dict(zip(models, executor.map(cache.predict, models.values())))
+
+    report = {}
+    for name, model in models.items():
+        report[name] = {
+            **quality_scores(y_test, predictions[name]),
+            **latency_scores(model, cache.raw(model), settings.COMPARATOR_LATENCY_SAMPLES, settings.COMPARATOR_BATCH_SIZE),
+        }
+    return pd.DataFrame.from_dict(report, orient="index")
+
+# ====== OBJECTIF DE PROMOTION ======
+def wins(candidate: dict, champion: dict = None) -> bool:
+    """
+    Objectif qualité/latence : le challenger doit dépasser le champion de plus de PROMOTION_MIN_GAIN
+    sur PROMOTION_METRIC, sans que sa latence p99 sur une ligne dépasse PROMOTION_MAX_LATENCY_RATIO
+    fois celle du champion, ni PROMOTION_LATENCY_BUDGET_MS (0 = pas de plafond absolu).
+    """
+    budget = settings.PROMOTION_LATENCY_BUDGET_MS
+    if budget and candidate["single_p99_ms"] > budget:
+        return False
+    if champion is None:
+        return True
+    metric = settings.PROMOTION_METRIC
+    if candidate[metric] - champion[metric] <= settings.PROMOTION_MIN_GAIN:
+        return False
+    return candidate["single_p99_ms"] <= champion["single_p99_ms"] * settings.PROMOTION_MAX_LATENCY_RATIO
+
+# ====== CHAMPION / CHALLENGER DANS LE REGISTRY ======
+def load_champion(name, candidate):
+    # Version Production courante, dans la même saveur que le challenger ; None au premier déploiement
+    import mlflow
+
+    flavor = mlflow.catboost if is_catboost(candidate) else mlflow.sklearn
+    try:
+        return flavor.load_model(f"models:/{name}/Production")
+    except Exception as e:
+        logger.info(f"ℹ️ Pas de champion en Production pour {name} : {e}")
+        return None
+
+def save_to_bentoml(name, model):
+    # Secours BentoML de l'API (tag "nom:latest") : seules les versions promues y sont publiées
+    import bentoml
+
+    if is_catboost(model):
+        bentoml.catboost.save_model(name, model)
+    else:
+        bentoml.sklearn.save_model(name, model)
+    print(f"💾 Modèle {name} promu sauvegardé avec BentoML.")
+
+def promote_candidates(registered: dict, x_test: pd.DataFrame, y_test) -> dict:
+    """
+    Compare chaque version enregistrée au champion en Production de son nom, puis promeut les gagnants
+    (Registry MLflow, puis BentoML).
+
+    :param registered: {nom du Registry: (modèle, version)}, tel que renvoyé par log_and_save_models.
+    :return: {nom: {"promoted": bool, "champion": scores ou None, "challenger": scores}}.
+    """
+    import mlflow
+
+    if not registered:
+        return {}
+    if settings.MLFLOW_TRACKING_URI:
+        mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
+    client = mlflow.tracking.MlflowClient()
+
+    models = {}
+    for name, (model, _) in registered.items():
+        models[f"{name}:challenger"] = model
+        champion = load_champion(name, model)
+        if champion is not None:
+            models[f"{name}:champion"] = champion
+    scores = compare_models(models, x_test, y_test)
+    print(scores.round(4).to_string())
+
+    decisions = {}
+    for name, (_, version) in registered.items():
+        challenger = scores.loc[f"{name}:challenger"].to_dict()
+        champion = scores.loc[f"{name}:champion"].to_dict() if f"{name}:champion" in scores.index else None
+        run_id = client.get_model_version(name, version).run_id
+        if run_id:
+            for key in ("single_p50_ms", "single_p99_ms", "batch_p50_ms", "batch_p99_ms"):
+                client.log_metric(run_id, key, challenger[key])
+
+        promoted = wins(challenger, champion)
+        if promoted:
+            client.transition_model_version_stage(name=name, version=version, stage="Production", archive_existing_versions=True)
+            print(f"🎯 {name} v{version} promu en Production dans le Model Registry.")
+            try:
+                save_to_bentoml(name, registered[name][0])
+            except Exception as e:
+                print(f"⚠️ Sauvegarde BentoML de {name} impossible : {e}")
+        else:
+            print(f"🛑 {name} v{version} non promu : le champion reste en Production.")
+        decisions[name] = {"promoted": promoted, "champion": champion, "challenger": challenger}
+    return decisions
@@ -0,0 +1,78 @@
+# retrain/retraining.py
+import logging
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from category_encoders import CatBoostEncoder
+
+logger = logging.getLogger(__name__)
+
+# ====== STATISTIQUES DES ENCODEURS ======
+def update_target_encoder(encoder: CatBoostEncoder, X: pd.DataFrame, y):
+    """
+    Ajoute les sommes et effectifs de nouvelles lignes aux statistiques d'un CatBoostEncoder ajusté.
+
+    Le résultat est celui d'un ajustement sur les anciennes et les nouvelles lignes réunies.
+    """
+    y = pd.Series(np.asarray(y, dtype=np.float64), index=X.index)
+    seen = next(iter(encoder.mapping.values()))["count"].sum()
+    encoder._mean = (encoder._mean * seen + y.sum()) / (seen + len(y))
+    for col, colmap in encoder.mapping.items():
+        stats = y.groupby(X[col]).agg(["sum", "count"])
+        encoder.mapping[col] = colmap.add(stats, fill_value=0)
+
+def update_pipeline_encoders(pipeline: Pipeline, X: pd.DataFrame, y):
+    # CatBoostEncoder de chaque branche du ColumnTransformer, après les étapes qui le précèdent
+    preprocessor = pipeline.named_steps["preprocessing"]
+    for _, transformer, columns in preprocessor.transformers_:
+        if not isinstance(transformer, Pipeline):
+            continue
+        for position, (_, step) in enumerate(transformer.steps):
+            if isinstance(step, CatBoostEncoder):
+                values = transformer[:position].transform(X[columns]) if position else X[columns]
+                update_target_encoder(step, pd.DataFrame(values, columns=step.cols, index=X.index), y)
+
+# ====== DEMARRAGE A CHAUD DES MODELES ======
+def warm_start_model(model, X: pd.DataFrame, y, extra_trees=50, extra_iterations=100, cat_features=None):
+    """
+    Poursuit l'entraînement d'un modèle sur les seules nouvelles lignes.
+
+    RandomForest : extra_trees arbres ajoutés (warm_start). CatBoost : extra_iterations
+    itérations à partir du modèle courant (init_model). Estimateurs à partial_fit : un passage.
+    Les autres (LogisticRegression liblinear) restent inchangés jusqu'au prochain réentraînement complet.
+
+    :return: (modèle, méthode utilisée)
+    """
+    y = np.asarray(y)
+    if type(model).__name__ == "CatBoostClassifier":
+        from catboost import CatBoostClassifier, Pool
+
+        params = dict(model.get_params(), iterations=extra_iterations)
+        params.pop("cat_features", None)
+        if cat_features is None:
+            cat_features = model.get_cat_feature_indices()
+        continued = CatBoostClassifier(**params)
+        continued.fit(Pool(X, y, cat_features=cat_features), init_model=model)
+        return continued, "init_model"
+
+    if not isinstance(model, Pipeline):
+        return model, "unchanged"
+    classifier = model.named_steps["classifier"]
+    if hasattr(classifier, "warm_start") and hasattr(classifier, "estimators_"):
+        # Des arbres entraînés sur une seule classe ne seraient pas cohérents avec la forêt
+        method = "warm_start" if set(np.unique(y)) == set(classifier.classes_) else "unchanged"
+    else:
+        method = "partial_fit" if hasattr(classifier, "partial_fit") else "unchanged"
+    if method == "unchanged":
+        return model, method
+
+    # Encodeurs mis à jour seulement si le classifieur apprend aussi des nouvelles lignes
+    update_pipeline_encoders(model, X, y)
+    Xt = model.named_steps["preprocessing"].transform(X)
+    if method == "warm_start":
+        classifier.set_params(warm_start=True, n_estimators=len(classifier.estimators_) + extra_trees)
+        classifier.fit(Xt, y)
+        classifier.set_params(warm_start=False)
+    else:
+        classifier.partial_fit(Xt, y)
+    return model, method
@@ -0,0 +1,82 @@
+# retrain/retraining_task.py
+import time
+import logging
+import pandas as pd
+
+from drift.engine import DriftEngine
+from retrain.data_collect import collect_rows
+from retrain.retraining import warm_start_model
+
+logger = logging.getLogger(__name__)
+
+class RetrainingTask:
+    """
+    Entraînement continu : lignes ajoutées depuis le filigrane, puis mise à jour incrémentale ou complète.
+
+    Sous min_rows nouvelles lignes, rien n'est fait (le filigrane reste en place). Si le PSI maximal
+    des nouvelles lignes face à la baseline dépasse psi_threshold, full_refit(nouvelles lignes)
+    produit de nouveaux modèles et les nouvelles lignes rejoignent la baseline ; sinon chaque
+    modèle est poursuivi à chaud (warm_start_model).
+
+    :param source: Source à clé croissante (retrain.data_collect.table_source), positionnée sur le filigrane.
+    :param models: {famille: modèle ajusté}.
+    :param baseline: Données d'entraînement des modèles courants (features + Delivery_Status).
+    :param full_refit: Callable(nouvelles lignes) -> {famille: modèle}.
+    :param on_update: Callable(modèles, mode) appelé avant l'avancée du filigrane (enregistrement).
+    """
+
+    def __init__(self, source, watermark, models: dict, baseline: pd.DataFrame, full_refit, on_update=None,
+                 min_rows=500, psi_threshold=0.2, extra_trees=50, extra_iterations=100):
+        self.source = source
+        self.watermark = watermark
+        self.models = models
+        self.full_refit = full_refit
+        self.on_update = on_update
+        self.min_rows = min_rows
+        self.psi_threshold = psi_threshold
+        self.extra_trees = extra_trees
+        self.extra_iterations = extra_iterations
+        self.set_baseline(baseline)
+        self.pending = []
+
+    def set_baseline(self, baseline: pd.DataFrame):
+        self.baseline = baseline
+        self.engine = DriftEngine.from_baseline(baseline)
+
+    def run_once(self) -> dict:
+        started = time.perf_counter()
+        batch = collect_rows(self.source)
+        if len(batch):
+            self.pending.append(batch)
+        rows = pd.concat(self.pending, ignore_index=True) if self.pending else batch
+        if len(rows) < self.min_rows:
+            # Lignes gardées en mémoire jusqu'à atteindre min_rows ; le filigrane n'avance pas
+            return {"mode": "skipped", "rows": len(rows)}
+
+        psi = float(self.engine.compare(rows)["psi"].max())
+        if psi >= self.psi_threshold:
+            logger.info(f"🔁 PSI {psi:.3f} ≥ {self.psi_threshold} : réentraînement complet")
+            self.models = self.full_refit(rows)
+            self.set_baseline(pd.concat([self.baseline, rows], ignore_index=True))
+            mode, methods = "full", {name: "full" for name in self.models}
+        else:
+            mode, methods = "incremental", {}
+            x, y = rows.drop(columns=["Delivery_Status"]), rows["Delivery_Status"].to_numpy()
+            for name, model in self.models.items():
+                self.models[name], methods[name] = warm_start_model(model, x, y, self.extra_trees, self.extra_iterations)
+            logger.info(f"♻️ Mise à jour incrémentale sur {len(rows)} lignes : {methods}")
+
+        if self.on_update is not None:
+            self.on_update(self.models, mode)
+        self.watermark.save(self.source.last_id)
+        self.pending = []
+        return {"mode": mode, "rows": len(rows), "psi": psi, "methods": methods, "seconds": time.perf_counter() - started}
+
+    def run_forever(self, interval_seconds: float):
+        while True:
+            try:
+                summary = self.run_once()
+                logger.info(f"✅ Entraînement continu : {summary}")
+            except Exception as e:
+                logger.error(f"❌ Erreur d'entraînement continu : {e}")
+            time.sleep(interval_seconds)
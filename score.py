@@ -0,0 +1,244 @@
+# Scoring hors ligne : fichier CSV, Parquet ou Excel lu par blocs, prédit par un pool de processus, écrit en Parquet
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from app.config import Settings
+from app.model_loader import load_model_from_uri
+from app.predictor import logistik_mapping
+from app.schema import LogistikData, categorical_fields, numeric_bounds
+
+settings = Settings()
+
+# ====== LECTURE PAR BLOCS ======
+def iter_chunks(path, chunk_size):
+    """
+    Lit le fichier bloc par bloc, sans jamais le charger en entier.
+
+    :return: Générateur de DataFrames d'au plus chunk_size lignes.
+    """
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif extension in (".xlsx", ".xlsm"):
+        # openpyxl en lecture seule : les lignes de la feuille sont parcourues en flux
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(name) for name in next(rows)]
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield pd.DataFrame(chunk, columns=header)
+                    chunk = []
+            if chunk:
+                yield pd.DataFrame(chunk, columns=header)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Format d'entrée non pris en charge : {extension}")
+
+# ====== VALIDATION VECTORISEE ======
+def validate_chunk(frame: pd.DataFrame) -> tuple:
+    """
+    Applique les contraintes de LogistikData à tout le bloc en une passe par colonne.
+
+    :return: (lignes valides aux types du schéma, Series des motifs de rejet indexée par ligne)
+    """
+    aliases = [field.alias for field in LogistikData.model_fields.values()]
+    missing = [alias for alias in aliases if alias not in frame]
+    if missing:
+        raise ValueError(f"Colonnes absentes du fichier : {missing}")
+
+    reasons = pd.Series(None, index=frame.index, dtype=object)
+    valid = pd.DataFrame(index=frame.index)
+    for alias, (low, high) in numeric_bounds().items():
+        values = pd.to_numeric(frame[alias], errors="coerce").astype(np.float64)
+        bad = ~((values >= low) & (values < high))
+        reasons[bad & reasons.isna()] = f"{alias} hors de [{low}, {high})"
+        valid[alias] = values
+    for alias, enum in categorical_fields().items():
+        values = frame[alias].astype(object)
+        bad = ~values.isin([member.value for member in enum])
+        reasons[bad & reasons.isna()] = f"{alias} inconnu"
+        valid[alias] = values
+    keep = reasons.isna()
+    return valid.loc[keep, aliases], reasons[~keep]
+
+# ====== POOL DE PROCESSUS (UN CHARGEMENT DE MODELE PAR WORKER) ======
+_model = None
+
+def init_worker(model_uri, tracking_uri=None):
+    global _model
+    _model, _ = load_model_from_uri(model_uri, tracking_uri)
+
+def score_chunk(frame: pd.DataFrame) -> np.ndarray:
+    # Seules les classes reviennent au processus principal (int8), pas le bloc
+    if frame.empty:
+        return np.empty(0, dtype=np.int8)
+    return np.asarray(_model.predict(frame)).ravel().astype(np.int8)
+
+# ====== ECRITURE PARQUET INCREMENTALE ======
+def scored_schema(id_columns=()):
+    """
+    Schéma de sortie fixé d'après LogistikData : un premier bloc vide ou entièrement rejeté
+    (colonnes texte de type null pour Arrow) ne peut pas figer de mauvais types.
+    """
+    import pyarrow as pa
+
+    numeric = numeric_bounds()
+    fields = [pa.field("Row", pa.int64())] + [pa.field(column, pa.string()) for column in id_columns]
+    for field in LogistikData.model_fields.values():
+        fields.append(pa.field(field.alias, pa.float64() if field.alias in numeric else pa.string()))
+    fields += [pa.field("Code", pa.int8()), pa.field("Delivery_Status", pa.string())]
+    return pa.schema(fields)
+
+def rejects_schema():
+    import pyarrow as pa
+
+    return pa.schema([pa.field("Row", pa.int64()), pa.field("Reason", pa.string())])
+
+class ParquetSink:
+    # Un groupe de lignes par bloc, au schéma imposé ; fichier temporaire renommé à la fermeture, supprimé en cas d'erreur
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self.temporary = f"{path}.{os.getpid()}.tmp"
+        self.writer = None
+
+    def _open(self):
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.writer = pq.ParquetWriter(self.temporary, self.schema, compression="zstd")
+        return self.writer
+
+    def write(self, frame: pd.DataFrame):
+        import pyarrow as pa
+
+        self._open().write_table(pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        # Fichier écrit même sans ligne : les lecteurs trouvent toujours le schéma attendu
+        self._open().close()
+        os.replace(self.temporary, self.path)
+
+    def abort(self):
+        if self.writer is not None:
+            self.writer.close()
+        if os.path.exists(self.temporary):
+            os.remove(self.temporary)
+
+def scored_frame(valid: pd.DataFrame, codes: np.ndarray, id_columns, source: pd.DataFrame) -> pd.DataFrame:
+    frame = valid.assign(
+        Row=valid.index.to_numpy(dtype=np.int64),
+        Code=codes,
+        Delivery_Status=pd.Series(codes, index=valid.index).map(logistik_mapping).fillna("Unknown"),
+    )
+    for column in id_columns:
+        frame[column] = source.loc[valid.index, column].astype(str)
+    return frame[["Row", *id_columns, *valid.columns, "Code", "Delivery_Status"]]
+
+# ====== SCORING ======
+def score_file(input_path, output_path, model_uri, chunk_size=50000, workers=None, id_columns=(), rejects_path=None, tracking_uri=None) -> dict:
+    """
+    Score un fichier complet avec au plus 2 blocs en vol par worker : la mémoire reste bornée.
+
+    Les blocs sont écrits dans l'ordre de lecture ; la colonne Row garde le numéro de ligne d'origine.
+
+    :param workers: Processus de scoring ; 1 = dans le processus courant, sans pool.
+    :param id_columns: Colonnes de l'entrée recopiées telles quelles (identifiants d'expédition).
+    :param rejects_path: Parquet des lignes rejetées (Row, Reason) ; facultatif.
+    :return: Statistiques : lignes lues, scorées, rejetées, durée, lignes/s et pic de mémoire.
+    """
+    workers = workers or os.cpu_count() or 1
+    id_columns = list(id_columns)
+    sink = ParquetSink(output_path, scored_schema(id_columns))
+    rejects = ParquetSink(rejects_path, rejects_schema()) if rejects_path else None
+    stats = {"rows": 0, "scored": 0, "rejected": 0, "chunks": 0, "workers": workers}
+    started = time.perf_counter()
+
+    def consume(offset, chunk, valid, reasons, codes):
+        sink.write(scored_frame(valid, codes, id_columns, chunk))
+        if rejects is not None and len(reasons):
+            rejects.write(pd.DataFrame({"Row": reasons.index.to_numpy(dtype=np.int64), "Reason": reasons.to_numpy()}))
+        stats["scored"] += len(valid)
+        stats["rejected"] += len(reasons)
+        print(f"📦 Bloc {stats['chunks']} (lignes {offset}+) : {len(valid)} scorées, {len(reasons)} rejetées")
+
+    def numbered_chunks():
+        offset = 0
+        for chunk in iter_chunks(input_path, chunk_size):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            valid, reasons = validate_chunk(chunk)
+            stats["rows"] += len(chunk)
+            stats["chunks"] += 1
+            yield offset, chunk, valid, reasons
+            offset += len(chunk)
+
+    try:
+        if workers == 1:
+            init_worker(model_uri, tracking_uri)
+            for offset, chunk, valid, reasons in numbered_chunks():
+                consume(offset, chunk, valid, reasons, score_chunk(valid))
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(model_uri, tracking_uri)) as executor:
+                pending = []
+                for item in numbered_chunks():
+                    pending.append((item, executor.submit(score_chunk, item[2])))
+                    # File bornée : le plus ancien bloc est écrit avant d'en lire d'autres
+                    while len(pending) >= 2 * workers:
+                        item, future = pending.pop(0)
+                        consume(*item, future.result())
+                for item, future in pending:
+                    consume(*item, future.result())
+    except BaseException:
+        # Pas de sortie partielle présentée comme complète, ni de fichier temporaire laissé derrière
+        sink.abort()
+        if rejects is not None:
+            rejects.abort()
+        raise
+    sink.close()
+    if rejects is not None:
+        rejects.close()
+
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    # ru_maxrss en Ko sous Linux : processus principal et plus gros worker
+    stats["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    stats["worker_peak_rss_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scoring hors ligne de fichiers d'expéditions")
+    parser.add_argument("--input", required=True, help="Fichier CSV, Parquet ou Excel")
+    parser.add_argument("--output", required=True, help="Fichier Parquet des prédictions")
+    parser.add_argument("--model", default=settings.shared_model_dir or settings.mlflow, help="URI MLflow, fichier joblib ou dossier SHARED_MODEL_DIR")
+    parser.add_argument("--chunk-size", type=int, default=settings.score_chunk_size)
+    parser.add_argument("--workers", type=int, default=settings.score_workers or None)
+    parser.add_argument("--id-columns", nargs="*", default=[])
+    parser.add_argument("--rejects", default=None, help="Parquet des lignes rejetées")
+    args = parser.parse_args()
+    if not args.model:
+        sys.exit("❌ Aucun modèle : --model, SHARED_MODEL_DIR ou MLFLOW_MODEL")
+
+    stats = score_file(args.input, args.output, args.model, args.chunk_size, args.workers, args.id_columns, args.rejects, settings.mlflow_tracking_uri)
+    print(json.dumps(stats, indent=2))
+    print(f"✅ {stats['scored']} lignes scorées ({stats['rejected']} rejetées) à {stats['rows_per_second']:.0f} lignes/s")
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import httpx
+import pytest
+import numpy as np
+
+import main
+from app.admission import InferenceExecutor, Overloaded, DeadlineExceeded, deadline_after
+from app.hot_reload import ServingModel
+from app.schema import LogistikData, sample_records
+from benchmarks.common import build_standin_model
+
+class SlowModel:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def predict(self, df):
+        time.sleep(self.seconds)
+        return np.zeros(len(df), dtype=np.int64)
+
+def test_admission_rejects_overload_and_sheds_expired_tasks():
+    release, ran = threading.Event(), []
+
+    async def scenario():
+        executor = InferenceExecutor("thread", workers=1, max_in_flight=2)
+        blocking = asyncio.create_task(executor.admit(executor.execute(release.wait)))
+        queued = asyncio.create_task(executor.admit(executor.execute(ran.append, "late", deadline=deadline_after(20)), 20))
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded):
+            await executor.admit(executor.execute(ran.append, "rejected"))
+        with pytest.raises(DeadlineExceeded):
+            await queued
+        release.set()
+        await blocking
+        await asyncio.sleep(0.01)
+        return executor
+
+    executor = asyncio.run(scenario())
+    assert ran == [] and executor.in_flight == 0 and executor.pending == 0
+
+def test_predict_endpoint_answers_429_and_503_instead_of_queueing(monkeypatch):
+    for name in ("prediction_cache", "batcher", "live_drift", "writer"):
+        monkeypatch.setattr(main, name, None)
+    monkeypatch.setattr(main, "inference", InferenceExecutor("thread", workers=1, max_in_flight=1))
+    monkeypatch.setattr(main.settings, "request_deadline_ms", 100)
+    main.activate_model(SlowModel(0.3), "Local", version="slow")
+    payload = sample_records(1)[0]
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(client.post("/v1/predict", json=payload), client.post("/v1/predict", json=payload))
+
+    slow, rejected = asyncio.run(scenario())
+    assert (slow.status_code, rejected.status_code) == (503, 429)
+    assert rejected.headers["Retry-After"] == "1"
+
+def test_process_pool_predicts_with_the_bound_model():
+    model = build_standin_model("logistic", n_rows=300)
+    items = [LogistikData.model_validate(record) for record in sample_records(5)]
+    expected = ServingModel(model, "Local", "v1").predict_items(items)
+
+    async def scenario():
+        executor = InferenceExecutor("process", workers=1, max_in_flight=4)
+        executor.bind(ServingModel(model, "Local", "v1"))
+        try:
+            return await executor.admit(executor.predict(None, items), 60000)
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(scenario()) == expected
+
+def test_timed_out_work_still_running_blocks_admission():
+    release = threading.Event()
+
+    async def scenario():
+        executor = InferenceExecutor("thread", workers=2, max_in_flight=2)
+        try:
+            for _ in range(2):
+                with pytest.raises(DeadlineExceeded):
+                    await executor.admit(executor.execute(release.wait), 20)
+            assert executor.in_flight == 0 and executor.pending == 2
+            with pytest.raises(Overloaded):
+                await executor.admit(executor.execute(release.wait))
+        finally:
+            release.set()
+        while executor.pending:
+            await asyncio.sleep(0.01)
+        return await executor.admit(executor.execute(len, "ok"))
+
+    assert asyncio.run(scenario()) == 2
@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import main
+from app.predictor import make_batch_prediction
+
+valid_payload = {
+    "Transportation_Cost": 1500,
+    "Distance_Km": 2100,
+    "State": "California",
+    "Delivery_Urgency": "Critical",
+    "Urgency_Level": "High",
+    "Client_Type": "Gallery",
+    "Carrier_Type": "Specialized",
+    "Transportation_Method": "Airplane",
+    "Day_of_Week": "Friday",
+    "Weather_Condition": "Clear"
+}
+
+class CostModel:
+    # Modèle factice : "Late" si le coût dépasse 2000, et compte les appels
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, df):
+        self.calls.append(len(df))
+        return (df["Transportation_Cost"].to_numpy() > 2000).astype(np.int64)
+
+def test_batch_prediction_keeps_order_and_chunks():
+    model = CostModel()
+    records = [dict(valid_payload, Transportation_Cost=cost) for cost in (500, 2500, 900, 3000, 100)]
+    results = make_batch_prediction(model, "MLflow", records, chunk_size=2)
+    assert [code for code, _ in results] == [0, 1, 0, 1, 0]
+    assert model.calls == [2, 2, 1]
+
+def test_batch_endpoint_isolates_invalid_records():
+    main.activate_model(CostModel(), "MLflow")
+    client = TestClient(main.app)
+    body = [valid_payload, dict(valid_payload, State="Mars"), dict(valid_payload, Transportation_Cost=2500)]
+    response = client.post("/v1/predict/batch", json=body)
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["Errors"] == 1
+    assert [r["Statut"] for r in payload["Results"]] == ["Success", "Error", "Success"]
+    assert payload["Results"][2]["Code"] == 1
+
+def test_batch_endpoint_accepts_ndjson():
+    main.activate_model(CostModel(), "MLflow")
+    client = TestClient(main.app)
+    lines = "\n".join([json.dumps(valid_payload), "{not json", json.dumps(valid_payload)])
+    response = client.post("/v1/predict/batch", content=lines, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    results = response.json()["Results"]
+    assert [r["Index"] for r in results] == [0, 1, 2]
+    assert results[1]["Statut"] == "Error"
+
+def test_batch_endpoint_rejects_non_utf8_body():
+    main.activate_model(CostModel(), "MLflow")
+    client = TestClient(main.app)
+    response = client.post("/v1/predict/batch", content=b'\xff\xfe[', headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
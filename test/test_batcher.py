@@ -0,0 +1,55 @@
+import os
+import sys
+import asyncio
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.batcher import MicroBatcher
+
+def test_concurrent_submits_are_grouped():
+    calls = []
+
+    def predict_batch(records):
+        calls.append(len(records))
+        return [(record["id"], f"ok {record['id']}") for record in records]
+
+    async def scenario():
+        batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait_ms=50)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit({"id": i}) for i in range(10)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+    assert [code for code, _ in results] == list(range(10))
+    assert calls == [4, 4, 2]
+
+def test_errors_are_propagated_to_every_waiter():
+    def predict_batch(records):
+        raise ValueError("boom")
+
+    async def scenario():
+        batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=10)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit({}) for _ in range(3)), return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+
+def test_stop_fails_queued_and_in_flight_requests():
+    async def predict_batch(records):
+        await asyncio.Event().wait()
+
+    async def scenario():
+        batcher = MicroBatcher(predict_batch, max_batch_size=2, max_wait_ms=1)
+        await batcher.start()
+        waiters = [asyncio.create_task(batcher.submit({})) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 1)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 5 and all(isinstance(r, RuntimeError) for r in results)
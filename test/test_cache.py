@@ -0,0 +1,61 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import main
+from app import cache as cache_module
+from app.cache import PredictionCache, make_cache_key
+from app import hot_reload
+from app.hot_reload import ServingModel
+from app.schema import LogistikData, sample_records
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(max_entries=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None and len(cache) == 2
+
+    now[0] += 11
+    assert cache.get("a") is None and cache.get("c") is None
+
+def test_key_is_canonical_and_versioned():
+    record = sample_records(1)[0]
+    same = dict(reversed(list(record.items())))
+    item, twin = LogistikData.model_validate(record), LogistikData.model_validate(same)
+    assert make_cache_key(item, "v1") == make_cache_key(twin, "v1")
+    assert make_cache_key(item, "v1") != make_cache_key(item, "v2")
+
+def test_repeated_requests_hit_cache_until_model_reload():
+    class CountingModel:
+        calls = 0
+        def predict(self, df):
+            CountingModel.calls += 1
+            return np.zeros(len(df), dtype=int)
+
+    main.activate_model(CountingModel(), "MLflow")
+    client = TestClient(main.app)
+    payload = sample_records(1, seed=4)[0]
+    for _ in range(3):
+        assert client.post("/v1/predict", json=payload).status_code == 200
+    assert CountingModel.calls == 1
+
+    main.activate_model(CountingModel(), "MLflow")
+    assert len(main.prediction_cache) == 0
+    client.post("/v1/predict", json=payload)
+    assert CountingModel.calls == 2
+
+def test_reloads_with_the_same_model_version_use_distinct_keys(monkeypatch):
+    item = LogistikData.model_validate(sample_records(1)[0])
+    clock = iter([100.0, 101.0])
+    monkeypatch.setattr(hot_reload.time, "time", lambda: next(clock))
+    old, new = ServingModel(None, "Local", "v1"), ServingModel(None, "Local", "v1")
+    assert make_cache_key(item, old.cache_version) != make_cache_key(item, new.cache_version)
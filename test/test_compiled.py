@@ -0,0 +1,42 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from app.schema import LogistikData, sample_records
+from app.compiled import CompiledPipeline, build_compiled_pipeline
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+
+def fit_pipeline(classifier):
+    supply = make_synthetic_supply(1500)
+    pipe = Pipeline([('preprocessing', get_preprocessor(supply)), ('classifier', classifier)])
+    return pipe.fit(supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"])
+
+def test_compiled_random_forest_matches_full_pipeline():
+    pipe = fit_pipeline(RandomForestClassifier(n_estimators=30, max_depth=6, random_state=0))
+    compiled = build_compiled_pipeline(pipe)
+    assert compiled is not None and compiled.dtype == np.float32
+
+    records = sample_records(300, seed=7)
+    items = [LogistikData.model_validate(r) for r in records]
+    expected = pipe.predict(pd.DataFrame(records))
+    assert compiled.predict_many(items) == expected.tolist()
+    assert compiled.predict_one(items[0]) == expected[0]
+
+def test_compiled_logistic_keeps_float64_parity():
+    pipe = fit_pipeline(LogisticRegression(max_iter=1000, solver='liblinear'))
+    compiled = CompiledPipeline.from_model(pipe)
+    assert compiled.dtype == np.float64
+    assert compiled.check_parity(pipe, sample_records(300, seed=3))
+
+def test_unknown_model_structure_is_not_compiled():
+    class Opaque:
+        def predict(self, df):
+            return np.zeros(len(df))
+    assert build_compiled_pipeline(Opaque()) is None
@@ -0,0 +1,59 @@
+import os
+import sys
+import sqlite3
+import asyncio
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.schema import LogistikData, sample_records
+from app.database import LOGISTIC_CHAIN_COLUMNS, PredictionWriter
+
+def sqlite_factory(path):
+    connection = sqlite3.connect(path)
+    columns = ", ".join(f"{column} TEXT" for column in LOGISTIC_CHAIN_COLUMNS)
+    connection.execute(f"CREATE TABLE IF NOT EXISTS logistic_chain (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+    connection.commit()
+    connection.close()
+    return lambda: sqlite3.connect(path)
+
+def count_rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM logistic_chain").fetchone()[0]
+
+def test_writer_batches_rows_and_flushes_on_stop(tmp_path):
+    path = str(tmp_path / "logistik.db")
+    items = [LogistikData.model_validate(r) for r in sample_records(25)]
+    batches = []
+    factory = sqlite_factory(path)
+
+    def recording_factory():
+        connection = factory()
+        batches.append(1)
+        return connection
+
+    async def scenario():
+        writer = PredictionWriter(recording_factory, placeholder="?", max_batch=10, flush_interval=60)
+        await writer.start()
+        for item in items:
+            await writer.enqueue(item, "Late")
+        await writer.stop()
+
+    asyncio.run(scenario())
+    assert count_rows(path) == 25
+    assert len(batches) == 3
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT state FROM logistic_chain LIMIT 1").fetchone()[0] == items[0].state.value
+
+def test_full_buffer_drops_instead_of_blocking(tmp_path):
+    path = str(tmp_path / "logistik.db")
+    item = LogistikData.model_validate(sample_records(1)[0])
+
+    async def scenario():
+        writer = PredictionWriter(sqlite_factory(path), placeholder="?", max_batch=100, max_buffer=3, overflow="drop")
+        await writer.start()
+        accepted = [await writer.enqueue(item, "On Time") for _ in range(6)]
+        await writer.stop()
+        return accepted
+
+    accepted = asyncio.run(scenario())
+    assert accepted.count(False) == 3
+    assert count_rows(path) == 3
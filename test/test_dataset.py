@@ -0,0 +1,34 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+import pytest
+
+from train_pipeline import dataset
+from train_pipeline.dataset import load_dataset
+from train_pipeline.synthetic import make_synthetic_supply
+
+def test_cache_is_built_once_per_source_content(tmp_path, monkeypatch):
+    source = tmp_path / "supply.csv"
+    supply = make_synthetic_supply(500)
+    supply.to_csv(source, index=False)
+    cache_dir = str(tmp_path / "cache")
+
+    first = load_dataset(str(source), cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    assert isinstance(first["State"].dtype, pd.CategoricalDtype)
+    assert first["Delivery_Status"].dtype.itemsize == 1
+    pd.testing.assert_frame_equal(first.astype(supply.dtypes.to_dict()), supply)
+
+    def no_source(path):
+        raise AssertionError("la source ne doit pas être relue")
+
+    monkeypatch.setattr(dataset, "read_source", no_source)
+    projected = load_dataset(str(source), columns=["Distance_Km", "State"], cache_dir=cache_dir)
+    assert list(projected.columns) == ["Distance_Km", "State"]
+    assert projected["Distance_Km"].equals(supply["Distance_Km"])
+
+    supply.head(100).to_csv(source, index=False)
+    with pytest.raises(AssertionError):
+        load_dataset(str(source), cache_dir=cache_dir)
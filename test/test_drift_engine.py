@@ -0,0 +1,50 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from app.schema import LogistikData, sample_records
+from drift.engine import DriftEngine, divergences
+from monitoring import calculate_psi
+
+def test_engine_counts_match_per_column_binning():
+    engine = DriftEngine.from_baseline(pd.DataFrame(sample_records(3000, seed=1)), chunk_size=700)
+    batch = pd.DataFrame(sample_records(2500, seed=2))
+    batch.loc[::5, "Transportation_Cost"] = np.nan
+
+    counts, nulls = engine.numeric_counts(batch)
+    for f, col in enumerate(engine.numeric_columns):
+        values = batch[col].dropna().to_numpy()
+        assert np.array_equal(counts[f], np.bincount(np.searchsorted(engine.edges[f], values, side="right"), minlength=counts.shape[1]))
+    assert nulls.tolist() == [500, 0]
+
+    # Membres d'Enum (LogistikData.dict) et chaînes donnent les mêmes comptages
+    items = pd.DataFrame([LogistikData.model_validate(r).dict(by_alias=True) for r in sample_records(300, seed=3)])
+    strings = pd.DataFrame(sample_records(300, seed=3))
+    assert np.array_equal(engine.categorical_counts(items)[0], engine.categorical_counts(strings)[0])
+    state = engine.categorical_columns.index("State")
+    assert engine.categorical_counts(strings)[0][state].sum() == 300
+
+def test_divergences_for_all_features():
+    engine = DriftEngine.from_baseline(pd.DataFrame(sample_records(3000, seed=1)))
+    same = engine.compare(pd.DataFrame(sample_records(3000, seed=1)))
+    assert np.allclose(same[["psi", "kl", "js"]].to_numpy(), 0.0)
+
+    drifted = pd.DataFrame(sample_records(3000, seed=2))
+    drifted["Distance_Km"] *= 2
+    drifted["Weather_Condition"] = "Storm"
+    scores = engine.compare(drifted)
+    assert scores.loc["Distance_Km", "psi"] > 1 and scores.loc["Weather_Condition", "psi"] > 1
+    assert scores.loc["State", "psi"] < 0.1
+    assert (scores["js"] <= np.log(2) + 1e-9).all()
+
+def test_divergences_ignore_empty_rows():
+    result = divergences(np.array([[1, 2, 3], [0, 0, 0]]), np.array([[3, 2, 1], [1, 1, 1]]))
+    assert result["psi"][1] == 0 and result["psi"][0] > 0
+
+def test_calculate_psi_uses_shared_buckets():
+    values = pd.Series(np.random.default_rng(0).normal(size=5000))
+    assert calculate_psi(values, values) == 0
+    assert calculate_psi(values, values + 1) > 0.5
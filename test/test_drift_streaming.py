@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import sqlite3
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from app.schema import sample_records
+from drift.streaming import DriftProfile, NumericSketch, WindowedMonitor, psi_from_counts
+from drift.sources import NDJSONTail, SequenceTableSource
+from monitoring import monitor_data, drain
+from retrain.data_collect import Watermark
+
+def test_numeric_sketch_matches_batch_statistics():
+    values = np.random.default_rng(0).normal(50, 10, 5000)
+    sketch = NumericSketch(np.histogram_bin_edges(values, bins=10))
+    for chunk in np.array_split(values, 7):
+        sketch.update(list(chunk) + [None])
+    assert sketch.count == 5000 and sketch.nulls == 7
+    assert np.isclose(sketch.mean, values.mean()) and np.isclose(sketch.variance, values.var(ddof=1))
+    assert np.array_equal(sketch.hist, np.histogram(values, bins=sketch.edges)[0])
+
+def test_windows_stay_bounded_and_detect_drift():
+    baseline = DriftProfile.from_baseline(pd.DataFrame(sample_records(2000, seed=1)))
+    monitor = WindowedMonitor(baseline, pane_size=100, n_panes=3)
+    monitor.update(sample_records(250, seed=2))
+    assert len(monitor.panes) == 2 and monitor.current.records == 50
+    assert monitor.sliding().records == 150
+
+    drifted = [dict(record, Distance_Km=record["Distance_Km"] * 3) for record in sample_records(300, seed=3)]
+    monitor.update(drifted)
+    assert len(monitor.panes) == 3
+    assert monitor.tumbling.psi(baseline)["Distance_Km"] > 1.0
+    assert monitor.tumbling.psi(baseline)["State"] < 0.2
+
+def test_psi_from_counts_matches_calculate_psi_formula():
+    expected, actual = np.array([10, 20, 30]), np.array([30, 20, 10])
+    e, a = expected / 60, actual / 60
+    assert np.isclose(psi_from_counts(expected, actual), np.sum((e - a) * np.log((e + 1e-6) / (a + 1e-6))))
+    assert psi_from_counts(expected, np.zeros(3)) == 0.0
+
+def test_ndjson_tail_reads_only_new_complete_lines(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    records = sample_records(3)
+    path.write_text(json.dumps(records[0]) + "\n" + json.dumps(records[1]) + "\n" + '{"Sta')
+    tail = NDJSONTail(str(path))
+    assert tail.read() == records[:2]
+    assert tail.read() == []
+    with open(path, "a") as handle:
+        handle.write('te": "Texas"}\n' + json.dumps(records[2]) + "\n")
+    assert tail.read() == [{"State": "Texas"}, records[2]]
+
+def test_sequence_table_source_pages_by_id(tmp_path):
+    path = str(tmp_path / "logistik.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE logistic_chain (id INTEGER PRIMARY KEY AUTOINCREMENT, state TEXT, distance_km REAL)")
+        connection.executemany("INSERT INTO logistic_chain (state, distance_km) VALUES (?, ?)", [("Texas", float(i)) for i in range(12)])
+    source = SequenceTableSource(lambda: sqlite3.connect(path), {"state": "State", "distance_km": "Distance_Km"}, placeholder="?", page_size=5)
+    assert [r["Distance_Km"] for r in source.read()] == [float(i) for i in range(12)]
+    assert source.read() == [] and source.last_id == 12
+
+def test_drain_reads_bounded_pages_and_resumes_from_watermark(tmp_path):
+    path = str(tmp_path / "logistik.db")
+    records = sample_records(23, seed=6)
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE logistic_chain (id INTEGER PRIMARY KEY AUTOINCREMENT, state TEXT, distance_km REAL)")
+        connection.executemany("INSERT INTO logistic_chain (state, distance_km) VALUES (?, ?)", [(r["State"], r["Distance_Km"]) for r in records])
+    columns = {"state": "State", "distance_km": "Distance_Km"}
+    source = SequenceTableSource(lambda: sqlite3.connect(path), columns, placeholder="?", page_size=50)
+    pages, read = [], source.read
+
+    def paged(max_records=None):
+        page = read(max_records)
+        pages.append(len(page))
+        return page
+    source.read = paged
+
+    watermark = Watermark(str(tmp_path / "monitor_state.json"))
+    monitor = WindowedMonitor(DriftProfile.from_baseline(pd.DataFrame(sample_records(500, seed=1))), pane_size=10, n_panes=3)
+    assert drain(source, monitor, 10, watermark) == 23
+    assert pages == [10, 10, 3, 0] and monitor.total == 23
+    assert watermark.load() == 23
+
+    restarted = SequenceTableSource(lambda: sqlite3.connect(path), columns, last_id=watermark.load(), placeholder="?")
+    assert drain(restarted, monitor, 10, watermark) == 0
+
+def test_monitor_data_uses_its_baseline_argument():
+    batch = pd.DataFrame(sample_records(200, seed=4))
+    monitor_data(batch, pd.DataFrame(sample_records(200, seed=5)))
@@ -0,0 +1,99 @@
+import os
+import sys
+import asyncio
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import httpx
+import numpy as np
+import pandas as pd
+
+import main
+from app.admission import InferenceExecutor
+from app.compiled import build_compiled_pipeline
+from app.explainer import build_tree_explanations
+from app.hot_reload import ServingModel
+from app.schema import LogistikData, sample_records
+from benchmarks.common import build_standin_model
+
+MODEL = build_standin_model(n_rows=1000, n_estimators=20, max_depth=6)
+
+def test_exact_attributions_add_up_to_the_predicted_probability():
+    explanations = build_tree_explanations(ServingModel(MODEL, "Local", "v1", build_compiled_pipeline(MODEL)))
+    records = sample_records(8, seed=3)
+    items = [LogistikData.model_validate(record) for record in records]
+
+    first = explanations.explain(items)
+    late = MODEL.predict_proba(pd.DataFrame(records))[:, 1]
+    totals = [result["Base Value"] + sum(result["Attributions"].values()) for result in first]
+    assert np.allclose(totals, late, atol=1e-5)
+    assert list(first[0]["Attributions"]) == list(MODEL.steps[0][1].feature_names_in_)
+    for result in first:
+        contributions = [reason["Contribution"] for reason in result["Top Reasons"]]
+        assert all(c > 0 for c in contributions) and contributions == sorted(contributions, reverse=True)
+
+    assert {(result["Method"], result["Cached"]) for result in first} == {("exact", False)}
+    assert {(result["Method"], result["Cached"]) for result in explanations.explain(items)} == {("exact", True)}
+
+def test_budget_exhausted_falls_back_to_uncached_approximation_of_the_record():
+    explanations = build_tree_explanations(ServingModel(MODEL, "Local", "v1"), grid_resolution=16)
+    records = sample_records(4, seed=5)
+    items = [LogistikData.model_validate(record) for record in records]
+    explanations.exact_row_seconds = 10.0
+
+    approximate = explanations.explain(items, budget_ms=50)
+    assert {(result["Method"], result["Cached"]) for result in approximate} == {("approximate", False)}
+    # Saabas reste additif : calculé sur l'enregistrement, il somme à la probabilité servie
+    totals = [result["Base Value"] + sum(result["Attributions"].values()) for result in approximate]
+    assert np.allclose(totals, MODEL.predict_proba(pd.DataFrame(records))[:, 1], atol=1e-5)
+    # Grille active : attributions du centre de cellule, jamais présentées comme exactes
+    assert {result["Method"] for result in explanations.explain(items)} == {"cell"}
+
+def test_explain_endpoint_single_batch_and_unsupported_model(monkeypatch):
+    executor = InferenceExecutor("thread", workers=1, max_in_flight=4)
+    monkeypatch.setattr(main, "inference", executor)
+    monkeypatch.setattr(main, "explain_executor", executor)
+    monkeypatch.setattr(main, "prediction_cache", None)
+    records = sample_records(3, seed=11)
+
+    async def post(payload):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/v1/explain", json=payload)
+
+    main.activate_model(MODEL, "Local", version="explain")
+    single = asyncio.run(post(records[0]))
+    assert single.status_code == 200
+    assert single.json()["Code"] in (0, 1) and len(single.json()["Attributions"]) == 10
+
+    batch = asyncio.run(post(records + [{"State": "Nowhere"}])).json()
+    assert (batch["Count"], batch["Errors"]) == (4, 1)
+    assert [result["Statut"] for result in batch["Results"]] == ["Success"] * 3 + ["Error"]
+
+    main.activate_model(build_standin_model("logistic", n_rows=300), "Local", version="linear")
+    assert asyncio.run(post(records[0])).status_code == 501
+
+def test_explain_task_past_its_deadline_is_skipped(monkeypatch):
+    release, calls = threading.Event(), []
+    executor = InferenceExecutor("thread", workers=1, max_in_flight=4)
+    monkeypatch.setattr(main, "explain_executor", executor)
+    monkeypatch.setattr(main, "explain_records", lambda current, items: calls.append(len(items)))
+    monkeypatch.setattr(main.settings, "request_deadline_ms", 50)
+    main.activate_model(MODEL, "Local", version="explain")
+
+    async def scenario():
+        blocking = asyncio.create_task(executor.admit(executor.execute(release.wait)))
+        transport = httpx.ASGITransport(app=main.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/v1/explain", json=sample_records(1)[0])
+        finally:
+            release.set()
+        await blocking
+        await asyncio.sleep(0.05)
+        return response
+
+    assert asyncio.run(scenario()).status_code == 503
+    assert calls == []
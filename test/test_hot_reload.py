@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import joblib
+import numpy as np
+
+import main
+from app.schema import LogistikData, sample_records
+from app.hot_reload import ServingModel, ModelWatcher, check_golden, load_golden_requests
+
+class ConstantModel:
+    def __init__(self, code):
+        self.code = code
+
+    def predict(self, df):
+        return np.full(len(df), self.code)
+
+def prepare(uri):
+    model = joblib.load(uri)
+    serving = ServingModel(model, "Local", f"v{model.code}")
+    if not check_golden(serving, load_golden_requests()):
+        raise RuntimeError("golden")
+    return serving
+
+def test_watcher_swaps_on_change_and_rejects_bad_candidates(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    joblib.dump(ConstantModel(0), path)
+    swapped = []
+
+    async def scenario():
+        watcher = ModelWatcher(path, prepare, swapped.append, interval=3600)
+        await watcher.start()
+        unchanged = await watcher.check_once()
+
+        joblib.dump(ConstantModel(1), path)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        changed = await watcher.check_once()
+
+        joblib.dump(ConstantModel(7), path)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 2 * 10**9))
+        rejected = await watcher.check_once()
+        await watcher.stop()
+        return unchanged, changed, rejected
+
+    assert asyncio.run(scenario()) == (False, True, False)
+    assert [s.version for s in swapped] == ["v1"]
+
+def test_queued_requests_finish_on_the_model_they_started_with():
+    os.environ.setdefault("API_TITLE", "RouteWise-Server")
+    os.environ.setdefault("API_VERSION", "1.0")
+    import main
+
+    item = LogistikData.model_validate(sample_records(1)[0])
+    old = ServingModel(ConstantModel(0), "Local", "old")
+    main.swap_model(ServingModel(ConstantModel(1), "Local", "new"))
+    results = main.predict_records([(old, item), (main.serving, item), (old, item)])
+    assert [code for code, _ in results] == [0, 1, 0]
+
+def test_refreshed_cached_model_is_swapped_on_the_event_loop(monkeypatch):
+    candidate, swapped = ServingModel(ConstantModel(1), "Local", "v1"), []
+    monkeypatch.setattr(main, "prepare_refreshed_model", lambda source, fingerprint: candidate)
+    monkeypatch.setattr(main, "swap_model", lambda serving: swapped.append((serving, threading.get_ident())))
+
+    async def scenario():
+        await main.run_in_background(main.refresh_cached_model, "models:/routewise/Production", "1:run")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert swapped == [(candidate, loop_thread)]
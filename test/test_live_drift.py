@@ -0,0 +1,44 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from prometheus_client import REGISTRY
+
+from app.schema import LogistikData, sample_records
+from app.live_drift import LiveDriftTracker, build_baseline_profile
+from drift.engine import DriftEngine
+from train_pipeline.synthetic import make_synthetic_supply
+
+def test_tracker_counts_match_drift_engine():
+    supply = make_synthetic_supply(2000)
+    profile = build_baseline_profile(supply)
+    assert sum(profile["categorical"]["Delivery_Status"]["counts"]) == 2000
+    tracker = LiveDriftTracker(profile)
+    records = sample_records(500, seed=4)
+    for record in records:
+        tracker.observe(LogistikData.model_validate(record), 1)
+
+    engine = DriftEngine.from_baseline(supply)
+    numeric, _ = engine.numeric_counts(pd.DataFrame(records))
+    categorical, _ = engine.categorical_counts(pd.DataFrame(records))
+    cells = {cell: count for cell, count in zip(tracker.cells, tracker.pending)}
+    for f, col in enumerate(engine.numeric_columns):
+        assert [cells[(col, str(i))] for i in range(numeric.shape[1])] == numeric[f].tolist()
+    for c, (col, vocabulary) in enumerate(zip(engine.categorical_columns, engine.vocabularies)):
+        assert [cells[(col, value)] for value in vocabulary] == categorical[c, :len(vocabulary)].tolist()
+    assert cells[("Delivery_Status", "Late")] == 500
+
+def test_flush_publishes_deltas_and_psi_detects_drift():
+    tracker = LiveDriftTracker(build_baseline_profile(make_synthetic_supply(2000)))
+    labels = {"feature": "Distance_Km", "bin": "0"}
+    before = REGISTRY.get_sample_value("live_drift_observations_total", labels) or 0.0
+    for record in sample_records(300, seed=5):
+        tracker.observe(LogistikData.model_validate(dict(record, Distance_Km=1400.0)), 0)
+    tracker.flush()
+    assert REGISTRY.get_sample_value("live_drift_observations_total", labels) - before == 300
+    assert sum(tracker.pending) == 0
+
+    psi = tracker.psi()
+    assert psi["Distance_Km"] > 1.0
+    assert psi["State"] < 0.2
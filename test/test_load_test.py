@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import asyncio
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import httpx
+import pytest
+import numpy as np
+
+import main
+from app.schema import sample_records
+from benchmarks.corpus import build_corpus, read_corpus
+from benchmarks.bench_api import drive
+
+class ConstantModel:
+    def predict(self, df):
+        return np.zeros(len(df), dtype=np.int64)
+
+def test_corpus_keeps_valid_recorded_payloads_and_is_reproducible(tmp_path):
+    recorded = sample_records(3, seed=1)
+    path = tmp_path / "requests.jsonl"
+    lines = [json.dumps(dict(recorded[0], Code=1)), json.dumps(recorded[1]), "{bad", json.dumps(dict(recorded[2], State="Mars"))]
+    path.write_text("\n".join(lines) + "\n")
+
+    records, rejected = read_corpus(path)
+    assert rejected == 2 and len(records) == 2 and "Code" not in records[0]
+
+    corpus = build_corpus(str(path), size=50, seed=7)
+    assert (corpus["from_file"], corpus["generated"], len(corpus["records"])) == (2, 48, 50)
+    assert corpus["records"] == build_corpus(str(path), size=50, seed=7)["records"]
+
+def test_drive_reports_latency_percentiles_for_both_paths(monkeypatch):
+    monkeypatch.setattr(main, "prediction_cache", None)
+    monkeypatch.setattr(main, "batcher", None)
+    monkeypatch.setattr(main, "live_drift", None)
+    monkeypatch.setattr(main, "writer", None)
+    main.activate_model(ConstantModel(), "Local")
+    records = build_corpus(size=40)["records"]
+
+    async def scenario(name):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await drive(client, name, records, concurrency=4, n_requests=20, batch_size=8, warmup=2)
+
+    single, batch = asyncio.run(scenario("predict")), asyncio.run(scenario("batch"))
+    assert single["requests"] == 20 and single["errors"] == 0
+    assert single["p50_ms"] <= single["p95_ms"] <= single["p99_ms"]
+    assert batch["rows_per_second"] == pytest.approx(batch["throughput_rps"] * 8)
@@ -0,0 +1,49 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+
+from app.schema import LogistikData, sample_records
+from app.compiled import build_compiled_pipeline
+from app.lookup_table import CategoricalTable, LookupPredictor, PredictionGrid
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+
+def compiled_forest():
+    supply = make_synthetic_supply(1500)
+    pipe = Pipeline([
+        ('preprocessing', get_preprocessor(supply)),
+        ('classifier', RandomForestClassifier(n_estimators=20, max_depth=5, random_state=0)),
+    ])
+    pipe.fit(supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"])
+    return build_compiled_pipeline(pipe)
+
+def test_table_encoding_matches_compiled_encoding():
+    compiled = compiled_forest()
+    table = CategoricalTable(compiled)
+    items = [LogistikData.model_validate(r) for r in sample_records(200, seed=11)]
+    assert table.size == len(table.table)
+    assert np.array_equal(table.encode_many(items), compiled.encode_many(items))
+    assert LookupPredictor(compiled).check_accuracy(500) == 1.0
+
+def test_grid_respects_memory_budget():
+    compiled = compiled_forest()
+    table = CategoricalTable(compiled)
+    grid = PredictionGrid(table, resolution=64, budget_bytes=table.size * 16)
+    assert grid.resolution == 4
+    assert grid.grid.nbytes <= table.size * 16
+    items = [LogistikData.model_validate(r) for r in sample_records(20, seed=2)]
+    assert set(grid.predict_many(items)) <= {0, 1}
+
+def test_grid_accuracy_check_leaves_the_grid_unfilled():
+    compiled = compiled_forest()
+    predictor = LookupPredictor(compiled, grid_enabled=True, grid_resolution=16)
+    items = [LogistikData.model_validate(r) for r in sample_records(50, seed=4)]
+    centers = predictor.grid.predict_centers(items)
+
+    assert 0.0 <= predictor.check_accuracy(500) <= 1.0
+    assert (predictor.grid.grid < 0).all()
+    assert list(centers) == predictor.predict_many(items)
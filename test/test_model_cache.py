@@ -0,0 +1,27 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.model_loader import ModelArtifactCache, resolve_model_version
+
+def test_artifacts_are_content_addressed(tmp_path):
+    model = LogisticRegression().fit(np.array([[0.0], [1.0], [2.0], [3.0]]), [0, 0, 1, 1])
+    cache = ModelArtifactCache(str(tmp_path))
+    first = cache.store("models:/routewise/Production", model, "MLflow", "run-1", "3:run-1")
+    second = cache.store("bentoml:routewise", model, "BentoML", "routewise:abc")
+    assert first == second
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".joblib")]) == 1
+
+    loaded, model_type, version, fingerprint = cache.load("models:/routewise/Production")
+    assert (model_type, version, fingerprint) == ("MLflow", "run-1", "3:run-1")
+    assert loaded.predict(np.array([[3.0]]))[0] == 1
+    assert cache.load("models:/other/Production") is None
+
+def test_fallback_version_is_stable_across_reloads():
+    # Libellé "version" des histogrammes : une valeur par artefact, pas par objet chargé
+    assert resolve_model_version(object()) == resolve_model_version(object()) == "local"
+    first, again = resolve_model_version(object(), fingerprint="forest.json:10:1"), resolve_model_version(object(), fingerprint="forest.json:10:1")
+    assert first == again != resolve_model_version(object(), fingerprint="forest.json:10:2")
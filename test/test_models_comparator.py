@@ -0,0 +1,74 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import mlflow
+from sklearn.pipeline import Pipeline
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+
+from train_pipeline.config import settings
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+from retrain import models_comparator
+from retrain.models_comparator import HoldoutCache, compare_models, wins
+
+def test_models_sharing_a_preprocessor_reuse_one_encoding(monkeypatch):
+    monkeypatch.setattr(settings, "COMPARATOR_LATENCY_SAMPLES", 5)
+    monkeypatch.setattr(settings, "COMPARATOR_BATCH_SIZE", 32)
+    supply = make_synthetic_supply(400)
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"]
+    preprocessor = get_preprocessor(supply).fit(x, y)
+    xt = preprocessor.transform(x)
+    models = {
+        "logistic": Pipeline([("preprocessing", preprocessor), ("classifier", LogisticRegression(max_iter=500).fit(xt, y))]),
+        "random_forest": Pipeline([("preprocessing", preprocessor), ("classifier", RandomForestClassifier(n_estimators=10, random_state=0).fit(xt, y))]),
+    }
+
+    cache = HoldoutCache(x)
+    for model in models.values():
+        cache.encode(model)
+    assert len(cache.encoded) == 1
+
+    report = compare_models(models, x, y)
+    assert list(report.index) == list(models)
+    assert report.loc["random_forest", "accuracy"] == (models["random_forest"].predict(x) == y).mean()
+    assert {"f1", "recall", "single_p99_ms", "batch_p50_ms"} <= set(report.columns)
+    assert (report["batch_size"] == 32).all()
+
+def test_a_slower_challenger_cannot_replace_a_faster_champion(monkeypatch):
+    monkeypatch.setattr(settings, "PROMOTION_METRIC", "f1")
+    monkeypatch.setattr(settings, "PROMOTION_MIN_GAIN", 0.01)
+    monkeypatch.setattr(settings, "PROMOTION_MAX_LATENCY_RATIO", 1.1)
+    monkeypatch.setattr(settings, "PROMOTION_LATENCY_BUDGET_MS", 0.0)
+    champion = {"f1": 0.80, "single_p99_ms": 2.0}
+
+    assert wins({"f1": 0.85, "single_p99_ms": 2.1}, champion)
+    assert not wins({"f1": 0.85, "single_p99_ms": 5.0}, champion)
+    assert not wins({"f1": 0.805, "single_p99_ms": 1.0}, champion)
+    assert wins({"f1": 0.5, "single_p99_ms": 9.0}, None)
+
+    monkeypatch.setattr(settings, "PROMOTION_LATENCY_BUDGET_MS", 5.0)
+    assert not wins({"f1": 0.5, "single_p99_ms": 9.0}, None)
+
+def test_only_promoted_versions_are_saved_to_bentoml(monkeypatch):
+    class Client:
+        transitions = []
+        def get_model_version(self, name, version):
+            return type("Version", (), {"run_id": None})()
+        def transition_model_version_stage(self, name, version, **kwargs):
+            Client.transitions.append(name)
+
+    supply = make_synthetic_supply(300)
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"]
+    model = Pipeline([("preprocessing", get_preprocessor(supply)), ("classifier", LogisticRegression(max_iter=500))]).fit(x, y)
+    saved, outcomes = [], iter([True, False])
+    monkeypatch.setattr(settings, "COMPARATOR_LATENCY_SAMPLES", 5)
+    monkeypatch.setattr(mlflow.tracking, "MlflowClient", Client)
+    monkeypatch.setattr(models_comparator, "load_champion", lambda name, model: None)
+    monkeypatch.setattr(models_comparator, "save_to_bentoml", lambda name, model: saved.append(name))
+    monkeypatch.setattr(models_comparator, "wins", lambda challenger, champion: next(outcomes))
+
+    decisions = models_comparator.promote_candidates({"logistic": (model, "2"), "random_forest": (model, "3")}, x, y)
+    assert [name for name, decision in decisions.items() if decision["promoted"]] == ["logistic"]
+    assert saved == Client.transitions == ["logistic"]
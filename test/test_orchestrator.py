@@ -0,0 +1,34 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from train_pipeline.config import settings
+from train_pipeline.dataset import optimize_dtypes
+from train_pipeline.orchestrator import cpu_shares, train_all_families
+from train_pipeline.synthetic import make_synthetic_supply
+
+def test_cpu_budget_is_split_between_families():
+    assert cpu_shares(["logistic", "random_forest", "catboost"], 8) == {"logistic": 3, "random_forest": 3, "catboost": 2}
+    assert cpu_shares(["logistic", "random_forest"], 1) == {"logistic": 1, "random_forest": 1}
+
+def test_families_are_trained_from_the_mapped_matrix(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "N_ITER", 2)
+    monkeypatch.setattr(settings, "N_SPLITE", 2)
+    monkeypatch.setattr(settings, "CATBOOST_ITERATIONS", 30)
+    monkeypatch.setattr(settings, "PREPROCESSING_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    supply = optimize_dtypes(make_synthetic_supply(400))
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"].to_numpy()
+
+    best_models, report = train_all_families(x, y, ["logistic", "catboost"], cpu_budget=2)
+
+    assert set(best_models) == set(report["families"]) == {"logistic", "catboost"}
+    assert best_models["logistic"].predict(x).shape == (400,)
+    assert report["families"]["catboost"]["n_jobs"] == 1
+    assert 0 < report["core_utilization"] <= 1.0 + 0.05
+
+def test_unknown_family_is_rejected():
+    with pytest.raises(ValueError):
+        train_all_families(None, None, ["xgboost"])
@@ -2,13 +2,18 @@ import requests
 
 url = "http://127.0.0.1:8000/v1/predict"
 
-data ={
-    "Stock_Level": 250,
-    "Sales": 80,
-    "Transportation_Cost": 75.5,
-    "Region": "East",
-    "Delivery_Urgency": "On Time",
-    "Estimated_Day": 5
+# Payload conforme à LogistikData (corpus complet : python benchmarks/bench_api.py --mode http --url ...)
+data = {
+    "Transportation_Cost": 1500,
+    "Distance_Km": 2100,
+    "State": "California",
+    "Delivery_Urgency": "Critical",
+    "Urgency_Level": "High",
+    "Client_Type": "Gallery",
+    "Carrier_Type": "Specialized",
+    "Transportation_Method": "Airplane",
+    "Day_of_Week": "Friday",
+    "Weather_Condition": "Clear"
 }
 
 response = requests.post(url, json=data)
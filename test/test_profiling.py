@@ -0,0 +1,61 @@
+import os
+import sys
+import asyncio
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("API_TITLE", "RouteWise-Server")
+os.environ.setdefault("API_VERSION", "1.0")
+
+import httpx
+from prometheus_client import REGISTRY
+
+import main
+from app.schema import sample_records
+from benchmarks.common import build_standin_model
+
+def stage_count(stage, version):
+    value = REGISTRY.get_sample_value("predict_stage_seconds_count", {"stage": stage, "model_type": "Local", "version": version})
+    return value or 0.0
+
+def test_predict_records_every_stage_of_a_pipeline(monkeypatch):
+    for name in ("prediction_cache", "batcher", "live_drift", "writer"):
+        monkeypatch.setattr(main, name, None)
+    main.activate_model(build_standin_model("logistic", n_rows=500), "Local", version="stages-v1")
+    stages = ("validation", "dataframe", "preprocessing", "estimator", "response")
+    before = {stage: stage_count(stage, "stages-v1") for stage in stages}
+
+    async def call():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/v1/predict", json=sample_records(1)[0])
+
+    assert asyncio.run(call()).status_code == 200
+    assert all(stage_count(stage, "stages-v1") == before[stage] + 1 for stage in stages)
+
+def test_admin_profile_is_guarded_and_returns_folded_stacks(monkeypatch):
+    for name in ("prediction_cache", "batcher", "live_drift", "writer"):
+        monkeypatch.setattr(main, name, None)
+    main.activate_model(build_standin_model("logistic", n_rows=500), "Local", version="profile-v1")
+    records = sample_records(3)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            monkeypatch.setattr(main.settings, "admin_token", None)
+            disabled = await client.post("/admin/profile")
+            monkeypatch.setattr(main.settings, "admin_token", "secret")
+            forbidden = await client.post("/admin/profile", headers={"X-Admin-Token": "wrong"})
+
+            profile = asyncio.create_task(client.post("/admin/profile?requests=3&seconds=20&interval_ms=1", headers={"X-Admin-Token": "secret"}))
+            while main.profile_window is None:
+                await asyncio.sleep(0.01)
+            for record in records:
+                await client.post("/v1/predict", json=record)
+            return disabled, forbidden, await profile
+
+    disabled, forbidden, profile = asyncio.run(scenario())
+    assert disabled.status_code == 404 and forbidden.status_code == 403
+    assert profile.status_code == 200 and profile.headers["X-Profile-Requests"] == "3"
+    assert float(profile.headers["X-Profile-Seconds"]) < 20
+    lines = profile.text.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert main.profile_window is None
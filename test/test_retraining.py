@@ -0,0 +1,163 @@
+import os
+import sys
+import sqlite3
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostClassifier
+from category_encoders import CatBoostEncoder
+
+from app.database import LOGISTIC_CHAIN_COLUMNS
+from app.schema import sample_records
+from benchmarks.common import build_standin_model
+from retrain.data_collect import RETRAIN_COLUMNS, ChunkedCollector, Watermark, collect_rows, iter_collected, load_collected, table_source
+from retrain.retraining import update_target_encoder
+from retrain.retraining_task import RetrainingTask
+from train_pipeline.config import settings
+from train_pipeline.data_loader import load_and_encode_data
+from train_pipeline.synthetic import make_synthetic_supply
+
+def make_table(path):
+    connection = sqlite3.connect(path)
+    columns = ", ".join(f"{column} {'REAL' if column.endswith(('cost', 'km')) else 'TEXT'}" for column in LOGISTIC_CHAIN_COLUMNS)
+    # actual_status : statut observé après la livraison, distinct de la prédiction écrite par l'API
+    connection.execute(f"CREATE TABLE logistic_chain (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns}, actual_status TEXT)")
+    connection.commit()
+    connection.close()
+
+def insert_rows(path, records, statuses, predicted="Late"):
+    connection = sqlite3.connect(path)
+    aliases = list(RETRAIN_COLUMNS.values())[:-1]
+    columns = LOGISTIC_CHAIN_COLUMNS + ("actual_status",)
+    connection.executemany(
+        f"INSERT INTO logistic_chain ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        [tuple(record[alias] for alias in aliases) + (predicted, status) for record, status in zip(records, statuses)],
+    )
+    connection.commit()
+    connection.close()
+
+def test_encoder_update_matches_fit_on_all_rows():
+    supply = make_synthetic_supply(600)
+    X, y = supply[["State", "Client_Type"]], supply["Delivery_Status"]
+    encoder = CatBoostEncoder().fit(X.iloc[:400], y.iloc[:400])
+    update_target_encoder(encoder, X.iloc[400:], y.iloc[400:])
+    reference = CatBoostEncoder().fit(X, y)
+    assert np.isclose(encoder._mean, reference._mean)
+    pd.testing.assert_frame_equal(encoder.transform(X), reference.transform(X))
+
+def test_task_warm_starts_then_refits_on_drift(tmp_path):
+    database = str(tmp_path / "logistik.db")
+    make_table(database)
+    supply = make_synthetic_supply(1000)
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"]
+    cat_cols = x.select_dtypes(include="object").columns.tolist()
+    models = {
+        "random_forest": build_standin_model(n_rows=1000, n_estimators=20),
+        "catboost": CatBoostClassifier(iterations=20, verbose=0, allow_writing_files=False).fit(x, y, cat_features=cat_cols),
+    }
+    refits = []
+    watermark = Watermark(str(tmp_path / "state.json"))
+    task = RetrainingTask(
+        table_source(lambda: sqlite3.connect(database), watermark.load(), placeholder="?"),
+        watermark,
+        models,
+        supply,
+        full_refit=lambda rows: refits.append(len(rows)) or models,
+        min_rows=200,
+        extra_trees=5,
+        extra_iterations=10,
+    )
+
+    insert_rows(database, sample_records(150, seed=1), ["On Time", "Late", "Unknown"] * 50)
+    assert task.run_once()["mode"] == "skipped"
+    assert watermark.load() == 0
+
+    insert_rows(database, sample_records(150, seed=2), ["On Time", "Late"] * 75)
+    summary = task.run_once()
+    assert summary["mode"] == "incremental" and summary["rows"] == 250
+    assert summary["methods"] == {"random_forest": "warm_start", "catboost": "init_model"}
+    assert len(task.models["random_forest"].named_steps["classifier"].estimators_) == 25
+    assert task.models["catboost"].tree_count_ == 30
+    assert watermark.load() == 300
+
+    drifted = [dict(record, Distance_Km=1400.0, State="Texas") for record in sample_records(300, seed=3)]
+    insert_rows(database, drifted, ["Late"] * 300)
+    assert task.run_once()["mode"] == "full"
+    assert refits == [300] and watermark.load() == 600
+
+def test_only_observed_statuses_are_learned_and_hold_the_watermark(tmp_path):
+    database = str(tmp_path / "logistik.db")
+    make_table(database)
+    insert_rows(database, sample_records(20, seed=6), ["On Time"] * 10 + [None] * 5 + ["On Time"] * 5)
+    source = table_source(lambda: sqlite3.connect(database), placeholder="?")
+
+    # Prédictions de l'API ("Late") ignorées : la cible est le statut observé
+    rows = collect_rows(source)
+    assert len(rows) == 10 and set(rows["Delivery_Status"]) == {0}
+    assert source.last_id == 10 and "id" not in rows
+
+    assert len(collect_rows(source)) == 0 and source.last_id == 10
+    connection = sqlite3.connect(database)
+    connection.execute("UPDATE logistic_chain SET actual_status = 'Late' WHERE actual_status IS NULL")
+    connection.commit()
+    connection.close()
+    rows = collect_rows(source)
+    assert list(rows["Delivery_Status"]) == [1] * 5 + [0] * 5 and source.last_id == 20
+
+def test_collector_writes_typed_day_partitions_and_resumes(tmp_path):
+    database = str(tmp_path / "logistik.db")
+    make_table(database)
+    connection = sqlite3.connect(database)
+    connection.execute("ALTER TABLE logistic_chain ADD COLUMN created_at TEXT")
+    connection.commit()
+    connection.close()
+    insert_rows(database, sample_records(250, seed=4), ["On Time", "Late"] * 125)
+    connection = sqlite3.connect(database)
+    connection.execute("UPDATE logistic_chain SET created_at = CASE WHEN id <= 120 THEN '2026-01-01 10:00:00' ELSE '2026-01-02 08:30:00' END")
+    connection.commit()
+    connection.close()
+
+    root = str(tmp_path / "collected")
+    watermark = Watermark(str(tmp_path / "collect.json"))
+    collector = ChunkedCollector(lambda: sqlite3.connect(database), root, watermark, chunk_size=100,
+                                 placeholder="?", partition_column="created_at")
+    stats = collector.collect(max_rows=100)
+    assert stats["rows"] == 100 and watermark.load() == 100
+    stats = collector.collect()
+    assert stats["rows"] == 150 and stats["rows_per_second"] > 0 and stats["process_peak_rss_mb"] > 0
+    # Bloc 101-200 à cheval sur deux jours : un fichier par jour
+    assert stats["files"] == 3
+    assert sorted(os.listdir(root)) == ["day=2026-01-01", "day=2026-01-02"]
+
+    frame = load_collected(root)
+    assert len(frame) == 250 and frame["id"].is_unique
+    assert frame["Distance_Km"].dtype == np.float64
+    assert isinstance(frame["State"].dtype, pd.CategoricalDtype)
+    later = pd.concat(iter_collected(root, columns=["id", "Delivery_Status"], since="2026-01-02", batch_size=50))
+    assert sorted(later["id"]) == list(range(121, 251))
+
+    # Ligne sans statut observé : la copie s'arrête avant elle
+    insert_rows(database, sample_records(3, seed=5), ["Late", None, "Late"])
+    connection = sqlite3.connect(database)
+    connection.execute("UPDATE logistic_chain SET created_at = '2026-01-03 09:00:00' WHERE created_at IS NULL")
+    connection.commit()
+    connection.close()
+    assert collector.collect()["rows"] == 1 and watermark.load() == 251
+
+def test_training_loader_adds_collected_partitions(tmp_path, monkeypatch):
+    supply = make_synthetic_supply(300)
+    supply.to_csv(tmp_path / "dataset.csv", index=False)
+    database = str(tmp_path / "logistik.db")
+    make_table(database)
+    insert_rows(database, sample_records(40, seed=8), ["Late", "Unknown"] * 20)
+    root = str(tmp_path / "collected")
+    ChunkedCollector(lambda: sqlite3.connect(database), root, Watermark(str(tmp_path / "collect.json")), placeholder="?").collect()
+    monkeypatch.setattr(settings, "DATASET_PATH", str(tmp_path / "dataset.csv"))
+    monkeypatch.setattr(settings, "DATASET_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings, "COLLECT_DIR", root)
+
+    x_train, x_test, y_train, y_test, combined = load_and_encode_data(include_collected=True)
+    assert len(combined) == 320 and len(x_train) + len(x_test) == 320
+    assert int(combined["Delivery_Status"].iloc[300:].sum()) == 20
+    assert isinstance(combined["State"].dtype, pd.CategoricalDtype)
@@ -0,0 +1,60 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import joblib
+import pandas as pd
+
+from app.schema import sample_records
+from benchmarks.common import build_standin_model
+from score import score_file, validate_chunk
+
+def write_input(path, n=230):
+    frame = pd.DataFrame(sample_records(n, seed=3))
+    frame.insert(0, "Shipment_Id", [f"S{i:04d}" for i in range(n)])
+    frame.loc[5, "State"] = "Mars"
+    frame.loc[120, "Distance_Km"] = 99999
+    frame["Transportation_Cost"] = frame["Transportation_Cost"].astype(object)
+    frame.loc[200, "Transportation_Cost"] = "n/a"
+    frame.to_csv(path, index=False)
+    return frame
+
+def test_validation_matches_schema_constraints():
+    frame = pd.DataFrame(sample_records(4, seed=1))
+    frame.loc[1, "Weather_Condition"] = "Hail"
+    frame.loc[2, "Distance_Km"] = 1379.99
+    valid, reasons = validate_chunk(frame)
+    assert list(valid.index) == [0, 3]
+    assert reasons.to_dict() == {1: "Weather_Condition inconnu", 2: "Distance_Km hors de [1380, 4450)"}
+
+def test_scoring_streams_chunks_in_order_with_a_process_pool(tmp_path):
+    source = write_input(tmp_path / "shipments.csv")
+    model_path = tmp_path / "model.joblib"
+    model = build_standin_model("logistic", n_rows=500)
+    joblib.dump(model, model_path)
+
+    output, rejects = tmp_path / "scored.parquet", tmp_path / "rejects.parquet"
+    stats = score_file(str(tmp_path / "shipments.csv"), str(output), str(model_path), chunk_size=50, workers=2,
+                       id_columns=["Shipment_Id"], rejects_path=str(rejects))
+    assert (stats["rows"], stats["scored"], stats["rejected"], stats["chunks"]) == (230, 227, 3, 5)
+
+    scored = pd.read_parquet(output)
+    assert scored["Row"].tolist() == [i for i in range(230) if i not in (5, 120, 200)]
+    assert scored["Shipment_Id"].tolist() == source.loc[scored["Row"], "Shipment_Id"].tolist()
+    expected = model.predict(source.loc[scored["Row"]].drop(columns=["Shipment_Id"]).astype({"Transportation_Cost": float}))
+    assert scored["Code"].tolist() == expected.tolist()
+    assert pd.read_parquet(rejects)["Row"].tolist() == [5, 120, 200]
+
+def test_first_chunk_fully_rejected_keeps_the_output_schema(tmp_path):
+    frame = pd.DataFrame(sample_records(20, seed=8))
+    frame.loc[:9, "State"] = "Mars"
+    frame.to_csv(tmp_path / "shipments.csv", index=False)
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(build_standin_model("logistic", n_rows=300), model_path)
+
+    output = tmp_path / "scored.parquet"
+    stats = score_file(str(tmp_path / "shipments.csv"), str(output), str(model_path), chunk_size=10, workers=1)
+    assert (stats["scored"], stats["rejected"]) == (10, 10)
+    scored = pd.read_parquet(output)
+    assert scored["Row"].tolist() == list(range(10, 20)) and scored["State"].dtype == object
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
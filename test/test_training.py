@@ -0,0 +1,49 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from train_pipeline.config import settings
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+from train_pipeline.training import build_search, halving_budget, train_models
+from train_pipeline.catboost_ml import train_catboost
+
+def test_preprocessing_is_fitted_once_per_fold_for_all_candidates(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "N_ITER", 2)
+    monkeypatch.setattr(settings, "N_SPLITE", 2)
+    monkeypatch.setattr(settings, "PREPROCESSING_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "PREPROCESSING_CACHE_DIR", str(tmp_path))
+    supply = make_synthetic_supply(300)
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"]
+
+    best_models = train_models(x, y, get_preprocessor(supply))
+
+    # Un ajustement par pli, plus le réentraînement final, partagés par les deux modèles
+    fitted = [dirs for root, dirs, _ in os.walk(tmp_path) if root.endswith("_fit_transform_one")][0]
+    assert len(fitted) == settings.N_SPLITE + 1
+    for model in best_models.values():
+        assert model.memory is None
+        assert len(model.predict(x)) == len(x)
+
+def test_halving_strategy_budgets_trees_and_catboost_iterations(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_STRATEGY", "halving")
+    monkeypatch.setattr(settings, "HALVING_RESOURCE", "n_estimators")
+    monkeypatch.setattr(settings, "N_ITER", 9)
+    monkeypatch.setattr(settings, "N_SPLITE", 2)
+    grid, resource, max_resources = halving_budget("random_forest", {
+        "classifier__n_estimators": [100, 200, 300],
+        "classifier__max_depth": [3, 6, 10],
+        "classifier__min_samples_split": [2, 5, 10],
+    })
+    assert resource == "classifier__n_estimators" and max_resources == 300
+    assert "classifier__n_estimators" not in grid
+
+    supply = make_synthetic_supply(600)
+    x, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"].to_numpy()
+    cat_cols = x.select_dtypes(include="object").columns.tolist()
+    monkeypatch.setattr(settings, "CATBOOST_ITERATIONS", 90)
+    model = train_catboost(x, y, cat_cols)
+    # Trois tours (9 -> 3 -> 1 candidats), puis arrêt anticipé sur le pool de validation
+    assert model.get_params()["iterations"] == 90
+    assert model.tree_count_ <= 90
+    assert build_search(None, {}, 2).n_candidates == 9
@@ -0,0 +1,67 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+from catboost import CatBoostClassifier, Pool
+
+from app.schema import sample_records
+from app.model_loader import load_model_from_uri
+from app.predictor import make_prediction
+from app.tree_engine import ForestArrays, ObliviousForest, compile_numpy_model, export_shared_model
+from train_pipeline.preprocessing import get_preprocessor
+from train_pipeline.synthetic import make_synthetic_supply
+
+def build_pipeline():
+    supply = make_synthetic_supply(800)
+    pipe = Pipeline([
+        ('preprocessing', get_preprocessor(supply)),
+        ('classifier', RandomForestClassifier(n_estimators=25, random_state=0)),
+    ])
+    return pipe.fit(supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"])
+
+def test_forest_arrays_match_sklearn_exactly():
+    X = np.random.RandomState(0).normal(size=(300, 4))
+    y = (X[:, 0] + X[:, 1] ** 2 > 0.5).astype(int)
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+    arrays = ForestArrays.from_sklearn(forest)
+    assert np.array_equal(arrays.predict_proba(X), forest.predict_proba(X))
+    assert np.array_equal(arrays.predict(X), forest.predict(X))
+
+def test_shared_model_is_memory_mapped(tmp_path):
+    pipe = build_pipeline()
+    export_shared_model(pipe, str(tmp_path))
+    shared, model_type = load_model_from_uri(str(tmp_path))
+    assert model_type == "Shared"
+
+    forest = shared.named_steps["classifier"]
+    assert all(isinstance(getattr(forest, name), np.memmap) for name in ("feature", "threshold", "value"))
+
+    batch = pd.DataFrame(sample_records(200))
+    assert np.array_equal(shared.predict_proba(batch), pipe.predict_proba(batch))
+
+def test_numpy_engine_replaces_forest_pipeline():
+    pipe = build_pipeline()
+    compiled = compile_numpy_model(pipe)
+    assert isinstance(compiled.named_steps["classifier"], ForestArrays)
+    record = sample_records(1)[0]
+    assert make_prediction(compiled, "NumPy", record) == make_prediction(pipe, "MLflow", record)
+
+def test_oblivious_forest_matches_catboost(tmp_path):
+    supply = make_synthetic_supply(1500)
+    X, y = supply.drop(columns=["Delivery_Status"]), supply["Delivery_Status"]
+    cat_cols = X.select_dtypes(include="object").columns.tolist()
+    model = CatBoostClassifier(iterations=60, depth=6, verbose=0, random_seed=42, allow_writing_files=False)
+    model.fit(Pool(X, y, cat_features=cat_cols))
+
+    ObliviousForest.from_catboost(model).save(str(tmp_path))
+    forest, model_type = load_model_from_uri(str(tmp_path))
+    assert model_type == "Shared"
+
+    batch = pd.DataFrame(sample_records(500, seed=5))
+    assert np.array_equal(forest.leaves(batch), model.calc_leaf_indexes(Pool(batch, cat_features=cat_cols)))
+    assert np.array_equal(forest.decision_function(batch), model.predict(batch, prediction_type="RawFormulaVal"))
+    assert np.array_equal(forest.predict(batch), model.predict(batch))
@@ -1,14 +1,15 @@
 # 📦 Importation des bibliothèques
 import os
 import mlflow
-import bentoml
 import logging
-import pandas as pd
 from dotenv import load_dotenv
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.metrics import accuracy_score, recall_score
 from catboost import CatBoostClassifier, Pool
 from sklearn.preprocessing import LabelEncoder
+from train_pipeline.config import settings
+from train_pipeline.dataset import load_dataset
+from train_pipeline.training import build_search
 
 # 🌍 Variables d'environnement
 load_dotenv()
@@ -20,41 +21,68 @@ mlflow_tracking = os.getenv("MFLOW_TRACKING_URI")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 📥 Chargement des données
-data = pd.read_excel(dataset_path)
-logger.info("✅ Données chargées")
-
-# 🧪 Séparation features / cible
-X = data.drop(columns=["Delivery_Status"])
-y = LabelEncoder().fit_transform(data["Delivery_Status"])
-
-# 🔍 Identifier les colonnes catégorielles
-cat_cols = X.select_dtypes(include="object").columns.tolist()
-X[cat_cols] = X[cat_cols].fillna('missing')
+# 🔍 Espace de recherche (stratégie "halving" : le budget est le nombre d'itérations)
+param_dist = {
+    "depth": [4, 6, 8],
+    "learning_rate": [0.03, 0.1, 0.3],
+    "l2_leaf_reg": [1, 3, 10],
+}
 
-# ✂️ Split entraînement / test
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+# 📥 Chargement des données
+def load_catboost_data(path=None):
+    data = load_dataset(path or dataset_path)
+    logger.info("✅ Données chargées")
 
-# ✅ Remplacer les NaN dans les colonnes catégorielles pour chaque split
-X_train.loc[:, cat_cols] = X_train[cat_cols].fillna('missing')
-X_test.loc[:, cat_cols] = X_test[cat_cols].fillna('missing')
+    # 🧪 Séparation features / cible
+    X = data.drop(columns=["Delivery_Status"])
+    y = LabelEncoder().fit_transform(data["Delivery_Status"])
 
-# 🎯 Initialisation du modèle CatBoost
-model = CatBoostClassifier(
-    iterations=300,
-    learning_rate=0.1,
-    depth=6,
-    verbose=0,
-    random_seed=42
-)
+    # 🔍 Identifier les colonnes catégorielles
+    cat_cols = X.select_dtypes(include=["object", "category"]).columns.tolist()
+    X[cat_cols] = X[cat_cols].astype(object).fillna('missing')
 
-# 📦 Création du Pool avec informations de colonnes catégorielles
-train_pool = Pool(X_train, y_train, cat_features=cat_cols)
-test_pool = Pool(X_test, y_test, cat_features=cat_cols)
+    # ✂️ Split entraînement / test
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return X_train, X_test, y_train, y_test, cat_cols
 
 # 🏋️‍♂️ Entraînement du modèle
-model.fit(train_pool)
-logger.info("✅ Modèle CatBoost entraîné")
+def train_catboost(X_train, y_train, cat_cols, thread_count=-1):
+    if settings.SEARCH_STRATEGY != "halving":
+        # 🎯 Configuration fixe
+        model = CatBoostClassifier(
+            iterations=settings.CATBOOST_ITERATIONS,
+            learning_rate=0.1,
+            depth=6,
+            verbose=0,
+            random_seed=42,
+            thread_count=thread_count
+        )
+        # 📦 Création du Pool avec informations de colonnes catégorielles
+        model.fit(Pool(X_train, y_train, cat_features=cat_cols))
+        logger.info("✅ Modèle CatBoost entraîné")
+        return model
+
+    # ✂️ Pool de validation pour l'arrêt anticipé, hors des plis de la recherche
+    X_fit, X_valid, y_fit, y_valid = train_test_split(X_train, y_train, test_size=0.2, random_state=42, stratify=y_train)
+    model = CatBoostClassifier(
+        iterations=settings.CATBOOST_ITERATIONS,
+        cat_features=cat_cols,
+        verbose=0,
+        random_seed=42,
+        allow_writing_files=False,
+        thread_count=thread_count
+    )
+    cv = StratifiedKFold(n_splits=settings.N_SPLITE, shuffle=True, random_state=settings.RANDOM_STATE)
+    # CatBoost parallélise lui-même : recherche séquentielle
+    search = build_search(model, param_dist, cv, "iterations", settings.CATBOOST_ITERATIONS, n_jobs=1)
+    search.fit(
+        X_fit,
+        y_fit,
+        eval_set=Pool(X_valid, y_valid, cat_features=cat_cols),
+        early_stopping_rounds=settings.EARLY_STOPPING_ROUNDS,
+    )
+    logger.info(f"✅ Modèle CatBoost entraîné (réduction successive) : {search.best_params_}")
+    return search.best_estimator_
 
 # 📈 Fonction de prédiction + tracking MLflow + enregistrement
 def predict_log_save(model, test_pool, y_test, model_name):
@@ -76,24 +104,23 @@ def predict_log_save(model, test_pool, y_test, model_name):
             logger.info(f"✅ Modèle {model_name} loggé dans MLflow")
 
             # 📦 Enregistrement dans le Registry
-            model_uri = f"run:/{mlflow.active_run().info.run_id}/{model_name}"
+            model_uri = f"runs:/{mlflow.active_run().info.run_id}/{model_name}"
             result = mlflow.register_model(model_uri=model_uri, name=model_name)
+            logger.info(f"📌 Modèle {model_name} v{result.version} enregistré dans le Model Registry (challenger)")
 
-            client = mlflow.tracking.MlflowClient()
-            client.transition_model_version_stage(
-                name=model_name,
-                version=result.version,
-                stage="Production",
-                archive_existing_versions=True
-            )
-            logger.info(f"🎯 Modèle {model_name} promu en Production dans le Model Registry")
-
-            # 🥡 Sauvegarde avec BentoML
-            bentoml.catboost.save_model(model_name, model)
-            logger.info(f"✅ Modèle {model_name} sauvegardé avec BentoML")
+            # 🥡 BentoML : sauvegarde après promotion seulement (retrain.models_comparator)
+            return result.version
 
     except Exception as e:
         logger.error(f"❌ Erreur pendant le logging de {model_name} : {e}")
 
 # 🚀 Exécution de la fonction
-predict_log_save(model, test_pool, y_test, model_name="catboost_delivery_status")
\ No newline at end of file
+if __name__ == "__main__":
+    X_train, X_test, y_train, y_test, cat_cols = load_catboost_data()
+    model = train_catboost(X_train, y_train, cat_cols)
+    test_pool = Pool(X_test, y_test, cat_features=cat_cols)
+    version = predict_log_save(model, test_pool, y_test, model_name="catboost_delivery_status")
+    if version is not None:
+        from retrain.models_comparator import promote_candidates
+
+        promote_candidates({"catboost_delivery_status": (model, version)}, X_test, y_test)
\ No newline at end of file
@@ -10,5 +10,48 @@ class Settings:
     RANDOM_STATE = 42
     TEST_SIZE = 0.2
     N_SPLITE= 5
+    N_ITER = int(os.getenv("N_ITER", "20"))
+    # Stratégie de recherche : "random" (RandomizedSearchCV) ou "halving" (réduction successive)
+    SEARCH_STRATEGY = os.getenv("SEARCH_STRATEGY", "random")
+    # Budget de la réduction successive pour la forêt : "n_samples" (fraction des données) ou "n_estimators"
+    HALVING_RESOURCE = os.getenv("HALVING_RESOURCE", "n_samples")
+    HALVING_FACTOR = int(os.getenv("HALVING_FACTOR", "3"))
+    # CatBoost : itérations maximales et arrêt anticipé sur le pool de validation
+    CATBOOST_ITERATIONS = int(os.getenv("CATBOOST_ITERATIONS", "300"))
+    EARLY_STOPPING_ROUNDS = int(os.getenv("EARLY_STOPPING_ROUNDS", "30"))
+    # Orchestrateur : familles entraînées en parallèle et budget CPU global (0 = tous les cœurs)
+    TRAIN_FAMILIES = [name.strip() for name in os.getenv("TRAIN_FAMILIES", "logistic,random_forest").split(",") if name.strip()]
+    TRAIN_CPU_BUDGET = int(os.getenv("TRAIN_CPU_BUDGET", "0"))
+    # Entraînement continu (ct_training.py) : filigrane, seuils et budgets de la mise à jour à chaud
+    RETRAIN_STATE_PATH = os.getenv("RETRAIN_STATE_PATH", "retrain_state.json")
+    RETRAIN_MIN_ROWS = int(os.getenv("RETRAIN_MIN_ROWS", "500"))
+    RETRAIN_PSI_THRESHOLD = float(os.getenv("RETRAIN_PSI_THRESHOLD", "0.2"))
+    RETRAIN_EXTRA_TREES = int(os.getenv("RETRAIN_EXTRA_TREES", "50"))
+    RETRAIN_EXTRA_ITERATIONS = int(os.getenv("RETRAIN_EXTRA_ITERATIONS", "100"))
+    RETRAIN_INTERVAL_SECONDS = float(os.getenv("RETRAIN_INTERVAL_SECONDS", "3600"))
+    # Statut de livraison observé (colonne de logistic_chain renseignée après la livraison, jamais par l'API) :
+    # delivery_status contient la prédiction du modèle et ne sert pas de cible
+    RETRAIN_LABEL_COLUMN = os.getenv("RETRAIN_LABEL_COLUMN", "actual_status")
+    # Collecte de logistic_chain en Parquet partitionné par jour (python -m retrain.data_collect)
+    COLLECT_DIR = os.getenv("COLLECT_DIR", "data/collected")
+    COLLECT_STATE_PATH = os.getenv("COLLECT_STATE_PATH", "collect_state.json")
+    COLLECT_CHUNK_SIZE = int(os.getenv("COLLECT_CHUNK_SIZE", "10000"))
+    COLLECT_PARTITION_COLUMN = os.getenv("COLLECT_PARTITION_COLUMN") or None
+    # Entraînement complet (model.py) : lignes collectées au statut observé ajoutées au dataset DVC
+    TRAIN_INCLUDE_COLLECTED = os.getenv("TRAIN_INCLUDE_COLLECTED", "false").lower() == "true"
+    TRAIN_COLLECTED_SINCE = os.getenv("TRAIN_COLLECTED_SINCE") or None
+    # Promotion champion/challenger (retrain.models_comparator) : objectif qualité/latence
+    PROMOTION_METRIC = os.getenv("PROMOTION_METRIC", "f1")
+    PROMOTION_MIN_GAIN = float(os.getenv("PROMOTION_MIN_GAIN", "0.0"))
+    PROMOTION_MAX_LATENCY_RATIO = float(os.getenv("PROMOTION_MAX_LATENCY_RATIO", "1.1"))
+    PROMOTION_LATENCY_BUDGET_MS = float(os.getenv("PROMOTION_LATENCY_BUDGET_MS", "0"))
+    COMPARATOR_LATENCY_SAMPLES = int(os.getenv("COMPARATOR_LATENCY_SAMPLES", "200"))
+    COMPARATOR_BATCH_SIZE = int(os.getenv("COMPARATOR_BATCH_SIZE", "256"))
+    # Cache disque des prétraitements ajustés par pli (joblib.Memory, taille bornée)
+    PREPROCESSING_CACHE_ENABLED = os.getenv("PREPROCESSING_CACHE_ENABLED", "true").lower() == "true"
+    PREPROCESSING_CACHE_DIR = os.getenv("PREPROCESSING_CACHE_DIR", ".preprocessing_cache")
+    PREPROCESSING_CACHE_MB = int(os.getenv("PREPROCESSING_CACHE_MB", "512"))
+    # Cache colonnaire du dataset (Feather, clé md5 de la source)
+    DATASET_CACHE_DIR = os.getenv("DATASET_CACHE_DIR", ".dataset_cache")
 
 settings = Settings()
\ No newline at end of file
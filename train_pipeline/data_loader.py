@@ -1,14 +1,28 @@
 # Importations des bibliothèques nécessaires
+import os
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 from .config import settings
+from .dataset import load_dataset, optimize_dtypes
 
 # ====== IMPORTATION ET ENCODAGE DE LA LABEL ======
-def load_and_encode_data():
+def load_and_encode_data(include_collected=None):
+    """
+    :param include_collected: Ajoute les partitions Parquet de COLLECT_DIR (python -m retrain.data_collect)
+        au dataset DVC ; par défaut TRAIN_INCLUDE_COLLECTED.
+    """
     # Chargement des données
-    supply = pd.read_excel(settings.DATASET_PATH)
+    supply = load_dataset(settings.DATASET_PATH)
     print("Jeu de données importé✅✅")
+    if include_collected is None:
+        include_collected = settings.TRAIN_INCLUDE_COLLECTED
+    if include_collected and os.path.isdir(settings.COLLECT_DIR):
+        from retrain.data_collect import collected_training_rows
+
+        collected = collected_training_rows(settings.COLLECT_DIR, settings.TRAIN_COLLECTED_SINCE)
+        supply = optimize_dtypes(pd.concat([supply, collected.reindex(columns=supply.columns)], ignore_index=True))
+        print(f"{len(collected)} lignes collectées ajoutées✅")
 
     # Séparation des caractéristiques et de la cible
     x = supply.drop(columns=["Delivery_Status"])  # Features
@@ -0,0 +1,89 @@
+# Importation des bibliothèques nécessaires
+import os
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from app.schema import categorical_fields
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# ====== EMPREINTE DE LA SOURCE ======
+def file_md5(path, chunk_size=1 << 20) -> str:
+    # Même empreinte que dataset.dvc : le cache change dès que le contenu du fichier change
+    digest = hashlib.md5()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_source(path) -> pd.DataFrame:
+    if str(path).lower().endswith(".csv"):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+# ====== TYPES COMPACTS ======
+def optimize_dtypes(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Colonnes Enum de LogistikData en category (vocabulaire du schéma, puis modalités inconnues),
+    entiers réduits au plus petit type, flottants en float32 seulement si la conversion est exacte.
+    """
+    frame = frame.copy()
+    for col, enum in categorical_fields().items():
+        if col not in frame:
+            continue
+        values = [member.value for member in enum]
+        extra = sorted(set(frame[col].dropna().astype(str)) - set(values))
+        frame[col] = pd.Categorical(frame[col], categories=values + extra)
+    for col in frame.select_dtypes(include="integer").columns:
+        frame[col] = pd.to_numeric(frame[col], downcast="integer")
+    for col in frame.select_dtypes(include="floating").columns:
+        values = frame[col].to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+            frame[col] = narrowed
+    return frame
+
+# ====== CACHE COLONNAIRE ======
+def write_frame(frame: pd.DataFrame, target):
+    from pyarrow import feather
+
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    # Écriture atomique : un lecteur concurrent ne voit jamais un fichier partiel
+    temporary = f"{target}.{os.getpid()}.tmp"
+    feather.write_feather(frame, temporary, compression="uncompressed")
+    os.replace(temporary, target)
+
+def map_frame(path, columns=None, memory_map=True) -> pd.DataFrame:
+    # Colonnes numériques sans copie (split_blocks) : les pages du fichier sont partagées entre processus
+    from pyarrow import feather
+
+    return feather.read_table(path, columns=columns, memory_map=memory_map).to_pandas(split_blocks=True)
+
+def cache_path(path, cache_dir=None) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir or settings.DATASET_CACHE_DIR, f"{stem}-{file_md5(path)}.feather")
+
+def load_dataset(path=None, columns=None, memory_map=True, cache_dir=None) -> pd.DataFrame:
+    """
+    Charge le dataset DVC depuis un cache Feather, converti une seule fois depuis la source Excel.
+
+    :param path: Fichier source ; par défaut TRAIN_DATASET_PATH.
+    :param columns: Colonnes à lire (seules celles-ci sont lues du cache).
+    :param memory_map: Lecture du cache par mappage mémoire plutôt que par copie du fichier.
+    :param cache_dir: Dossier du cache ; par défaut DATASET_CACHE_DIR.
+    """
+    path = path or settings.DATASET_PATH
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        logger.warning("⚠️ pyarrow absent : lecture directe de la source, sans cache")
+        frame = optimize_dtypes(read_source(path))
+        return frame[columns] if columns is not None else frame
+
+    target = cache_path(path, cache_dir)
+    if not os.path.exists(target):
+        write_frame(optimize_dtypes(read_source(path)), target)
+        logger.info(f"💾 Dataset converti en cache colonnaire : {target}")
+    return map_frame(target, columns, memory_map)
@@ -0,0 +1,104 @@
+# Importation des bibliothèques nécessaires
+import os
+import time
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from threadpoolctl import threadpool_limits
+from .config import settings
+from .dataset import map_frame, write_frame
+from .training import build_models, cpu_seconds
+
+TARGET_COLUMN = "__target__"
+
+# ====== BUDGET CPU ======
+def cpu_shares(families, budget) -> dict:
+    # Répartition des cœurs : au moins un par famille, le reste aux premières familles
+    share, extra = divmod(budget, len(families))
+    return {name: max(1, share + (i < extra)) for i, name in enumerate(families)}
+
+def settings_snapshot() -> dict:
+    # Paramètres courants transmis aux processus (surcharges comprises)
+    return {key: getattr(settings, key) for key in dir(settings) if key.isupper()}
+
+# ====== ENTRAINEMENT D'UNE FAMILLE (PROCESSUS ENFANT) ======
+def run_family(name, data_path, n_jobs, overrides) -> dict:
+    for key, value in overrides.items():
+        setattr(settings, key, value)
+    # Threads BLAS / OpenMP limités à la part de la famille : le budget CPU global est respecté
+    threadpool_limits(n_jobs)
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    # Matrice d'entraînement mappée : les colonnes numériques pointent sur les pages partagées du fichier
+    frame = map_frame(data_path)
+    y_train = frame.pop(TARGET_COLUMN).to_numpy()
+
+    if name == "catboost":
+        from .catboost_ml import train_catboost
+
+        cat_cols = frame.select_dtypes(include=["object", "category"]).columns.tolist()
+        frame[cat_cols] = frame[cat_cols].astype(object).fillna('missing')
+        model = train_catboost(frame, y_train, cat_cols, thread_count=n_jobs)
+    else:
+        from .preprocessing import get_preprocessor
+        from .training import train_family
+
+        model = train_family(name, frame, y_train, get_preprocessor(frame.assign(Delivery_Status=y_train)), n_jobs=n_jobs)
+    # process_cpu_s : CPU cumulé du processus depuis son lancement (démarrage spawn et imports compris)
+    return {
+        "model": model,
+        "wall_s": time.perf_counter() - wall,
+        "cpu_s": cpu_seconds() - cpu,
+        "n_jobs": n_jobs,
+        "pid": os.getpid(),
+        "process_cpu_s": cpu_seconds(),
+    }
+
+# ====== ORCHESTRATEUR ======
+def train_all_families(x_train, y_train, families=None, cpu_budget=None):
+    """
+    Entraîne toutes les familles de modèles en parallèle sous un budget CPU global.
+
+    La matrice d'entraînement est écrite une seule fois en Feather non compressé ; chaque famille
+    tourne dans son propre processus et la relit par mappage mémoire au lieu de la recevoir
+    sérialisée. Le budget (TRAIN_CPU_BUDGET, par défaut tous les cœurs) est réparti entre les
+    familles : workers joblib de la recherche, ou threads CatBoost.
+
+    :param families: Noms parmi logistic, random_forest, catboost ; par défaut TRAIN_FAMILIES.
+    :return: ({famille: meilleur modèle}, rapport des temps et de l'utilisation des cœurs).
+    """
+    families = list(families or settings.TRAIN_FAMILIES)
+    unknown = set(families) - set(build_models()) - {"catboost"}
+    if unknown:
+        raise ValueError(f"Familles de modèles inconnues : {sorted(unknown)}")
+    budget = cpu_budget or settings.TRAIN_CPU_BUDGET or os.cpu_count() or 1
+    shares = cpu_shares(families, budget)
+
+    best_models, report, pool_cpu = {}, {"cpu_budget": budget, "families": {}}, {}
+    # CPU total = orchestrateur seul + CPU cumulé de chaque processus du pool (workers compris), une fois
+    # par processus : aucun processus compté à la fois comme enfant vivant et comme enfant terminé
+    wall, cpu = time.perf_counter(), cpu_seconds(children=False)
+    with tempfile.TemporaryDirectory() as directory:
+        data_path = os.path.join(directory, "train.feather")
+        write_frame(x_train.assign(**{TARGET_COLUMN: y_train}).reset_index(drop=True), data_path)
+        # spawn : processus neufs, sans les threads ni les pools joblib du parent
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(len(families), budget), mp_context=context) as executor:
+            futures = {
+                executor.submit(run_family, name, data_path, shares[name], settings_snapshot()): name
+                for name in families
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                result = future.result()
+                best_models[name] = result.pop("model")
+                # Processus réutilisé pour plusieurs familles : son dernier cumul englobe les précédents
+                pid, process_cpu = result.pop("pid"), result.pop("process_cpu_s")
+                pool_cpu[pid] = max(pool_cpu.get(pid, 0.0), process_cpu)
+                report["families"][name] = result
+                print(f"⏱️ {name} : {result['wall_s']:.1f}s (horloge), {result['cpu_s']:.1f}s (CPU), {result['n_jobs']} cœur(s)")
+        report["cpu_s"] = cpu_seconds(children=False) - cpu + sum(pool_cpu.values())
+
+    report["wall_s"] = time.perf_counter() - wall
+    report["core_utilization"] = report["cpu_s"] / (report["wall_s"] * budget) if report["wall_s"] else 0.0
+    print(f"⏱️ Orchestrateur : {report['wall_s']:.1f}s, utilisation des {budget} cœur(s) : {report['core_utilization']:.0%}")
+    return best_models, report
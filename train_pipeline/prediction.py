@@ -1,18 +1,19 @@
 # Importation des bibliothèques nécessaires
 import mlflow
-import bentoml
 from .config import settings
 from sklearn.metrics import accuracy_score, f1_score, recall_score
 
 def log_and_save_models(best_models, x_test, y_test):
     """
-    Fonction pour enregistrer les modèles dans MLflow et BentoML.
+    Fonction pour enregistrer les modèles dans MLflow (BentoML après promotion, retrain.models_comparator).
     
     :param best_models: Dictionnaire des meilleurs modèles entraînés.
     :param x_test: Données de test pour évaluer les modèles.
     :param y_test: Cibles de test pour évaluer les modèles.
+    :return: {nom: (modèle, version enregistrée)} ; la promotion revient à retrain.models_comparator.
     """
     mlflow.set_experiment(settings.EXPERIMENT_NAME)
+    registered = {}
     
     for model_name, model in best_models.items():
         try:
@@ -35,21 +36,12 @@ def log_and_save_models(best_models, x_test, y_test):
                 print(f"✅ Modèle {model_name} enregistré avec MLflow.")
 
                 # Enregistrement du modèle dans le Model Registry
-                model_uri = f"run:/{mlflow.active_run().info.run_id}/{model_name}"
+                model_uri = f"runs:/{mlflow.active_run().info.run_id}/{model_name}"
                 result = mlflow.register_model(model_uri=model_uri, name=model_name)
-
-                client = mlflow.tracking.MlflowClient()
-                client.transition_model_version_stage(
-                    name=model_name,
-                    version=result.version,
-                    stage="Production",
-                    archive_existing_versions=True
-                )
-                print(f"🎯 {model_name} promu en Production dans le Model Registry.")
-
-            # Enregistrement avec BentoML
-            bentoml.sklearn.save_model(model_name, model)
-            print(f"💾 Modèle {model_name} sauvegardé avec BentoML.")
+                registered[model_name] = (model, result.version)
+                print(f"📌 {model_name} v{result.version} enregistré dans le Model Registry (challenger).")
 
         except Exception as e:
-            print(f"⚠️ Erreur lors de l'enregistrement du modèle {model_name}: {e}")
\ No newline at end of file
+            print(f"⚠️ Erreur lors de l'enregistrement du modèle {model_name}: {e}")
+
+    return registered
@@ -9,8 +9,9 @@ from category_encoders import CatBoostEncoder
 def get_preprocessor(supply):
     # Séparation des types de données
     features = supply.drop(columns=["Delivery_Status"])
-    num_col = features.select_dtypes(include=["int64", "float64"]).columns.tolist()
-    cat_col = features.select_dtypes(include=["object"]).columns.tolist()
+    # Types compacts du cache (train_pipeline.dataset) : entiers/flottants réduits et category
+    num_col = features.select_dtypes(include=["number"]).columns.tolist()
+    cat_col = features.select_dtypes(include=["object", "category"]).columns.tolist()
 
     # Colonnes numériques
     num_transformer = Pipeline([
@@ -0,0 +1,28 @@
+# Importation des bibliothèques nécessaires
+import numpy as np
+import pandas as pd
+from app.schema import sample_records
+
+# ====== JEU DE DONNEES SYNTHETIQUE (TESTS ET BENCHMARKS) ======
+def make_synthetic_supply(n_rows=2000, random_state=42):
+    """
+    Construit un jeu de données au format du dataset DVC (colonnes de LogistikData + Delivery_Status).
+
+    Sert de modèle de substitution pour les tests et benchmarks, sans MLflow ni fichier Excel.
+
+    :param n_rows: Nombre de lignes générées.
+    :param random_state: Graine du générateur.
+    """
+    supply = pd.DataFrame(sample_records(n_rows, seed=random_state))
+    rng = np.random.default_rng(random_state)
+
+    # Cible bruitée : retard plus probable pour les longues distances, la météo et le transport routier
+    score = (
+        (supply["Distance_Km"] - 2900) / 900
+        + supply["Weather_Condition"].isin(["Storm", "Snow"]) * 1.2
+        + (supply["Transportation_Method"] == "Truck") * 0.6
+        - (supply["Delivery_Urgency"] == "Express") * 0.8
+        + rng.normal(0, 0.8, n_rows)
+    )
+    supply["Delivery_Status"] = (score > 0).astype(np.int64)
+    return supply
@@ -1,52 +1,147 @@
 # Importation des bibliothèques nécessaires
+import os
+import time
+import psutil
+from joblib import Memory
 from sklearn.pipeline import Pipeline
-from sklearn.model_selection import RandomizedSearchCV, StratifiedKFold
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, RandomizedSearchCV, StratifiedKFold
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 from .config import settings
 
+# ====== CACHE DES PRETRAITEMENTS ======
+def preprocessing_memory():
+    """
+    Cache disque du ColumnTransformer ajusté et de la matrice transformée de chaque pli.
+
+    La clé joblib couvre les paramètres du préprocesseur et les données du pli : les candidats
+    d'une recherche, et les deux modèles, réutilisent le même ajustement ; seul le classifieur
+    est réentraîné.
+    """
+    if not settings.PREPROCESSING_CACHE_ENABLED:
+        return None
+    return Memory(settings.PREPROCESSING_CACHE_DIR, verbose=0)
+
+# ====== MESURE DU TEMPS ======
+def cpu_seconds(children: bool = True) -> float:
+    """
+    CPU consommé par ce processus ; avec children, aussi par ses descendants (workers joblib).
+
+    Descendants terminés et attendus : compteurs children_* du processus ; descendants vivants :
+    leur seul temps propre. Un processus n'est ainsi compté qu'une fois, vivant ou terminé.
+    """
+    process = psutil.Process(os.getpid())
+    times = process.cpu_times()
+    total = times.user + times.system
+    if not children:
+        return total
+    total += times.children_user + times.children_system
+    for child in process.children(recursive=True):
+        try:
+            child_times = child.cpu_times()
+            total += child_times.user + child_times.system
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+def timed(label, function, *args, **kwargs):
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    result = function(*args, **kwargs)
+    print(f"⏱️ {label} : {time.perf_counter() - wall:.1f}s (horloge), {cpu_seconds() - cpu:.1f}s (CPU)")
+    return result
+
+# ====== STRATEGIE DE RECHERCHE ======
+def build_search(estimator, param_distributions, cv, resource="n_samples", max_resources="auto", n_jobs=-1):
+    """
+    Recherche d'hyperparamètres selon settings.SEARCH_STRATEGY.
+
+    "halving" : réduction successive, tous les candidats reçoivent un petit budget (lignes,
+    arbres ou itérations selon resource), seul le meilleur tiers (HALVING_FACTOR) passe au
+    budget suivant ; le dernier tour utilise max_resources.
+
+    :param resource: "n_samples" ou un paramètre entier de l'estimateur (ex. classifier__n_estimators).
+    """
+    if settings.SEARCH_STRATEGY == "halving":
+        return HalvingRandomSearchCV(
+            estimator,
+            param_distributions=param_distributions,
+            n_candidates=settings.N_ITER,
+            factor=settings.HALVING_FACTOR,
+            resource=resource,
+            max_resources=max_resources,
+            min_resources="exhaust",
+            cv=cv,
+            n_jobs=n_jobs,
+            scoring='accuracy',
+            random_state=settings.RANDOM_STATE
+        )
+    if settings.SEARCH_STRATEGY != "random":
+        raise ValueError(f"SEARCH_STRATEGY inconnue : {settings.SEARCH_STRATEGY} (random ou halving)")
+    return RandomizedSearchCV(
+        estimator,
+        param_distributions=param_distributions,
+        n_iter=settings.N_ITER,
+        cv=cv,
+        n_jobs=n_jobs,
+        scoring='accuracy',
+        random_state=settings.RANDOM_STATE
+    )
+
+def halving_budget(name, param_dist):
+    # Forêt avec HALVING_RESOURCE=n_estimators : le nombre d'arbres devient le budget de chaque tour
+    if settings.SEARCH_STRATEGY == "halving" and name == "random_forest" and settings.HALVING_RESOURCE == "n_estimators":
+        grid = {key: value for key, value in param_dist.items() if key != "classifier__n_estimators"}
+        return grid, "classifier__n_estimators", max(param_dist["classifier__n_estimators"])
+    return param_dist, "n_samples", "auto"
+
 # ====== CREATION DES PIPELINES ======
-def train_models(x_train, y_train, preprocessor):
-    models ={
+def build_models() -> dict:
+    return {
         "logistic" : LogisticRegression(max_iter=1000, solver='liblinear', class_weight="balanced"),
         "random_forest" : RandomForestClassifier(),
     }
-    
-    param_dist ={
-        "logistic":{
-            'classifier__C': [0.1, 1, 10],
-            'classifier__penalty': ["l1", "l2"]
-        },
-        "random_forest":{
-            'classifier__n_estimators': [100, 200, 300],
-            'classifier__max_depth': [3, 6, 10],
-            'classifier__min_samples_split': [2, 5, 10]
-        },
-    }
-    
-    best_models = {}
+
+param_dist ={
+    "logistic":{
+        'classifier__C': [0.1, 1, 10],
+        'classifier__penalty': ["l1", "l2"]
+    },
+    "random_forest":{
+        'classifier__n_estimators': [100, 200, 300],
+        'classifier__max_depth': [3, 6, 10],
+        'classifier__min_samples_split': [2, 5, 10]
+    },
+}
+
+def train_family(name, x_train, y_train, preprocessor, n_jobs=-1):
+    """
+    Recherche d'hyperparamètres d'une famille de modèles (logistic ou random_forest).
+
+    :param n_jobs: Workers joblib de la recherche (part du budget CPU de l'orchestrateur).
+    """
+    print(f"\n Entraînement du modèle : {name}")
+    memory = preprocessing_memory()
     cv = StratifiedKFold(n_splits=settings.N_SPLITE, shuffle=True, random_state=settings.RANDOM_STATE)
-    
-    for name, model in models.items():
-        print(f"\n Entraînement du modèle : {name}")
-        
-        pipe = Pipeline([
-            ('preprocessing', preprocessor),
-            ('classifier', model)
-        ])
-        
-        search = RandomizedSearchCV(
-            pipe,
-            param_distributions=param_dist[name],
-            n_iter=20,
-            cv=cv,
-            n_jobs=-1,
-            scoring='accuracy',
-            random_state=settings.RANDOM_STATE
-        )
-        
-        search.fit(x_train, y_train)
-        best_models[name] = search.best_estimator_
-        
+
+    pipe = Pipeline([
+        ('preprocessing', preprocessor),
+        ('classifier', build_models()[name])
+    ], memory=memory)
+
+    grid, resource, max_resources = halving_budget(name, param_dist[name])
+    search = build_search(pipe, grid, cv, resource, max_resources, n_jobs=n_jobs)
+
+    search.fit(x_train, y_train)
+    if memory is not None:
+        memory.reduce_size(bytes_limit=settings.PREPROCESSING_CACHE_MB * 1024 ** 2)
+    # Le modèle enregistré ne garde pas de référence au cache
+    return search.best_estimator_.set_params(memory=None)
+
+def train_models(x_train, y_train, preprocessor):
+    best_models = {}
+    for name in build_models():
+        best_models[name] = train_family(name, x_train, y_train, preprocessor)
+
     print("Entraînement mis en place ✅✅")
-    return best_models
\ No newline at end of file
+    return best_models